@@ -2,13 +2,33 @@
 Base Agent class for Enterprise AI Strategy Command Center
 Uses AWS Strands SDK with Bedrock Claude Sonnet
 """
+import asyncio
 import boto3
+from botocore.config import Config as BotocoreConfig
+import contextvars
 import json
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Any, Optional, Type
+from dataclasses import dataclass, replace
 from abc import ABC, abstractmethod
 from datetime import datetime
+from enum import Enum
+
+from pydantic import ValidationError
+
+from .hedging import get_hedge_policy, parse_target
+from .structured_output import StructuredOutput, output_tool, parse_structured, repair_prompt
+from .rate_limiter import get_rate_limiter, is_throttling_error
+from config.aws_config import (
+    AgentConfig, get_agent_config, get_aws_config, get_model_context_window, get_model_routing_config,
+    get_prompt_cache_min_tokens, get_prompt_caching_config, get_response_cache_config
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,6 +45,276 @@ class AgentResponse:
     status: str  # "success", "error", "partial"
     confidence_score: float = 0.0
 
+class TaskClass(str, Enum):
+    """Kind of work a Bedrock call does, used to route it to a model tier"""
+    CLASSIFY = "classify"
+    EXTRACT = "extract"
+    LONG_FORM = "long_form"
+
+@dataclass
+class ModelRoute:
+    """Model and generation settings for one Bedrock call"""
+    target_model: str
+    max_tokens: int
+    temperature: float
+    # Tool the model must answer through, for structured output
+    output_tool: Optional[Dict[str, Any]] = None
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for Claude models (about four characters per token)"""
+    return len(text) // 4 + 1
+
+def make_cache_key(target_model: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float,
+                   output_tool: Optional[Dict[str, Any]] = None) -> str:
+    """Content-addressed key for a Bedrock invocation"""
+    parts = [target_model, system_prompt, prompt, max_tokens, temperature]
+    if output_tool is not None:
+        parts.append(output_tool)
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache(ABC):
+    """Pluggable cache for Bedrock completions keyed by make_cache_key()"""
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion, or None on miss"""
+        pass
+    
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store a completion"""
+        pass
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk response cache with TTL expiry and LRU eviction by entry count and size"""
+    
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 10000, max_size_mb: int = 512):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses(accessed_at)")
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+    
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+    
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until within limits"""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        
+        count, total_size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total_size <= self.max_size_bytes:
+            return
+        
+        freed_entries, freed_size = 0, 0
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            if count - freed_entries <= self.max_entries and total_size - freed_size <= self.max_size_bytes:
+                break
+            stale_keys.append((key,))
+            freed_entries += 1
+            freed_size += size
+        
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+        logger.info(f"Evicted {len(stale_keys)} entries from response cache")
+
+_default_response_cache: Optional[ResponseCache] = None
+_default_response_cache_lock = threading.Lock()
+
+def get_default_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None when caching is disabled"""
+    global _default_response_cache
+    
+    cache_config = get_response_cache_config()
+    if not cache_config.enabled:
+        return None
+    
+    with _default_response_cache_lock:
+        if _default_response_cache is None:
+            try:
+                _default_response_cache = SQLiteResponseCache(
+                    path=cache_config.path,
+                    ttl_seconds=cache_config.ttl_seconds,
+                    max_entries=cache_config.max_entries,
+                    max_size_mb=cache_config.max_size_mb
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache unavailable, continuing without it: {str(e)}")
+                return None
+        return _default_response_cache
+
+_bedrock_clients: Dict[str, Any] = {}
+_bedrock_clients_lock = threading.Lock()
+
+def get_bedrock_client(region: str):
+    """Get the process-wide bedrock-runtime client for a region
+    
+    boto3 clients are thread-safe, so one tuned client (connection pool,
+    keep-alive, retry mode) is shared by every agent in the process.
+    """
+    with _bedrock_clients_lock:
+        client = _bedrock_clients.get(region)
+        if client is None:
+            aws_config = get_aws_config()
+            client = boto3.client(
+                'bedrock-runtime',
+                region_name=region,
+                config=BotocoreConfig(
+                    max_pool_connections=aws_config.max_pool_connections,
+                    tcp_keepalive=aws_config.tcp_keepalive,
+                    retries={"mode": aws_config.retry_mode, "max_attempts": aws_config.max_attempts},
+                    connect_timeout=aws_config.connect_timeout,
+                    read_timeout=aws_config.read_timeout
+                )
+            )
+            _bedrock_clients[region] = client
+            logger.info(f"Created shared bedrock-runtime client for {region}")
+        return client
+
+# Receives generated text chunks for the task running in the current context
+_token_sink: contextvars.ContextVar = contextvars.ContextVar("agent_token_sink", default=None)
+
+# Collects per-call usage records for the task running in the current context
+_usage_records: contextvars.ContextVar = contextvars.ContextVar("agent_usage_records", default=None)
+
+# Counts response cache hits and misses for the task running in the current context
+_cache_lookups: contextvars.ContextVar = contextvars.ContextVar("agent_cache_lookups", default=None)
+
+# Set when the task running in the current context should stop (e.g. after a team timeout)
+_cancel_event: contextvars.ContextVar = contextvars.ContextVar("agent_cancel_event", default=None)
+
+class AgentCancelled(Exception):
+    """Raised at the next Bedrock call of a task whose cancel event is set"""
+    pass
+
+def raise_if_cancelled(agent_name: str) -> None:
+    """Stop the current task if it has been cancelled"""
+    cancel = _cancel_event.get()
+    if cancel is not None and cancel.is_set():
+        raise AgentCancelled(f"{agent_name} task cancelled")
+
+# Process-wide callbacks receiving (agent_name, record) for every Bedrock call
+_bedrock_call_observers: List[Callable[[str, Dict[str, Any]], None]] = []
+
+def add_bedrock_call_observer(observer: Callable[[str, Dict[str, Any]], None]) -> None:
+    """Register a callback for Bedrock call records (e.g. to export metrics)
+    
+    Records are the usage dicts attached to metadata["usage"]["calls"]; failed
+    calls are reported with an "error_code" key instead of token counts.
+    """
+    _bedrock_call_observers.append(observer)
+
+def summarize_usage(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-call Bedrock usage records for one task"""
+    invoked = [call for call in calls if not call.get("cached")]
+    return {
+        "calls": calls,
+        "bedrock_calls": len(invoked),
+        "cached_calls": len(calls) - len(invoked),
+        "input_tokens": sum(call.get("input_tokens", 0) for call in invoked),
+        "output_tokens": sum(call.get("output_tokens", 0) for call in invoked),
+        "cache_read_tokens": sum(call.get("cache_read_tokens", 0) for call in invoked),
+        "cache_write_tokens": sum(call.get("cache_write_tokens", 0) for call in invoked),
+        "bedrock_latency_ms": round(sum(call.get("latency_ms", 0) for call in invoked), 1)
+    }
+
+_agent_executor: Optional[ThreadPoolExecutor] = None
+_agent_executor_lock = threading.Lock()
+
+def get_agent_executor() -> ThreadPoolExecutor:
+    """Get the bounded executor that runs blocking agent work off the event loop"""
+    global _agent_executor
+    
+    with _agent_executor_lock:
+        if _agent_executor is None:
+            _agent_executor = ThreadPoolExecutor(
+                max_workers=get_agent_config().executor_workers,
+                thread_name_prefix="agent-worker"
+            )
+        return _agent_executor
+
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+_fanout_executor_lock = threading.Lock()
+
+def get_fanout_executor() -> ThreadPoolExecutor:
+    """Get the executor for Bedrock calls fanned out from within a running task
+    
+    Kept separate from the agent executor so a task waiting on its own
+    sub-calls can never starve the pool it is running on.
+    """
+    global _fanout_executor
+    
+    with _fanout_executor_lock:
+        if _fanout_executor is None:
+            _fanout_executor = ThreadPoolExecutor(
+                max_workers=get_agent_config().executor_workers,
+                thread_name_prefix="bedrock-fanout"
+            )
+        return _fanout_executor
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """Get the executor running the competing attempts of hedged requests"""
+    global _hedge_executor
+    
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=get_agent_config().executor_workers * 2,
+                thread_name_prefix="bedrock-hedge"
+            )
+        return _hedge_executor
+
 class BaseAgent(ABC):
     """Base class for all AI Strategy agents using AWS Bedrock"""
     
@@ -35,7 +325,11 @@ class BaseAgent(ABC):
                  max_tokens: int = 4000,
                  temperature: float = 0.3,
                  inference_profile_id: str = None,
-                 inference_profile_arn: str = None):
+                 inference_profile_arn: str = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 use_response_cache: bool = True,
+                 model_routes: Optional[Dict[str, List[str]]] = None,
+                 hedge_targets: Optional[List[str]] = None):
         self.agent_name = agent_name
         self.model_id = model_id
         self.region = region
@@ -43,9 +337,30 @@ class BaseAgent(ABC):
         self.temperature = temperature
         self.inference_profile_id = inference_profile_id
         self.inference_profile_arn = inference_profile_arn
+        self.context_window_tokens = get_model_context_window(model_id)
+        
+        # Model routing by task class; model_routes overrides the configured tiers for this agent
+        self.routing_config = get_model_routing_config()
+        self.model_routes = model_routes or {}
         
-        # Initialize AWS Bedrock client
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name=region)
+        # Equivalent targets ("<model-or-profile>[@<region>]") for hedging this agent's own model
+        self.hedge_targets = hedge_targets or []
+        
+        # Bedrock prompt caching of the system prompt and static context
+        self.prompt_caching = get_prompt_caching_config()
+        self._static_context: Optional[str] = None
+        
+        # Response cache (opt out per agent with use_response_cache=False)
+        if use_response_cache:
+            self.response_cache = response_cache or get_default_response_cache()
+        else:
+            self.response_cache = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_stats_lock = threading.Lock()
+        
+        # Shared AWS Bedrock client
+        self.bedrock_client = get_bedrock_client(region)
         
         # Determine if using inference profile or direct model
         if self.inference_profile_arn:
@@ -58,39 +373,551 @@ class BaseAgent(ABC):
             self.target_model = self.model_id
             logger.info(f"Initialized {agent_name} with direct model: {model_id}")
     
-    def _call_bedrock(self, prompt: str, system_prompt: str = "") -> str:
-        """Call AWS Bedrock Claude Sonnet"""
-        try:
-            # Prepare the request body for Claude 3.5 Sonnet
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": self.max_tokens,
-                "temperature": self.temperature,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            }
-            
-            if system_prompt:
-                body["system"] = system_prompt
-            
-            # Call Bedrock (with inference profile support)
-            response = self.bedrock_client.invoke_model(
-                modelId=self.target_model,
-                body=json.dumps(body),
-                contentType='application/json'
+    @property
+    def default_route(self) -> ModelRoute:
+        """The agent's own model and settings, used for long-form work"""
+        return ModelRoute(self.target_model, self.max_tokens, self.temperature)
+    
+    def route_models(self, task_class: Optional[TaskClass], prompt_tokens: int) -> List[ModelRoute]:
+        """Models to try for a call, cheapest suitable first
+        
+        Classification and extraction go to the fast tier unless the prompt is
+        too large for it, falling back to the agent's model. Long-form work
+        (and any call without a task class) uses the agent's model directly.
+        """
+        if task_class is None or not self.routing_config.enabled:
+            return [self.default_route]
+        task_class = TaskClass(task_class)
+        
+        env_overrides = self.routing_config.overrides or {}
+        models = (
+            self.model_routes.get(task_class.value)
+            or env_overrides.get(self.agent_name, {}).get(task_class.value)
+            or env_overrides.get("*", {}).get(task_class.value)
+        )
+        if not models:
+            if task_class == TaskClass.LONG_FORM:
+                return [self.default_route]
+            models = [self.routing_config.fast_model, self.target_model]
+        
+        if prompt_tokens > self.routing_config.fast_model_max_prompt_tokens:
+            models = [model for model in models if model != self.routing_config.fast_model] or [self.target_model]
+        
+        if task_class == TaskClass.CLASSIFY:
+            max_tokens, temperature = self.routing_config.classify_max_tokens, 0.0
+        elif task_class == TaskClass.EXTRACT:
+            max_tokens, temperature = min(self.max_tokens, self.routing_config.extract_max_tokens), self.temperature
+        else:
+            max_tokens, temperature = self.max_tokens, self.temperature
+        
+        return [ModelRoute(model, max_tokens, temperature) for model in dict.fromkeys(models)]
+    
+    def _call_bedrock(self,
+                      prompt: str,
+                      system_prompt: str = "",
+                      task_class: Optional[TaskClass] = None,
+                      validate: Optional[Callable[[str], bool]] = None) -> str:
+        """Call AWS Bedrock Claude, routed by task class
+        
+        When validate rejects a response, the next (larger) model in the route
+        is tried; the last model's response is returned regardless. Rejected
+        responses are not cached.
+        """
+        system_prompt = self._with_static_context(system_prompt)
+        routes = self.route_models(task_class, estimate_tokens(system_prompt + prompt))
+        for index, route in enumerate(routes):
+            text = self._call_model(prompt, system_prompt, route, cacheable=validate)
+            if validate is None or validate(text) or index == len(routes) - 1:
+                return text
+            logger.info(f"Response from {route.target_model} failed validation for {self.agent_name}; "
+                        f"falling back to {routes[index + 1].target_model}")
+        return text
+    
+    def _call_bedrock_structured(self,
+                                 prompt: str,
+                                 schema: Type[StructuredOutput],
+                                 system_prompt: str = "",
+                                 task_class: Optional[TaskClass] = None) -> StructuredOutput:
+        """Call Bedrock for a result matching schema, returned as a validated instance
+        
+        The model answers through a forced tool call whose input schema is the
+        Pydantic schema. Output that fails validation is repaired locally
+        (fences, trailing commas, truncation) and otherwise sent back once to
+        the same model with the schema errors, before falling back to the next
+        model in the route; a failed Bedrock call also falls back. Only valid
+        responses are cached. Raises the last ValidationError or Bedrock error
+        if every model fails.
+        """
+        tool = output_tool(schema)
+        system_prompt = self._with_static_context(system_prompt)
+        routes = [
+            replace(route, output_tool=tool)
+            for route in self.route_models(task_class, estimate_tokens(system_prompt + prompt + json.dumps(tool)))
+        ]
+        
+        def parses(text: str) -> bool:
+            try:
+                parse_structured(text, schema)
+                return True
+            except ValidationError:
+                return False
+        
+        error: Optional[Exception] = None
+        for route in routes:
+            try:
+                text = self._call_model(prompt, system_prompt, route, cacheable=parses)
+                try:
+                    return parse_structured(text, schema)
+                except ValidationError as e:
+                    logger.info(f"{schema.__name__} from {route.target_model} failed validation for {self.agent_name}; repairing")
+                    text = self._call_model(repair_prompt(schema, text, e), system_prompt, route, cacheable=parses)
+                return parse_structured(text, schema)
+            except ValidationError as e:
+                error = e
+                logger.warning(f"Repaired {schema.__name__} from {route.target_model} is still invalid for {self.agent_name}")
+            except Exception as e:
+                error = e
+                logger.warning(f"{schema.__name__} call to {route.target_model} failed for {self.agent_name}: {str(e)}")
+        if error is None:
+            raise ValueError(f"No model route available for {self.agent_name}")
+        raise error
+    
+    def get_static_context(self) -> str:
+        """Large reference material sent with every call after the system prompt
+        
+        Agents with static reference data (tech stacks, catalogs, pricing
+        models) return it here rather than embedding it in each prompt, so it
+        forms part of the cacheable prompt prefix.
+        """
+        return ""
+    
+    def _with_static_context(self, system_prompt: str) -> str:
+        if self._static_context is None:
+            self._static_context = self.get_static_context()
+        return "\n\n".join(part for part in (system_prompt, self._static_context) if part)
+    
+    def _call_model(self, prompt: str, system_prompt: str, route: ModelRoute,
+                    cacheable: Optional[Callable[[str], bool]] = None) -> str:
+        """Call one model, serving identical requests from the response cache
+        
+        When cacheable is given, only responses it accepts are stored, so
+        output that failed validation is never replayed from the cache.
+        """
+        raise_if_cancelled(self.agent_name)
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = make_cache_key(
+                route.target_model, system_prompt, prompt, route.max_tokens, route.temperature, route.output_tool
             )
+            try:
+                cached = self.response_cache.get(cache_key)
+            except Exception as e:
+                logger.warning(f"Response cache lookup failed: {str(e)}")
+                cached = None
+            
+            outcome = "hits" if cached is not None else "misses"
+            with self._cache_stats_lock:
+                if cached is not None:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+                lookups = _cache_lookups.get()
+                if lookups is not None:
+                    lookups[outcome] += 1
+            if cached is not None:
+                logger.info(f"Response cache hit for {self.agent_name}")
+                self._record_usage({"model": route.target_model, "cached": True})
+                on_token = _token_sink.get()
+                if on_token is not None and route.output_tool is None:
+                    on_token(cached)
+                return cached
+        
+        text = self._invoke_bedrock(prompt, system_prompt, on_token=_token_sink.get(), route=route)
+        
+        if cache_key is not None and (cacheable is None or cacheable(text)):
+            try:
+                self.response_cache.set(cache_key, text)
+            except Exception as e:
+                logger.warning(f"Response cache store failed: {str(e)}")
+        
+        return text
+    
+    async def _acall_bedrock(self, prompt: str, system_prompt: str = "", task_class: Optional[TaskClass] = None) -> str:
+        """Async variant of _call_bedrock that runs on the bounded agent executor"""
+        loop = asyncio.get_running_loop()
+        call = contextvars.copy_context().run
+        return await loop.run_in_executor(get_agent_executor(), call, self._call_bedrock, prompt, system_prompt, task_class)
+    
+    def _call_bedrock_many(self, prompts: List[str], system_prompt: str = "",
+                           task_class: Optional[TaskClass] = None) -> List[str]:
+        """Call Bedrock for independent prompts concurrently, in prompt order
+        
+        Concurrency is bounded by the shared rate limiter. Output is not
+        streamed to the task's token sink, since interleaved chunks from
+        parallel calls would be unreadable; usage is still recorded.
+        """
+        executor = get_fanout_executor()
+        futures = []
+        for prompt in prompts:
+            context = contextvars.copy_context()
+            context.run(_token_sink.set, None)
+            futures.append(executor.submit(context.run, self._call_bedrock, prompt, system_prompt, task_class))
+        return [future.result() for future in futures]
+    
+    def estimate_tokens(self, text: str) -> int:
+        """Estimated prompt tokens for text sent to this agent's model"""
+        return estimate_tokens(text)
+    
+    def prompt_token_budget(self, system_prompt: str = "", overhead: str = "") -> int:
+        """Tokens left for variable prompt content in one call
+        
+        Bounded by the model's context window minus the response allowance,
+        the system prompt and fixed prompt text, and by the map chunk size so
+        batches stay small enough to analyze well and in parallel.
+        """
+        available = (
+            self.context_window_tokens
+            - self.max_tokens
+            - self.estimate_tokens(self._with_static_context(system_prompt))
+            - self.estimate_tokens(overhead)
+        )
+        return max(1, min(available, get_agent_config().map_chunk_tokens))
+    
+    def chunk_by_tokens(self, items: List[str], budget: int) -> List[List[str]]:
+        """Greedily pack text items into batches of at most budget estimated tokens
+        
+        An item larger than the budget gets a batch of its own.
+        """
+        batches: List[List[str]] = []
+        current: List[str] = []
+        used = 0
+        for item in items:
+            size = self.estimate_tokens(item)
+            if current and used + size > budget:
+                batches.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += size
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _invoke_bedrock(self,
+                        prompt: str,
+                        system_prompt: str = "",
+                        on_token: Callable[[str], None] = None,
+                        route: Optional[ModelRoute] = None) -> str:
+        """Invoke the Bedrock model without caching, within the shared rate limits
+        
+        Throttled requests are retried with jittered exponential backoff as long
+        as no streamed output has been delivered yet. Token usage, latency and
+        time-to-first-byte of the successful attempt are recorded for the task.
+        """
+        route = route or self.default_route
+        limiter = get_rate_limiter(route.target_model)
+        body = self._build_request_body(prompt, system_prompt, route)
+        estimated_tokens = estimate_tokens(system_prompt + prompt) + route.max_tokens
+        hedge_targets = self._hedge_targets_for(route)
+        attempt = 0
+        
+        while True:
+            emitted = []
             
-            # Parse response
-            response_body = json.loads(response['body'].read())
-            return response_body['content'][0]['text']
+            def forward(chunk: str) -> None:
+                emitted.append(chunk)
+                on_token(chunk)
             
-        except Exception as e:
-            logger.error(f"Error calling Bedrock: {str(e)}")
-            raise
+            try:
+                with limiter.slot(estimated_tokens):
+                    started = time.perf_counter()
+                    hedge = None
+                    if hedge_targets:
+                        text, usage, ttfb, hedge = self._send_hedged_request(
+                            body, route, hedge_targets, forward if on_token is not None else None, estimated_tokens
+                        )
+                    elif on_token is None:
+                        text, usage, ttfb = self._send_request(body, route.target_model)
+                    else:
+                        text, usage, ttfb = self._send_streaming_request(body, forward, route.target_model)
+                    latency = time.perf_counter() - started
+                
+                actual_tokens = usage.get("input_tokens", 0) + usage.get("output_tokens", 0) if usage else None
+                limiter.record_success(estimated_tokens, actual_tokens)
+                record = {
+                    "model": route.target_model,
+                    "cached": False,
+                    "streamed": on_token is not None,
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": usage.get("output_tokens", 0),
+                    "cache_read_tokens": usage.get("cache_read_input_tokens", 0),
+                    "cache_write_tokens": usage.get("cache_creation_input_tokens", 0),
+                    "latency_ms": round(latency * 1000, 1),
+                    "ttfb_ms": round((ttfb - started) * 1000, 1),
+                    "throttle_retries": attempt
+                }
+                if hedge is not None:
+                    record["hedge"] = hedge
+                self._record_usage(record)
+                return text
+                
+            except Exception as e:
+                if is_throttling_error(e):
+                    limiter.record_throttle()
+                    if not emitted and attempt < limiter.config.max_retries:
+                        delay = limiter.backoff_delay(attempt)
+                        attempt += 1
+                        logger.warning(f"Bedrock throttled {self.agent_name}; retry {attempt} in {delay:.1f}s")
+                        cancel = _cancel_event.get()
+                        if cancel is not None:
+                            cancel.wait(delay)
+                            raise_if_cancelled(self.agent_name)
+                        else:
+                            time.sleep(delay)
+                        continue
+                error_response = getattr(e, "response", None)
+                error_code = error_response.get("Error", {}).get("Code") if isinstance(error_response, dict) else None
+                self._notify_observers({
+                    "model": route.target_model,
+                    "error_code": error_code or type(e).__name__
+                })
+                logger.error(f"Error calling Bedrock: {str(e)}")
+                raise
+    
+    def _record_usage(self, record: Dict[str, Any]) -> None:
+        """Add a usage record to the current task, if one is being collected"""
+        records = _usage_records.get()
+        if records is not None:
+            records.append(record)
+        self._notify_observers(record)
+    
+    def _notify_observers(self, record: Dict[str, Any]) -> None:
+        for observer in _bedrock_call_observers:
+            try:
+                observer(self.agent_name, record)
+            except Exception as e:
+                logger.debug(f"Bedrock call observer failed: {str(e)}")
+    
+    def _send_request(self, body: Dict[str, Any], model_id: Optional[str] = None) -> tuple:
+        """Send a single invoke_model request, returning (text, usage, first_byte_time)"""
+        # Call Bedrock (with inference profile support)
+        response = self.bedrock_client.invoke_model(
+            modelId=model_id or self.target_model,
+            body=json.dumps(body),
+            contentType='application/json'
+        )
+        first_byte = time.perf_counter()
+        
+        # Parse response; a forced tool call (structured output) answers with its JSON input
+        response_body = json.loads(response['body'].read())
+        for block in response_body['content']:
+            if block.get('type') == 'tool_use':
+                return json.dumps(block['input'], ensure_ascii=False), response_body.get('usage', {}), first_byte
+        return response_body['content'][0]['text'], response_body.get('usage', {}), first_byte
+    
+    def _send_streaming_request(self, body: Dict[str, Any], on_token: Callable[[str], None],
+                                model_id: Optional[str] = None) -> tuple:
+        """Send a response-stream request, passing text (not tool input) chunks to on_token
+        
+        Returns (text, usage, first_byte_time), where first_byte_time is when the
+        first generated text arrived.
+        """
+        response = self.bedrock_client.invoke_model_with_response_stream(
+            modelId=model_id or self.target_model,
+            body=json.dumps(body),
+            contentType='application/json'
+        )
+        return self._read_stream(response['body'], on_token)
+    
+    def _read_stream(self,
+                     stream,
+                     on_token: Optional[Callable[[str], None]],
+                     claim: Optional[Callable[[], bool]] = None) -> Optional[tuple]:
+        """Collect a response stream into (text, usage, first_byte_time)
+        
+        claim, if given, is called before the first text chunk is passed on;
+        returning False abandons the stream and makes this return None.
+        """
+        chunks = []
+        usage = {}
+        first_byte = None
+        for event in stream:
+            chunk = json.loads(event['chunk']['bytes'])
+            chunk_type = chunk.get('type')
+            if chunk_type == 'content_block_delta':
+                # Text, or the JSON input of a forced tool call (structured output);
+                # only text is passed on, tool input is not output for readers
+                delta = chunk['delta']
+                is_text = delta.get('type', 'text_delta') == 'text_delta'
+                text = delta.get('text', '') if is_text else delta.get('partial_json', '')
+                if text:
+                    if first_byte is None:
+                        if claim is not None and not claim():
+                            return None
+                        first_byte = time.perf_counter()
+                    chunks.append(text)
+                    if on_token is not None and is_text:
+                        on_token(text)
+            elif chunk_type == 'message_start':
+                usage.update(chunk['message'].get('usage', {}))
+            elif chunk_type == 'message_delta':
+                usage.update(chunk.get('usage', {}))
+        
+        if claim is not None and first_byte is None and not claim():
+            return None
+        return "".join(chunks), usage, first_byte or time.perf_counter()
+    
+    def _hedge_targets_for(self, route: ModelRoute) -> List[str]:
+        """Equivalent targets to hedge a call to route.target_model against, if hedging is on"""
+        policy = get_hedge_policy(route.target_model)
+        if policy is None:
+            return []
+        if route.target_model == self.target_model and self.hedge_targets:
+            return self.hedge_targets
+        return (policy.config.targets or {}).get(route.target_model, [])
+    
+    def _send_hedged_request(self,
+                             body: Dict[str, Any],
+                             route: ModelRoute,
+                             hedge_targets: List[str],
+                             on_token: Optional[Callable[[str], None]],
+                             estimated_tokens: int) -> tuple:
+        """Stream from the primary target, hedging to an equivalent one on a slow first byte
+        
+        If the primary has produced no output within the policy's hedge delay
+        and the hedge budget allows, the same request goes to the first
+        equivalent target with free rate-limit capacity. The first attempt to
+        produce output wins and streams to on_token; the other is cancelled by
+        closing its stream, so only one response is generated in full.
+        
+        Returns (text, usage, first_byte_time, hedge_info); hedge_info is None
+        when no hedge was sent.
+        """
+        policy = get_hedge_policy(route.target_model)
+        policy.record_request()
+        payload = json.dumps(body)
+        lock = threading.Lock()
+        progress = threading.Event()
+        winner: List[Optional[int]] = [None]
+        streams: Dict[int, Any] = {}
+        
+        def claim(index: int) -> bool:
+            with lock:
+                if winner[0] is None:
+                    winner[0] = index
+                    for other, stream in streams.items():
+                        if other != index:
+                            stream.close()
+                return winner[0] == index
+        
+        def run_attempt(index: int, client, model_id: str) -> Optional[tuple]:
+            try:
+                response = client.invoke_model_with_response_stream(
+                    modelId=model_id, body=payload, contentType='application/json'
+                )
+                stream = response['body']
+                with lock:
+                    if winner[0] is not None:
+                        stream.close()
+                        return None
+                    streams[index] = stream
+                try:
+                    return self._read_stream(stream, on_token, claim=lambda: claim(index))
+                except Exception:
+                    with lock:
+                        if winner[0] is not None and winner[0] != index:
+                            return None
+                    raise
+            finally:
+                progress.set()
+        
+        started = time.perf_counter()
+        executor = get_hedge_executor()
+        futures = {executor.submit(run_attempt, 0, self.bedrock_client, route.target_model): 0}
+        
+        hedge_target = None
+        delay = policy.hedge_delay()
+        if not progress.wait(delay) and winner[0] is None:
+            for spec in hedge_targets:
+                target, region = parse_target(spec, self.region)
+                hedge_limiter = get_rate_limiter(spec)
+                if hedge_limiter.try_acquire(estimated_tokens):
+                    if not policy.try_hedge():
+                        hedge_limiter.release()
+                        break
+                    hedge_target = spec
+                    
+                    def run_hedge(target=target, region=region, hedge_limiter=hedge_limiter):
+                        try:
+                            return run_attempt(1, get_bedrock_client(region), target)
+                        finally:
+                            hedge_limiter.release()
+                    
+                    futures[executor.submit(run_hedge)] = 1
+                    logger.info(f"Hedging {route.target_model} to {spec} after {delay:.2f}s without a first byte")
+                    break
+        
+        errors: Dict[int, Exception] = {}
+        result = None
+        pending = set(futures)
+        while pending and result is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    errors[futures[future]] = e
+                    continue
+                if outcome is not None:
+                    result = outcome
+        
+        if result is None:
+            raise errors.get(0) or errors.get(1) or RuntimeError("Hedged Bedrock request produced no response")
+        
+        text, usage, first_byte = result
+        if winner[0] == 0:
+            policy.record_ttfb(first_byte - started)
+        elif winner[0] == 1:
+            # The primary lost the race: its first byte took at least this long
+            policy.record_ttfb(first_byte - started)
+            policy.record_hedge_win()
+        
+        hedge_info = None
+        if hedge_target is not None:
+            hedge_info = {
+                "target": hedge_target,
+                "delay_ms": round(delay * 1000, 1),
+                "won": winner[0] == 1
+            }
+        return text, usage, first_byte, hedge_info
+    
+    def _build_request_body(self, prompt: str, system_prompt: str = "", route: Optional[ModelRoute] = None) -> Dict[str, Any]:
+        """Build the Anthropic messages request body"""
+        route = route or self.default_route
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": route.max_tokens,
+            "temperature": route.temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        
+        if route.output_tool is not None:
+            body["tools"] = [route.output_tool]
+            body["tool_choice"] = {"type": "tool", "name": route.output_tool["name"]}
+        
+        if system_prompt:
+            body["system"] = system_prompt
+            if self.prompt_caching.enabled:
+                min_tokens = get_prompt_cache_min_tokens(route.target_model, self.prompt_caching)
+                if min_tokens is not None and estimate_tokens(system_prompt) >= min_tokens:
+                    # Cache the whole system prefix; only the user prompt varies between calls
+                    body["system"] = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        
+        return body
     
     @abstractmethod
     def get_system_prompt(self) -> str:
@@ -102,18 +929,69 @@ class BaseAgent(ABC):
         """Process a task and return standardized response"""
         pass
     
+    def process_task_streaming(self,
+                               task: str,
+                               context: Dict[str, Any] = None,
+                               on_token: Callable[[str], None] = None) -> AgentResponse:
+        """Process a task, passing generated text chunks to on_token as they arrive
+        
+        Bedrock usage for every call made by the task is attached to the
+        response as metadata["usage"].
+        """
+        sink_token = _token_sink.set(on_token)
+        records_token = _usage_records.set([])
+        lookups_token = _cache_lookups.set({"hits": 0, "misses": 0})
+        try:
+            response = self.process_task(task, context)
+            response.metadata["usage"] = summarize_usage(_usage_records.get())
+            return response
+        finally:
+            _cache_lookups.reset(lookups_token)
+            _usage_records.reset(records_token)
+            _token_sink.reset(sink_token)
+    
+    async def aprocess_task(self,
+                            task: str,
+                            context: Dict[str, Any] = None,
+                            on_token: Callable[[str], None] = None) -> AgentResponse:
+        """Process a task without blocking the event loop
+        
+        on_token, if given, is called from a worker thread with each generated text chunk.
+        """
+        loop = asyncio.get_running_loop()
+        call = contextvars.copy_context().run
+        return await loop.run_in_executor(
+            get_agent_executor(), call, self.process_task_streaming, task, context, on_token
+        )
+    
     def _create_response(self, 
                         task: str, 
                         content: str, 
                         metadata: Dict[str, Any] = None,
                         status: str = "success",
-                        confidence_score: float = 0.8) -> AgentResponse:
-        """Create standardized agent response"""
+                        confidence_score: float = 0.8,
+                        structured: Optional[StructuredOutput] = None) -> AgentResponse:
+        """Create standardized agent response
+        
+        A structured result is attached as metadata["structured_output"], so
+        consumers can read, diff and cache its fields without parsing content.
+        """
+        metadata = dict(metadata or {})
+        if structured is not None:
+            metadata["structured_output"] = {
+                "schema": type(structured).__name__,
+                "data": structured.model_dump(mode="json")
+            }
+        lookups = _cache_lookups.get()
+        if self.response_cache is not None and lookups is not None:
+            # This task's lookups only; the instance counters span every task it ran
+            metadata["response_cache"] = dict(lookups)
+        
         return AgentResponse(
             agent_name=self.agent_name,
             task=task,
             content=content,
-            metadata=metadata or {},
+            metadata=metadata,
             timestamp=datetime.now(),
             status=status,
             confidence_score=confidence_score
@@ -132,12 +1010,49 @@ class BaseAgent(ABC):
         
         return True
 
+class AgentRegistry:
+    """Lazily creates and reuses one agent instance per agent type"""
+    
+    def __init__(self, agent_classes: Dict[str, Type[BaseAgent]]):
+        self.agent_classes = dict(agent_classes)
+        self._instances: Dict[str, BaseAgent] = {}
+        self._lock = threading.Lock()
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.agent_classes
+    
+    def get(self, name: str) -> Optional[BaseAgent]:
+        """Get the shared instance for an agent, creating it on first use"""
+        agent_class = self.agent_classes.get(name)
+        if agent_class is None:
+            return None
+        
+        with self._lock:
+            agent = self._instances.get(name)
+            if agent is None:
+                agent = agent_class()
+                self._instances[name] = agent
+            return agent
+    
+    def describe(self) -> List[Dict[str, str]]:
+        """Static metadata for all agents, without instantiating any"""
+        return [
+            {
+                "name": name,
+                "class": agent_class.__name__,
+                "description": agent_class.__doc__ or f"{name} agent"
+            }
+            for name, agent_class in self.agent_classes.items()
+        ]
+
 class EnterpriseAgentOrchestrator:
     """Orchestrator for managing multiple AI agents"""
     
-    def __init__(self):
+    def __init__(self, agent_config: AgentConfig = None):
         self.agents: Dict[str, BaseAgent] = {}
         self.execution_history: List[AgentResponse] = []
+        self.agent_config = agent_config or get_agent_config()
+        self._history_lock = threading.Lock()
     
     def register_agent(self, agent: BaseAgent) -> None:
         """Register an agent with the orchestrator"""
@@ -153,7 +1068,7 @@ class EnterpriseAgentOrchestrator:
         logger.info(f"Executing {agent_name} for task: {task[:50]}...")
         
         try:
-            response = agent.process_task(task, context)
+            response = agent.process_task_streaming(task, context)
             
             # Validate response
             if not agent.validate_response(response):
@@ -161,10 +1076,14 @@ class EnterpriseAgentOrchestrator:
                 logger.warning(f"Response validation failed for {agent_name}")
             
             # Store execution history
-            self.execution_history.append(response)
+            with self._history_lock:
+                self.execution_history.append(response)
             
             return response
             
+        except AgentCancelled:
+            logger.info(f"Stopped cancelled {agent_name} task")
+            raise
         except Exception as e:
             logger.error(f"Error executing {agent_name}: {str(e)}")
             error_response = AgentResponse(
@@ -176,23 +1095,128 @@ class EnterpriseAgentOrchestrator:
                 status="error",
                 confidence_score=0.0
             )
-            self.execution_history.append(error_response)
+            with self._history_lock:
+                self.execution_history.append(error_response)
             return error_response
     
-    def execute_agent_team(self, agent_names: List[str], task: str, context: Dict[str, Any] = None) -> List[AgentResponse]:
-        """Execute multiple agents for a coordinated task"""
-        responses = []
+    def execute_agent_team(self,
+                           agent_names: List[str],
+                           task: str,
+                           context: Dict[str, Any] = None,
+                           dependencies: Dict[str, List[str]] = None) -> List[AgentResponse]:
+        """Execute multiple agents for a coordinated task
         
-        for agent_name in agent_names:
-            response = self.execute_agent(agent_name, task, context)
-            responses.append(response)
+        dependencies maps an agent name to the agents whose output it consumes.
+        Agents whose dependencies are satisfied run concurrently, bounded by
+        max_concurrent_agents; each receives "<agent>_response" entries for all of
+        its upstream agents. When omitted, every agent depends on the one before it.
+        Responses are returned in the order of agent_names.
+        
+        An agent exceeding timeout_seconds gets an error response and is told to
+        stop. Threads cannot be interrupted, so it stops at its next Bedrock call
+        or throttle backoff; a call already in flight finishes in the background.
+        """
+        if dependencies is None:
+            dependencies = {name: agent_names[max(i - 1, 0):i] for i, name in enumerate(agent_names)}
+        
+        upstream = self._resolve_upstream(agent_names, dependencies)
+        base_context = dict(context or {})
+        timeout = self.agent_config.timeout_seconds
+        
+        responses: Dict[str, AgentResponse] = {}
+        pending = list(agent_names)
+        running: Dict[Any, str] = {}
+        started_at: Dict[str, float] = {}
+        cancel_events = {agent_name: threading.Event() for agent_name in agent_names}
+        
+        def run(agent_name: str, agent_context: Dict[str, Any]) -> AgentResponse:
+            started_at[agent_name] = time.monotonic()
+            cancel_token = _cancel_event.set(cancel_events[agent_name])
+            try:
+                return self.execute_agent(agent_name, task, agent_context)
+            finally:
+                _cancel_event.reset(cancel_token)
+        
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, self.agent_config.max_concurrent_agents),
+            thread_name_prefix="agent-team"
+        )
+        try:
+            while pending or running:
+                # Submit every agent whose direct dependencies have finished
+                for agent_name in [n for n in pending if all(d in responses for d in dependencies.get(n, []))]:
+                    pending.remove(agent_name)
+                    agent_context = dict(base_context)
+                    for upstream_name in upstream[agent_name]:
+                        agent_context[f"{upstream_name}_response"] = responses[upstream_name].content
+                    running[executor.submit(run, agent_name, agent_context)] = agent_name
+                
+                done, _ = wait(list(running), timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    agent_name = running.pop(future)
+                    responses[agent_name] = future.result()
+                
+                now = time.monotonic()
+                for future, agent_name in list(running.items()):
+                    if agent_name in started_at and now - started_at[agent_name] > timeout:
+                        running.pop(future)
+                        cancel_events[agent_name].set()
+                        logger.error(f"Agent {agent_name} timed out after {timeout}s; "
+                                     f"stopping it at its next Bedrock call, in-flight work continues in the background")
+                        responses[agent_name] = self._timeout_response(agent_name, task, timeout)
+        finally:
+            # Agents still running after an error must not outlive the team either
+            for agent_name in running.values():
+                cancel_events[agent_name].set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return [responses[agent_name] for agent_name in agent_names]
+    
+    def _resolve_upstream(self, agent_names: List[str], dependencies: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Validate the dependency graph and return each agent's transitive upstream agents"""
+        for agent_name, deps in dependencies.items():
+            for dep in deps:
+                if dep not in agent_names:
+                    raise ValueError(f"Agent {agent_name} depends on {dep}, which is not part of the team")
+        
+        upstream: Dict[str, List[str]] = {}
+        visiting = set()
+        
+        def visit(agent_name: str) -> List[str]:
+            if agent_name in upstream:
+                return upstream[agent_name]
+            if agent_name in visiting:
+                raise ValueError(f"Dependency cycle detected at agent {agent_name}")
+            visiting.add(agent_name)
             
-            # Add previous responses to context for subsequent agents
-            if context is None:
-                context = {}
-            context[f"{agent_name}_response"] = response.content
+            ancestors: List[str] = []
+            for dep in dependencies.get(agent_name, []):
+                for ancestor in visit(dep) + [dep]:
+                    if ancestor not in ancestors:
+                        ancestors.append(ancestor)
+            
+            visiting.discard(agent_name)
+            upstream[agent_name] = ancestors
+            return ancestors
         
-        return responses
+        for agent_name in agent_names:
+            visit(agent_name)
+        return upstream
+    
+    def _timeout_response(self, agent_name: str, task: str, timeout: int) -> AgentResponse:
+        """Record an agent that exceeded the team timeout"""
+        response = AgentResponse(
+            agent_name=agent_name,
+            task=task,
+            content=f"Error: agent timed out after {timeout} seconds",
+            metadata={"error": True, "timeout": True},
+            timestamp=datetime.now(),
+            status="error",
+            confidence_score=0.0
+        )
+        with self._history_lock:
+            self.execution_history.append(response)
+        return response
     
     def get_execution_summary(self) -> Dict[str, Any]:
         """Get summary of all agent executions"""
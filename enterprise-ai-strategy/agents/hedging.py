@@ -0,0 +1,101 @@
+"""
+Hedged Bedrock requests for tail latency
+When the primary target has not produced its first byte within a delay derived
+from its recent time-to-first-byte distribution, a duplicate request goes to an
+equivalent target. A budget ties the number of hedges to the request volume.
+"""
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from config.aws_config import HedgingConfig, get_hedging_config
+
+logger = logging.getLogger(__name__)
+
+def parse_target(spec: str, default_region: str) -> Tuple[str, str]:
+    """Split "<model-or-profile>@<region>" into (target, region)
+    
+    Inference profile ARNs contain no "@", so the suffix is unambiguous.
+    """
+    target, _, region = spec.partition("@")
+    return target, region or default_region
+
+class HedgePolicy:
+    """Hedge delay and hedge budget for one primary target"""
+    
+    def __init__(self, target: str, config: HedgingConfig):
+        self.target = target
+        self.config = config
+        self._ttfb_samples: deque = deque(maxlen=config.sample_window)
+        self._budget = 1.0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+    
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary's first byte before hedging"""
+        with self._lock:
+            if len(self._ttfb_samples) < self.config.min_samples:
+                return self.config.default_delay_seconds
+            samples = sorted(self._ttfb_samples)
+        index = min(len(samples) - 1, int(self.config.delay_percentile * len(samples)))
+        return max(self.config.min_delay_seconds, samples[index])
+    
+    def record_request(self) -> None:
+        """Each primary request earns max_hedge_rate of a hedge"""
+        with self._lock:
+            self.requests += 1
+            self._budget = min(float(self.config.max_hedge_burst), self._budget + self.config.max_hedge_rate)
+    
+    def try_hedge(self) -> bool:
+        """Spend one hedge from the budget if available"""
+        with self._lock:
+            if self._budget < 1.0:
+                return False
+            self._budget -= 1.0
+            self.hedges += 1
+            return True
+    
+    def record_ttfb(self, seconds: float) -> None:
+        """Record the primary's time to first byte (a lower bound if it lost the race)"""
+        with self._lock:
+            self._ttfb_samples.append(seconds)
+    
+    def record_hedge_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+    
+    def metrics(self) -> Dict[str, Any]:
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "target": self.target,
+                "hedge_delay_seconds": round(delay, 3),
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_budget": round(self._budget, 2)
+            }
+
+_policies: Dict[str, HedgePolicy] = {}
+_policies_lock = threading.Lock()
+
+def get_hedge_policy(target: str) -> Optional[HedgePolicy]:
+    """Get the process-wide hedge policy for a target, or None if hedging is disabled"""
+    config = get_hedging_config()
+    if not config.enabled:
+        return None
+    with _policies_lock:
+        policy = _policies.get(target)
+        if policy is None:
+            policy = HedgePolicy(target, config)
+            _policies[target] = policy
+        return policy
+
+def get_hedge_metrics() -> Dict[str, Dict[str, Any]]:
+    """Hedge delay and counts for every hedged target seen by this process"""
+    with _policies_lock:
+        policies = list(_policies.values())
+    return {policy.target: policy.metrics() for policy in policies}
@@ -0,0 +1,200 @@
+"""
+Concurrent HTTP fetching for agents that pull external sources
+Shared pooled session, per-host concurrency limits and an on-disk cache
+that revalidates with ETag/Last-Modified so unchanged sources cost a 304
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlencode, urlsplit
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.aws_config import HTTPFetchConfig, get_http_fetch_config
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class FetchRequest:
+    """One GET request against an external source"""
+    url: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    
+    @property
+    def cache_key(self) -> str:
+        if not self.params:
+            return self.url
+        return f"{self.url}?{urlencode(sorted(self.params.items()))}"
+
+@dataclass
+class FetchResult:
+    """Outcome of a FetchRequest; body is served from cache on 304"""
+    url: str
+    status_code: Optional[int]
+    body: bytes = b""
+    from_cache: bool = False
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code == 200
+    
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+class HTTPCache:
+    """On-disk store of validated responses keyed by URL and query parameters"""
+    
+    def __init__(self, path: str, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_http_responses_fetched_at ON http_responses(fetched_at)")
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body FROM http_responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "body": row[2]}
+    
+    def set(self, key: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_responses (key, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM http_responses WHERE key IN ("
+                "SELECT key FROM http_responses ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+    
+    def touch(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE http_responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+class ConcurrentFetcher:
+    """Fan out GET requests over a pooled session with per-host limits"""
+    
+    def __init__(self, config: HTTPFetchConfig, cache: Optional[HTTPCache] = None):
+        self.config = config
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = config.user_agent
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_maxsize,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=Retry(
+                total=config.max_retries,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=("GET",)
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=config.max_workers, thread_name_prefix="http-fetch")
+        self._host_limits: Dict[str, threading.Semaphore] = {}
+        self._host_limits_lock = threading.Lock()
+    
+    def _host_limit(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc
+        with self._host_limits_lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                overrides = self.config.host_concurrency or {}
+                limit = threading.Semaphore(overrides.get(host, self.config.per_host_concurrency))
+                self._host_limits[host] = limit
+            return limit
+    
+    def fetch(self, request: FetchRequest) -> FetchResult:
+        """GET one URL, revalidating any cached copy; never raises"""
+        cached = self.cache.get(request.cache_key) if self.cache else None
+        headers = dict(request.headers)
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        try:
+            with self._host_limit(request.url):
+                response = self.session.get(
+                    request.url,
+                    params=request.params or None,
+                    headers=headers,
+                    timeout=self.config.timeout_seconds
+                )
+        except requests.RequestException as e:
+            logger.warning(f"Fetch failed for {request.url}: {str(e)}")
+            if cached:
+                # Serve the last validated copy rather than dropping the source
+                return FetchResult(request.url, 200, cached["body"], from_cache=True)
+            return FetchResult(request.url, None, error=str(e))
+        
+        if response.status_code == 304 and cached:
+            self.cache.touch(request.cache_key)
+            return FetchResult(request.url, 200, cached["body"], from_cache=True)
+        
+        if response.status_code == 200 and self.cache:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.set(request.cache_key, etag, last_modified, response.content)
+        
+        error = None if response.status_code == 200 else f"HTTP {response.status_code}"
+        return FetchResult(request.url, response.status_code, response.content, error=error)
+    
+    def fetch_all(self, requests_to_fetch: List[FetchRequest]) -> List[FetchResult]:
+        """Fetch all requests concurrently; results are in request order"""
+        return list(self._executor.map(self.fetch, requests_to_fetch))
+
+_default_fetcher: Optional[ConcurrentFetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+def get_http_fetcher() -> ConcurrentFetcher:
+    """Get the process-wide fetcher shared by all agents"""
+    global _default_fetcher
+    
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            config = get_http_fetch_config()
+            cache = None
+            if config.cache_enabled:
+                try:
+                    cache = HTTPCache(config.cache_path, config.cache_max_entries)
+                except sqlite3.Error as e:
+                    logger.warning(f"HTTP cache unavailable, continuing without it: {str(e)}")
+            _default_fetcher = ConcurrentFetcher(config, cache)
+        return _default_fetcher
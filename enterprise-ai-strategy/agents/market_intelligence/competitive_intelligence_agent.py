@@ -2,11 +2,11 @@
 Competitive Intelligence Agent - Analyzes competitive landscape and positioning
 """
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 import logging
 
-from ..base_agent import BaseAgent, AgentResponse
+from ..base_agent import BaseAgent, AgentResponse, TaskClass
 
 logger = logging.getLogger(__name__)
 
@@ -90,7 +90,33 @@ Provide competitive intelligence that includes:
 
 Generate analysis suitable for executive briefings and strategic planning."""
     
-    def identify_competitors(self, tool_name: str, tool_category: str = None) -> List[str]:
+    def classify_tool_category(self, tool_name: str, tool_description: str = "") -> Optional[str]:
+        """Pick the closest known tool category with a cheap classification call
+        
+        Only used for tools the keyword heuristic in identify_competitors misses.
+        """
+        categories = list(self.tool_categories.keys())
+        prompt = f"""Classify this AI developer tool into exactly one category.
+
+Tool: {tool_name}
+Description: {tool_description or 'N/A'}
+
+Categories: {', '.join(categories)}
+
+Respond with the category name only."""
+        
+        try:
+            category = self._call_bedrock(
+                prompt,
+                task_class=TaskClass.CLASSIFY,
+                validate=lambda text: text.strip().lower() in categories
+            ).strip().lower()
+        except Exception as e:
+            logger.warning(f"Tool classification failed, using default competitors: {str(e)}")
+            return None
+        return category if category in categories else None
+    
+    def identify_competitors(self, tool_name: str, tool_category: str = None, tool_description: str = "") -> List[str]:
         """Identify main competitors for a given tool"""
         competitors = []
         
@@ -105,6 +131,10 @@ Generate analysis suitable for executive briefings and strategic planning."""
                     competitors.extend(self.tool_categories["testing_tools"])
                 elif any(keyword in tool_name_lower for keyword in ["devops", "ci", "cd", "deploy"]):
                     competitors.extend(self.tool_categories["devops_automation"])
+            
+            # Fall back to a classification call only when no keyword matched
+            if not competitors:
+                competitors = list(self.tool_categories.get(self.classify_tool_category(tool_name, tool_description), []))
         else:
             competitors = self.tool_categories.get(tool_category, [])
         
@@ -144,7 +174,7 @@ Generate analysis suitable for executive briefings and strategic planning."""
             
             # Identify competitors if not provided
             if not competitors:
-                competitors = self.identify_competitors(tool_name, tool_category)
+                competitors = self.identify_competitors(tool_name, tool_category, context.get("tool_description", ""))
             
             # Analyze market trends
             market_trends = self.analyze_market_trends(tool_category or "ai_development_tools")
@@ -1,13 +1,13 @@
 """
 Deep Evaluation Agent - Generates comprehensive 10-page evaluations of AI tools
 """
-import requests
 import json
 from typing import Dict, List, Any
 from datetime import datetime
 import logging
 
 from ..base_agent import BaseAgent, AgentResponse
+from .github_client import get_github_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +16,9 @@ class DeepEvaluationAgent(BaseAgent):
     
     def __init__(self):
         super().__init__("deep_evaluation_agent")
+        
+        # Batched GitHub enrichment with a cache shared across agents
+        self.github_client = get_github_client()
     
     def get_system_prompt(self) -> str:
         return """You are an expert enterprise AI tool evaluation specialist for Nationwide Insurance.
@@ -64,76 +67,46 @@ Include specific recommendations for Nationwide's development teams."""
     
     def gather_tool_information(self, tool_name: str, tool_url: str = None) -> Dict[str, Any]:
         """Gather comprehensive information about the tool"""
-        tool_info = {
-            "basic_info": {},
-            "github_data": {},
-            "documentation": {},
-            "community": {},
-            "vendor_info": {}
-        }
-        
+        return self.gather_tools_information([{"tool_name": tool_name, "tool_url": tool_url}])[0]
+    
+    def gather_tools_information(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Gather information for several tools, enriching all GitHub repos in one batch"""
+        github_urls = [tool.get("tool_url") for tool in tools if "github.com" in (tool.get("tool_url") or "")]
         try:
-            # Try to gather GitHub information if it's a GitHub project
-            if "github.com" in (tool_url or ""):
-                github_info = self._get_github_info(tool_url)
-                tool_info["github_data"] = github_info
+            github_info = self.github_client.get_repos_info(github_urls) if github_urls else {}
+        except Exception as e:
+            logger.error(f"Error getting GitHub info: {str(e)}")
+            github_info = {}
+        
+        tools_info = []
+        for tool in tools:
+            tool_info = {
+                "basic_info": {},
+                "github_data": {},
+                "documentation": {},
+                "community": {},
+                "vendor_info": {}
+            }
             
-            # Search for additional information
-            search_info = self._search_tool_information(tool_name)
-            tool_info["search_results"] = search_info
+            try:
+                # Use GitHub information if it's a GitHub project
+                if tool.get("tool_url") in github_info:
+                    tool_info["github_data"] = github_info[tool["tool_url"]]
+                
+                # Search for additional information
+                search_info = self._search_tool_information(tool.get("tool_name", ""))
+                tool_info["search_results"] = search_info
+                
+            except Exception as e:
+                logger.error(f"Error gathering tool information: {str(e)}")
             
-        except Exception as e:
-            logger.error(f"Error gathering tool information: {str(e)}")
+            tools_info.append(tool_info)
         
-        return tool_info
+        return tools_info
     
     def _get_github_info(self, github_url: str) -> Dict[str, Any]:
         """Get GitHub repository information"""
-        try:
-            # Extract owner and repo from URL
-            parts = github_url.rstrip('/').split('/')
-            owner, repo = parts[-2], parts[-1]
-            
-            # Get repository data
-            repo_url = f"https://api.github.com/repos/{owner}/{repo}"
-            response = requests.get(repo_url)
-            
-            if response.status_code == 200:
-                repo_data = response.json()
-                
-                # Get additional data
-                releases_url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-                releases_response = requests.get(releases_url)
-                releases = releases_response.json() if releases_response.status_code == 200 else []
-                
-                contributors_url = f"https://api.github.com/repos/{owner}/{repo}/contributors"
-                contributors_response = requests.get(contributors_url)
-                contributors = contributors_response.json() if contributors_response.status_code == 200 else []
-                
-                return {
-                    "stars": repo_data.get("stargazers_count", 0),
-                    "forks": repo_data.get("forks_count", 0),
-                    "watchers": repo_data.get("watchers_count", 0),
-                    "open_issues": repo_data.get("open_issues_count", 0),
-                    "language": repo_data.get("language", ""),
-                    "size": repo_data.get("size", 0),
-                    "created_at": repo_data.get("created_at", ""),
-                    "updated_at": repo_data.get("updated_at", ""),
-                    "description": repo_data.get("description", ""),
-                    "homepage": repo_data.get("homepage", ""),
-                    "license": repo_data.get("license", {}).get("name", "") if repo_data.get("license") else "",
-                    "topics": repo_data.get("topics", []),
-                    "has_issues": repo_data.get("has_issues", False),
-                    "has_wiki": repo_data.get("has_wiki", False),
-                    "has_pages": repo_data.get("has_pages", False),
-                    "releases_count": len(releases),
-                    "latest_release": releases[0] if releases else None,
-                    "contributors_count": len(contributors),
-                    "top_contributors": contributors[:5] if contributors else []
-                }
-        except Exception as e:
-            logger.error(f"Error getting GitHub info: {str(e)}")
-            return {}
+        return self.github_client.get_repo_info(github_url)
     
     def _search_tool_information(self, tool_name: str) -> Dict[str, Any]:
         """Search for additional tool information"""
@@ -149,6 +122,10 @@ Include specific recommendations for Nationwide's development teams."""
     def process_task(self, task: str, context: Dict[str, Any] = None) -> AgentResponse:
         """Process deep evaluation task"""
         try:
+            # A "tools" list evaluates a shortlist in one batch
+            if context and context.get("tools"):
+                return self._evaluate_tools(task, context["tools"])
+            
             # Extract tool information from context
             tool_name = context.get("tool_name", "") if context else ""
             tool_url = context.get("tool_url", "") if context else ""
@@ -194,9 +171,51 @@ Include specific recommendations for Nationwide's development teams."""
                 confidence_score=0.0
             )
     
+    def _evaluate_tools(self, task: str, tools: List[Dict[str, Any]]) -> AgentResponse:
+        """Evaluate several tools: one GitHub enrichment batch, then concurrent evaluations"""
+        if any(not tool.get("tool_name") for tool in tools):
+            raise ValueError("Tool name is required for deep evaluation")
+        
+        tools_info = self.gather_tools_information(tools)
+        evaluations = self._call_bedrock_many(
+            [
+                self._evaluation_prompt(tool["tool_name"], tool.get("tool_description", ""), tool_info)
+                for tool, tool_info in zip(tools, tools_info)
+            ],
+            self.get_system_prompt()
+        )
+        
+        documents = [
+            self._generate_hugo_evaluation(tool["tool_name"], evaluation, tool_info)
+            for tool, evaluation, tool_info in zip(tools, evaluations, tools_info)
+        ]
+        
+        metadata = {
+            "evaluation_date": datetime.now().isoformat(),
+            "evaluation_type": "comprehensive_batch",
+            "tools_evaluated": len(tools),
+            "evaluations": [
+                {
+                    "tool_name": tool["tool_name"],
+                    "tool_url": tool.get("tool_url", ""),
+                    "github_stars": tool_info.get("github_data", {}).get("stars", 0)
+                }
+                for tool, tool_info in zip(tools, tools_info)
+            ]
+        }
+        
+        return self._create_response(
+            task=task,
+            content="\n\n".join(documents),
+            metadata=metadata,
+            confidence_score=0.9
+        )
+    
     def _generate_comprehensive_evaluation(self, tool_name: str, description: str, tool_info: Dict[str, Any]) -> str:
         """Generate comprehensive evaluation using Claude Sonnet"""
-        
+        return self._call_bedrock(self._evaluation_prompt(tool_name, description, tool_info), self.get_system_prompt())
+    
+    def _evaluation_prompt(self, tool_name: str, description: str, tool_info: Dict[str, Any]) -> str:
         github_data = tool_info.get("github_data", {})
         search_data = tool_info.get("search_results", {})
         
@@ -234,7 +253,7 @@ Include specific assessments for different developer personas:
 
 Provide actionable recommendations and realistic timelines."""
         
-        return self._call_bedrock(prompt, self.get_system_prompt())
+        return prompt
     
     def _generate_hugo_evaluation(self, tool_name: str, evaluation_content: str, tool_info: Dict[str, Any]) -> str:
         """Generate Hugo-compatible evaluation document"""
@@ -0,0 +1,148 @@
+"""
+GitHub Client - Batched repository enrichment shared by market intelligence agents
+Fetches repo, release and contributor data for many repositories in parallel
+over the pooled HTTP fetcher and keeps results in a process-wide TTL cache
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+from config.aws_config import GitHubConfig, get_github_config
+from ..http_fetcher import ConcurrentFetcher, FetchRequest, get_http_fetcher
+from .tool_dedup import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+def parse_repo_slug(url: str) -> Optional[Tuple[str, str]]:
+    """Owner and repository name from a GitHub URL, or None if it is not one"""
+    canonical = canonicalize_url(url or "")
+    if not canonical or not canonical.startswith("github:"):
+        return None
+    parts = canonical[len("github:"):].split("/")
+    if len(parts) != 2 or not all(parts):
+        return None
+    return parts[0], parts[1]
+
+class GitHubEnrichmentClient:
+    """Batched, cached GitHub REST enrichment"""
+    
+    def __init__(self, config: GitHubConfig, fetcher: ConcurrentFetcher):
+        self.config = config
+        self.fetcher = fetcher
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.config.token:
+            headers["Authorization"] = f"Bearer {self.config.token}"
+        return headers
+    
+    def _cache_get(self, slug: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            entry = self._cache.get(slug)
+            if entry is None or time.monotonic() - entry[0] > self.config.cache_ttl_seconds:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(slug)
+            self.cache_hits += 1
+            return entry[1]
+    
+    def _cache_set(self, slug: str, data: Dict[str, Any]) -> None:
+        with self._cache_lock:
+            self._cache[slug] = (time.monotonic(), data)
+            self._cache.move_to_end(slug)
+            while len(self._cache) > self.config.cache_max_entries:
+                self._cache.popitem(last=False)
+    
+    def get_repo_info(self, github_url: str) -> Dict[str, Any]:
+        """Enrichment data for one repository ({} if unavailable)"""
+        return self.get_repos_info([github_url]).get(github_url, {})
+    
+    def get_repos_info(self, github_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Enrichment data keyed by the given URLs, fetched in one parallel batch
+        
+        Repository, releases and contributors for every uncached repo are
+        requested concurrently; unchanged resources revalidate as 304s.
+        URLs that are not GitHub repositories or fail to load map to {}.
+        """
+        slugs = {url: parse_repo_slug(url) for url in github_urls}
+        results: Dict[str, Dict[str, Any]] = {}
+        to_fetch: List[Tuple[str, str]] = []
+        
+        for slug in dict.fromkeys(slug for slug in slugs.values() if slug):
+            cached = self._cache_get("/".join(slug))
+            if cached is not None:
+                results["/".join(slug)] = cached
+            else:
+                to_fetch.append(slug)
+        
+        if to_fetch:
+            headers = self._headers()
+            requests_to_fetch = []
+            for owner, repo in to_fetch:
+                base = f"{self.config.api_url}/repos/{owner}/{repo}"
+                requests_to_fetch.extend([
+                    FetchRequest(base, headers=headers),
+                    FetchRequest(f"{base}/releases", headers=headers),
+                    FetchRequest(f"{base}/contributors", headers=headers)
+                ])
+            
+            fetched = self.fetcher.fetch_all(requests_to_fetch)
+            for index, (owner, repo) in enumerate(to_fetch):
+                repo_result, releases_result, contributors_result = fetched[index * 3:index * 3 + 3]
+                if not repo_result.ok:
+                    logger.error(f"Error getting GitHub info for {owner}/{repo}: {repo_result.error}")
+                    continue
+                try:
+                    data = self._build_repo_info(
+                        repo_result.json(),
+                        releases_result.json() if releases_result.ok else [],
+                        contributors_result.json() if contributors_result.ok else []
+                    )
+                except ValueError as e:
+                    logger.error(f"Error parsing GitHub info for {owner}/{repo}: {str(e)}")
+                    continue
+                self._cache_set(f"{owner}/{repo}", data)
+                results[f"{owner}/{repo}"] = data
+        
+        return {url: results.get("/".join(slug), {}) if slug else {} for url, slug in slugs.items()}
+    
+    def _build_repo_info(self, repo_data: Dict[str, Any], releases: List[Any], contributors: List[Any]) -> Dict[str, Any]:
+        return {
+            "stars": repo_data.get("stargazers_count", 0),
+            "forks": repo_data.get("forks_count", 0),
+            "watchers": repo_data.get("watchers_count", 0),
+            "open_issues": repo_data.get("open_issues_count", 0),
+            "language": repo_data.get("language", ""),
+            "size": repo_data.get("size", 0),
+            "created_at": repo_data.get("created_at", ""),
+            "updated_at": repo_data.get("updated_at", ""),
+            "description": repo_data.get("description", ""),
+            "homepage": repo_data.get("homepage", ""),
+            "license": repo_data.get("license", {}).get("name", "") if repo_data.get("license") else "",
+            "topics": repo_data.get("topics", []),
+            "has_issues": repo_data.get("has_issues", False),
+            "has_wiki": repo_data.get("has_wiki", False),
+            "has_pages": repo_data.get("has_pages", False),
+            "releases_count": len(releases),
+            "latest_release": releases[0] if releases else None,
+            "contributors_count": len(contributors),
+            "top_contributors": contributors[:5] if contributors else []
+        }
+
+_default_client: Optional[GitHubEnrichmentClient] = None
+_default_client_lock = threading.Lock()
+
+def get_github_client() -> GitHubEnrichmentClient:
+    """Get the process-wide GitHub client whose cache all agents share"""
+    global _default_client
+    
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = GitHubEnrichmentClient(get_github_config(), get_http_fetcher())
+        return _default_client
@@ -2,20 +2,80 @@
 Risk Assessment Agent - Evaluates security, compliance, and enterprise risks
 """
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Literal
 from datetime import datetime
 import logging
 
+from pydantic import Field
+
 from ..base_agent import BaseAgent, AgentResponse
+from ..structured_output import StructuredOutput
+from .github_client import get_github_client
 
 logger = logging.getLogger(__name__)
 
+RiskLevel = Literal["Critical", "High", "Medium", "Low"]
+
+# Shields.io badge colors per risk level
+RISK_LEVEL_COLORS = {"Critical": "red", "High": "orange", "Medium": "yellow", "Low": "green"}
+
+class RiskCategoryAssessment(StructuredOutput):
+    """Assessment of one risk category"""
+    category: str = Field(description="Risk category, e.g. security, compliance, operational, financial, legal")
+    risk_level: RiskLevel
+    impact_score: int = Field(ge=1, le=5, description="1-5, 5 = severe business impact")
+    probability_score: int = Field(ge=1, le=5, description="1-5, 5 = very likely to occur")
+    description: str = Field(description="Detailed explanation of the risk")
+    mitigation_strategies: List[str] = Field(description="Specific actions to reduce the risk")
+    monitoring_requirements: List[str] = Field(description="How to track and monitor the risk")
+    timeline: str = Field(description="When mitigation should be implemented")
+    
+    @property
+    def mitigation_priority(self) -> str:
+        score = self.impact_score * self.probability_score
+        if score >= 15:
+            return "Critical"
+        if score >= 9:
+            return "High"
+        return "Medium" if score >= 4 else "Low"
+
+class RiskAssessmentResult(StructuredOutput):
+    """Record the enterprise risk assessment of an AI tool"""
+    overall_risk_level: RiskLevel
+    recommendation: Literal["Approve", "Approve with Conditions", "Pilot Only", "Reject"]
+    executive_summary: str = Field(description="Two to four sentence summary for executives")
+    categories: List[RiskCategoryAssessment] = Field(description="One entry per assessed risk category")
+    enterprise_controls: List[str] = Field(description="Recommended enterprise controls and governance")
+    
+    def to_markdown(self) -> str:
+        sections = [f"## Executive Summary\n\n{self.executive_summary}"]
+        for category in self.categories:
+            sections.append(f"""## {category.category.title()} Risk
+
+**Risk Level:** {category.risk_level}  
+**Impact:** {category.impact_score}/5  
+**Probability:** {category.probability_score}/5  
+**Timeline:** {category.timeline}
+
+{category.description}
+
+**Mitigation Strategies:**
+{chr(10).join(f"- {item}" for item in category.mitigation_strategies)}
+
+**Monitoring Requirements:**
+{chr(10).join(f"- {item}" for item in category.monitoring_requirements)}""")
+        sections.append(f"## Recommended Enterprise Controls\n\n{chr(10).join(f'- {item}' for item in self.enterprise_controls)}")
+        return "\n\n".join(sections)
+
 class RiskAssessmentAgent(BaseAgent):
     """Agent for assessing enterprise risks of AI tools"""
     
     def __init__(self):
         super().__init__("risk_assessment_agent")
         
+        # GitHub enrichment shared with DeepEvaluationAgent, so repos it just evaluated are cached
+        self.github_client = get_github_client()
+        
         # Risk assessment frameworks
         self.risk_categories = {
             "security": {
@@ -149,11 +209,16 @@ Output risk assessments with:
         try:
             tool_name = context.get("tool_name", "") if context else ""
             tool_info = context.get("tool_info", {}) if context else {}
+            tool_url = context.get("tool_url", "") if context else ""
             risk_categories = context.get("risk_categories", list(self.risk_categories.keys())) if context else list(self.risk_categories.keys())
             
             if not tool_name:
                 raise ValueError("Tool name is required for risk assessment")
             
+            # Fill in GitHub data from the shared enrichment cache when not supplied
+            if not tool_info.get("github_data") and "github.com" in tool_url:
+                tool_info = {**tool_info, "github_data": self.github_client.get_repo_info(tool_url)}
+            
             # Conduct comprehensive risk assessment
             risk_assessment = self._generate_comprehensive_risk_assessment(
                 tool_name, tool_info, risk_categories
@@ -168,14 +233,16 @@ Output risk assessments with:
                 "tool_name": tool_name,
                 "assessment_date": datetime.now().isoformat(),
                 "risk_categories": risk_categories,
-                "overall_risk_level": risk_assessment.get("overall_risk_level", "Medium")
+                "overall_risk_level": risk_assessment.overall_risk_level,
+                "recommendation": risk_assessment.recommendation
             }
             
             return self._create_response(
                 task=task,
                 content=hugo_content,
                 metadata=metadata,
-                confidence_score=0.85
+                confidence_score=0.85,
+                structured=risk_assessment
             )
             
         except Exception as e:
@@ -187,7 +254,7 @@ Output risk assessments with:
                 confidence_score=0.0
             )
     
-    def _generate_comprehensive_risk_assessment(self, tool_name: str, tool_info: Dict[str, Any], risk_categories: List[str]) -> str:
+    def _generate_comprehensive_risk_assessment(self, tool_name: str, tool_info: Dict[str, Any], risk_categories: List[str]) -> RiskAssessmentResult:
         """Generate comprehensive risk assessment using Claude Sonnet"""
         
         # Prepare tool information for analysis
@@ -211,16 +278,7 @@ Initial Risk Analysis:
 Security Factors: {security_risks.get('risk_factors', [])}
 Compliance Gaps: {compliance_risks.get('compliance_gaps', [])}
 
-Assess risks across these categories: {', '.join(risk_categories)}
-
-For each risk category, provide:
-1. **Risk Level**: Critical/High/Medium/Low
-2. **Impact Score**: 1-5 (5 = severe business impact)
-3. **Probability Score**: 1-5 (5 = very likely to occur)
-4. **Risk Description**: Detailed explanation of the risk
-5. **Mitigation Strategies**: Specific actions to reduce risk
-6. **Monitoring Requirements**: How to track and monitor this risk
-7. **Timeline**: When mitigation should be implemented
+Assess risks across these categories, with one assessment per category: {', '.join(risk_categories)}
 
 Consider Nationwide-specific factors:
 - 1000+ developers using the tool
@@ -237,12 +295,18 @@ Provide an overall risk recommendation:
 
 Include specific recommendations for enterprise controls and governance."""
         
-        return self._call_bedrock(prompt, self.get_system_prompt())
+        return self._call_bedrock_structured(prompt, RiskAssessmentResult, self.get_system_prompt())
     
-    def _generate_hugo_risk_assessment(self, tool_name: str, risk_assessment: str, tool_info: Dict[str, Any]) -> str:
-        """Generate Hugo-compatible risk assessment document"""
+    def _generate_hugo_risk_assessment(self, tool_name: str, risk_assessment: RiskAssessmentResult, tool_info: Dict[str, Any]) -> str:
+        """Generate Hugo-compatible risk assessment document, rendered locally from the structured result"""
         
         github_data = tool_info.get("github_data", {})
+        risk_level = risk_assessment.overall_risk_level
+        risk_matrix = "\n".join(
+            f"| {category.category.title()} | {category.risk_level} | {category.impact_score} | "
+            f"{category.probability_score} | {category.mitigation_priority} |"
+            for category in risk_assessment.categories
+        )
         
         hugo_frontmatter = f"""---
 title: "Risk Assessment: {tool_name}"
@@ -253,7 +317,8 @@ categories: ["executive", "security"]
 summary: "Comprehensive enterprise risk assessment of {tool_name}"
 tool_name: "{tool_name}"
 assessment_type: "enterprise_risk"
-risk_level: "Medium"  # Will be updated based on assessment
+risk_level: "{risk_level}"
+recommendation: "{risk_assessment.recommendation}"
 security_reviewed: true
 compliance_reviewed: true
 ---
@@ -266,25 +331,19 @@ compliance_reviewed: true
 
 [![Security](https://img.shields.io/badge/security-under%20review-yellow?style=flat-square)]()
 [![Compliance](https://img.shields.io/badge/compliance-under%20review-yellow?style=flat-square)]()
-[![Risk Level](https://img.shields.io/badge/risk%20level-medium-orange?style=flat-square)]()
-
-## Executive Summary
+[![Risk Level](https://img.shields.io/badge/risk%20level-{risk_level.lower()}-{RISK_LEVEL_COLORS[risk_level]}?style=flat-square)]()
 
-**Overall Risk Level:** To be determined based on detailed assessment  
-**Recommendation:** Pending comprehensive review  
-**Key Risk Areas:** Security, Compliance, Operational  
+**Overall Risk Level:** {risk_level}  
+**Recommendation:** {risk_assessment.recommendation}  
+**Key Risk Areas:** {", ".join(category.category.title() for category in risk_assessment.categories if category.risk_level in ("Critical", "High")) or "None rated High or Critical"}  
 
-{risk_assessment}
+{risk_assessment.to_markdown()}
 
 ## Risk Matrix
 
 | Risk Category | Level | Impact | Probability | Mitigation Priority |
 |---------------|--------|--------|-------------|-------------------|
-| Security | TBD | TBD | TBD | High |
-| Compliance | TBD | TBD | TBD | Critical |
-| Operational | TBD | TBD | TBD | Medium |
-| Financial | TBD | TBD | TBD | Medium |
-| Legal | TBD | TBD | TBD | High |
+{risk_matrix}
 
 ## Monitoring Dashboard
 
@@ -0,0 +1,216 @@
+"""
+Tool Catalog - Persistent record of discovered tools and their analyses
+Lets discovery fetch only items past each source's high-water mark and
+send only new or materially changed tools to the LLM
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Any, Optional
+import logging
+
+from config.aws_config import ToolCatalogConfig, get_tool_catalog_config
+from .tool_dedup import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse ISO 8601 or RFC 822 timestamps from source APIs into aware UTC datetimes"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(str(value))
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def tool_key(tool: Dict[str, Any]) -> str:
+    """Stable catalog key: repo slug for GitHub, canonical URL otherwise"""
+    canonical = canonicalize_url(tool.get("url", ""))
+    if canonical:
+        return canonical
+    return f"{tool.get('source', 'unknown')}:{(tool.get('name') or '').strip().lower()}"
+
+class ToolCatalog:
+    """SQLite-backed catalog of tools, per-source watermarks and LLM analyses"""
+    
+    def __init__(self, config: ToolCatalogConfig):
+        self.config = config
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(config.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(config.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tools (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                data TEXT NOT NULL,
+                popularity INTEGER,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                analysis_id INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                tool_count INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                source TEXT PRIMARY KEY,
+                watermark TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tools_analysis_id ON tools(analysis_id);
+        """)
+        self._conn.commit()
+    
+    def get_watermark(self, source: str) -> Optional[datetime]:
+        """Point in time before which a source's items have all been recorded"""
+        with self._lock:
+            row = self._conn.execute("SELECT watermark FROM watermarks WHERE source = ?", (source,)).fetchone()
+        return parse_timestamp(row[0]) if row else None
+    
+    def select_changed(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tools that are new to the catalog or materially changed since last analyzed"""
+        keys = [tool_key(tool) for tool in tools]
+        with self._lock:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in self._conn.execute(
+                    f"SELECT key, popularity, analysis_id FROM tools WHERE key IN ({','.join('?' * len(keys))})",
+                    keys
+                )
+            } if keys else {}
+        
+        changed, seen = [], set()
+        for key, tool in zip(keys, tools):
+            if key in seen:
+                continue
+            seen.add(key)
+            previous = known.get(key)
+            if previous is None or previous[1] is None or self._materially_changed(tool, previous[0]):
+                changed.append(tool)
+        return changed
+    
+    def _materially_changed(self, tool: Dict[str, Any], popularity: Optional[int]) -> bool:
+        """Whether stars or points grew by both the absolute and relative thresholds"""
+        current = _popularity(tool)
+        if current is None or popularity is None:
+            return False
+        delta = current - popularity
+        return delta >= self.config.min_star_delta and delta >= popularity * self.config.star_change_ratio
+    
+    def record_run(self, tools: List[Dict[str, Any]], analyzed: List[Dict[str, Any]], analysis: Optional[str],
+                   complete_sources: List[str] = (), run_started: Optional[datetime] = None) -> Optional[int]:
+        """Persist a discovery run: upsert tools, attach the new analysis and advance watermarks
+        
+        Only complete_sources advance, i.e. sources whose every query returned
+        less than a full page: a truncated top-N result says nothing about the
+        items it cut off. Their watermark moves to run_started minus the
+        overlap window rather than to the newest item seen.
+        
+        Called only after analysis succeeds so a failed run is retried in full.
+        Returns the stored analysis ID, if any.
+        """
+        now = time.time()
+        analyzed_keys = {tool_key(tool) for tool in analyzed}
+        watermark = None
+        if run_started is not None:
+            watermark = run_started.astimezone(timezone.utc) - timedelta(hours=self.config.watermark_overlap_hours)
+        
+        with self._lock:
+            analysis_id = None
+            if analysis and analyzed_keys:
+                analysis_id = self._conn.execute(
+                    "INSERT INTO analyses (content, tool_count, created_at) VALUES (?, ?, ?)",
+                    (analysis, len(analyzed_keys), now)
+                ).lastrowid
+            
+            for tool in tools:
+                key = tool_key(tool)
+                is_analyzed = key in analyzed_keys
+                self._conn.execute(
+                    """
+                    INSERT INTO tools (key, source, data, popularity, first_seen, last_seen, analysis_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        data = excluded.data,
+                        last_seen = excluded.last_seen,
+                        popularity = CASE WHEN ? THEN excluded.popularity ELSE tools.popularity END,
+                        analysis_id = CASE WHEN ? THEN excluded.analysis_id ELSE tools.analysis_id END
+                    """,
+                    (key, tool.get("source", ""), json.dumps(tool, default=str), _popularity(tool),
+                     now, now, analysis_id if is_analyzed else None, is_analyzed, is_analyzed)
+                )
+            
+            for source in complete_sources if watermark is not None else ():
+                self._conn.execute(
+                    """
+                    INSERT INTO watermarks (source, watermark, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(source) DO UPDATE SET
+                        watermark = MAX(watermarks.watermark, excluded.watermark),
+                        updated_at = excluded.updated_at
+                    """,
+                    (source, watermark.strftime("%Y-%m-%dT%H:%M:%S.%f+00:00"), now)
+                )
+            self._conn.commit()
+        return analysis_id
+    
+    def recent_tools(self, since: datetime, sources: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Catalog tools seen since a point in time, most popular first"""
+        query = "SELECT data FROM tools WHERE last_seen >= ?"
+        params: List[Any] = [since.timestamp()]
+        if sources:
+            query += f" AND source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        query += " ORDER BY COALESCE(popularity, 0) DESC, last_seen DESC"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def analyses_since(self, since: datetime, exclude_id: Optional[int] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Stored LLM analyses generated since a point in time, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, content, tool_count, created_at FROM analyses "
+                "WHERE created_at >= ? AND id != ? ORDER BY created_at DESC LIMIT ?",
+                (since.timestamp(), exclude_id or -1, limit)
+            ).fetchall()
+        return [
+            {"id": row[0], "content": row[1], "tool_count": row[2], "created_at": datetime.fromtimestamp(row[3], timezone.utc)}
+            for row in rows
+        ]
+
+def _popularity(tool: Dict[str, Any]) -> Optional[int]:
+    value = tool.get("stars", tool.get("points"))
+    return int(value) if isinstance(value, (int, float)) else None
+
+_default_catalog: Optional[ToolCatalog] = None
+_default_catalog_lock = threading.Lock()
+
+def get_tool_catalog() -> Optional[ToolCatalog]:
+    """Get the process-wide tool catalog, or None if it cannot be opened"""
+    global _default_catalog
+    
+    with _default_catalog_lock:
+        if _default_catalog is None:
+            try:
+                _default_catalog = ToolCatalog(get_tool_catalog_config())
+            except sqlite3.Error as e:
+                logger.warning(f"Tool catalog unavailable, discovery will not be incremental: {str(e)}")
+                return None
+        return _default_catalog
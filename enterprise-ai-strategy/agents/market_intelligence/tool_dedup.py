@@ -0,0 +1,143 @@
+"""
+Tool Dedup - Cluster the same tool reported by several discovery sources
+URL canonicalization catches exact matches; SimHash over names and
+descriptions catches reposts and near-identical write-ups
+"""
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that never change what a URL points at
+TRACKING_PARAMS = {"ref", "ref_src", "source", "via", "fbclid", "gclid", "mc_cid", "mc_eid"}
+
+# Title prefixes Hacker News adds to submissions
+TITLE_PREFIXES = re.compile(r"^(show|ask|launch|tell) hn:\s*", re.IGNORECASE)
+
+SIMHASH_BITS = 64
+
+# Tools whose fingerprints differ in at most this many bits are near-duplicates
+SIMHASH_MAX_DISTANCE = 3
+
+# Bands for candidate lookup; more bands than the max distance guarantees
+# every near-duplicate pair shares at least one identical band
+SIMHASH_BANDS = 4
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """Canonical form of a tool URL, or None if there is no usable URL
+    
+    Lowercases scheme and host, drops "www.", fragments, trailing slashes and
+    tracking parameters, and reduces GitHub URLs to the owner/repo slug.
+    """
+    url = (url or "").strip()
+    if not url:
+        return None
+    
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    
+    path = parts.path.rstrip("/")
+    if host == "github.com":
+        slug = "/".join(path.strip("/").lower().split("/")[:2])
+        return f"github:{slug.removesuffix('.git')}"
+    
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    return urlunsplit(("https", host, path, query, ""))
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams"""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+    
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+def _tool_text(tool: Dict[str, Any]) -> str:
+    name = TITLE_PREFIXES.sub("", tool.get("name") or "")
+    description = tool.get("description") or ""
+    if description == tool.get("name"):
+        description = ""
+    return f"{name} {description}"
+
+def _merge_cluster(tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Collapse a cluster into its most popular member with merged signals"""
+    if len(tools) == 1:
+        return tools[0]
+    
+    representative = max(tools, key=lambda tool: (tool.get("stars") or 0, tool.get("points") or 0))
+    merged = dict(representative)
+    
+    stars = [tool["stars"] for tool in tools if tool.get("stars") is not None]
+    if stars:
+        merged["stars"] = max(stars)
+    if any("points" in tool for tool in tools):
+        merged["points"] = sum(tool.get("points") or 0 for tool in tools)
+        merged["comments"] = sum(tool.get("comments") or 0 for tool in tools)
+    
+    merged["sources"] = sorted({source for tool in tools for source in tool.get("sources", [tool.get("source", "")])})
+    merged["related_urls"] = sorted({tool["url"] for tool in tools if tool.get("url")} - {representative.get("url")})
+    merged["mentions"] = sum(tool.get("mentions", 1) for tool in tools)
+    return merged
+
+def dedupe_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cluster near-duplicate tools and merge each cluster into one entry
+    
+    Order follows each cluster's first appearance in the input.
+    """
+    parent = list(range(len(tools)))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def union(i: int, j: int) -> None:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    
+    by_url: Dict[str, int] = {}
+    for i, tool in enumerate(tools):
+        canonical = canonicalize_url(tool.get("url", ""))
+        if canonical is None:
+            continue
+        if canonical in by_url:
+            union(i, by_url[canonical])
+        else:
+            by_url[canonical] = i
+    
+    fingerprints = [simhash(_tool_text(tool)) for tool in tools]
+    band_width = SIMHASH_BITS // SIMHASH_BANDS
+    band_mask = (1 << band_width) - 1
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    for i, fingerprint in enumerate(fingerprints):
+        if fingerprint == 0:
+            continue
+        for band in range(SIMHASH_BANDS):
+            key = (band, fingerprint >> (band * band_width) & band_mask)
+            for j in buckets[key]:
+                if bin(fingerprint ^ fingerprints[j]).count("1") <= SIMHASH_MAX_DISTANCE:
+                    union(i, j)
+            buckets[key].append(i)
+    
+    clusters: Dict[int, List[Dict[str, Any]]] = {}
+    for i, tool in enumerate(tools):
+        clusters.setdefault(find(i), []).append(tool)
+    
+    return [_merge_cluster(cluster) for cluster in clusters.values()]
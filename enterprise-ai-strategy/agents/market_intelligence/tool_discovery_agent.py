@@ -1,17 +1,25 @@
 """
 Tool Discovery Agent - Scans the AI tool landscape for new developments
 """
-import requests
 import feedparser
 from bs4 import BeautifulSoup
-from typing import Dict, List, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
 
-from ..base_agent import BaseAgent, AgentResponse
+from ..base_agent import BaseAgent, AgentResponse, TaskClass
+from ..http_fetcher import FetchRequest, FetchResult, get_http_fetcher
+from .tool_catalog import get_tool_catalog
+from .tool_dedup import dedupe_tools
 
 logger = logging.getLogger(__name__)
 
+# Number of top tools each map batch hands to the reduce step
+BATCH_SHORTLIST_SIZE = 10
+
+# Catalog source names for the task-level source selectors
+CATALOG_SOURCES = {"github": "github", "hacker_news": "hacker_news", "aws": "aws_announcements"}
+
 class ToolDiscoveryAgent(BaseAgent):
     """Agent for discovering new AI tools across multiple sources"""
     
@@ -27,6 +35,12 @@ class ToolDiscoveryAgent(BaseAgent):
             "anthropic_blog": "https://www.anthropic.com/news",
             "openai_blog": "https://openai.com/blog"
         }
+        
+        # Pooled, cached fetcher shared with other agents in the process
+        self.fetcher = get_http_fetcher()
+        
+        # Persistent catalog of seen tools, source watermarks and prior analyses
+        self.catalog = get_tool_catalog()
     
     def get_system_prompt(self) -> str:
         return """You are an expert AI tool discovery agent for Nationwide Insurance's enterprise AI strategy team. 
@@ -50,116 +64,140 @@ Include confidence scores and enterprise readiness assessments."""
     
     def discover_github_tools(self, days_back: int = 7) -> List[Dict[str, Any]]:
         """Discover trending AI tools on GitHub"""
-        try:
-            # Search for AI-related repositories
-            search_queries = [
-                "ai developer tools",
-                "llm development",
-                "code generation",
-                "ai testing",
-                "ai devops",
-                "ai deployment"
-            ]
-            
-            tools = []
-            for query in search_queries:
-                since_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
-                
-                params = {
-                    "q": f"{query} created:>{since_date}",
-                    "sort": "stars",
-                    "order": "desc",
-                    "per_page": 10
-                }
-                
-                response = requests.get(self.sources["github_trending"], params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    for repo in data.get("items", []):
-                        tools.append({
-                            "name": repo["name"],
-                            "description": repo["description"],
-                            "url": repo["html_url"],
-                            "stars": repo["stargazers_count"],
-                            "language": repo["language"],
-                            "created_at": repo["created_at"],
-                            "source": "github",
-                            "query": query
-                        })
-            
-            return tools
-            
-        except Exception as e:
-            logger.error(f"Error discovering GitHub tools: {str(e)}")
-            return []
+        return self._discover([("github", query, request) for query, request in self._github_requests(days_back)])
     
     def discover_hacker_news_tools(self, days_back: int = 7) -> List[Dict[str, Any]]:
         """Discover AI tools mentioned on Hacker News"""
-        try:
-            # Search for AI tool discussions
-            search_queries = [
-                "ai tools developers",
-                "llm coding assistant", 
-                "ai devops",
-                "developer ai",
-                "code generation tools"
-            ]
-            
-            tools = []
-            since_timestamp = int((datetime.now() - timedelta(days=days_back)).timestamp())
-            
-            for query in search_queries:
-                params = {
-                    "query": query,
-                    "tags": "story",
-                    "numericFilters": f"created_at_i>{since_timestamp}",
-                    "hitsPerPage": 20
-                }
-                
-                response = requests.get(self.sources["hacker_news"], params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    for hit in data.get("hits", []):
-                        tools.append({
-                            "name": hit["title"],
-                            "description": hit.get("title", ""),
-                            "url": hit.get("url", ""),
-                            "points": hit.get("points", 0),
-                            "comments": hit.get("num_comments", 0),
-                            "created_at": hit.get("created_at", ""),
-                            "source": "hacker_news",
-                            "query": query
-                        })
-            
-            return tools
-            
-        except Exception as e:
-            logger.error(f"Error discovering Hacker News tools: {str(e)}")
-            return []
+        return self._discover([("hacker_news", query, request) for query, request in self._hacker_news_requests(days_back)])
     
     def discover_aws_announcements(self) -> List[Dict[str, Any]]:
         """Discover new AWS AI/ML announcements"""
-        try:
-            tools = []
-            feed = feedparser.parse(self.sources["aws_announcements"])
-            
-            for entry in feed.entries[:20]:  # Last 20 announcements
-                # Filter for AI/ML related announcements
-                title_lower = entry.title.lower()
-                if any(keyword in title_lower for keyword in ["ai", "ml", "bedrock", "sagemaker", "rekognition", "comprehend", "lex", "code"]):
-                    tools.append({
-                        "name": entry.title,
-                        "description": entry.summary,
-                        "url": entry.link,
-                        "published": entry.published,
-                        "source": "aws_announcements"
-                    })
-            
-            return tools
-            
-        except Exception as e:
-            logger.error(f"Error discovering AWS announcements: {str(e)}")
-            return []
+        return self._discover([("aws", None, FetchRequest(self.sources["aws_announcements"]))])
+    
+    def _github_requests(self, days_back: int, watermark: Optional[datetime] = None) -> List[Tuple[str, FetchRequest]]:
+        """GitHub repository searches for AI-related tools, limited to repos newer than the watermark"""
+        search_queries = [
+            "ai developer tools",
+            "llm development",
+            "code generation",
+            "ai testing",
+            "ai devops",
+            "ai deployment"
+        ]
+        created = f"created:>{(datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')}"
+        if watermark and watermark > datetime.now(timezone.utc) - timedelta(days=days_back):
+            # Search qualifiers are day-granular; the catalog skips unchanged repeats
+            created = f"created:>={watermark.strftime('%Y-%m-%d')}"
+        
+        return [
+            (query, FetchRequest(self.sources["github_trending"], params={
+                "q": f"{query} {created}",
+                "sort": "stars",
+                "order": "desc",
+                "per_page": 10
+            }))
+            for query in search_queries
+        ]
+    
+    def _hacker_news_requests(self, days_back: int, watermark: Optional[datetime] = None) -> List[Tuple[str, FetchRequest]]:
+        """Hacker News story searches for AI tool discussions newer than the watermark"""
+        search_queries = [
+            "ai tools developers",
+            "llm coding assistant", 
+            "ai devops",
+            "developer ai",
+            "code generation tools"
+        ]
+        # Day granularity keeps repeat runs on the same day cacheable
+        since_date = (datetime.now() - timedelta(days=days_back)).replace(hour=0, minute=0, second=0, microsecond=0)
+        since_timestamp = int(since_date.timestamp())
+        if watermark:
+            since_timestamp = max(since_timestamp, int(watermark.timestamp()))
+        
+        return [
+            (query, FetchRequest(self.sources["hacker_news"], params={
+                "query": query,
+                "tags": "story",
+                "numericFilters": f"created_at_i>{since_timestamp}",
+                "hitsPerPage": 20
+            }))
+            for query in search_queries
+        ]
+    
+    def _discover(self, plan: List[Tuple[str, Any, FetchRequest]], incomplete: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Fetch every planned request concurrently and parse results in plan order
+        
+        Sources with a failed request or a full page of results, which may have
+        cut items off, are added to incomplete when it is given.
+        """
+        results = self.fetcher.fetch_all([request for _, _, request in plan])
+        
+        tools = []
+        for (source, query, request), result in zip(plan, results):
+            if not result.ok:
+                logger.error(f"Error fetching {source} results for {query!r}: {result.error}")
+                if incomplete is not None:
+                    incomplete.add(source)
+                continue
+            try:
+                parsed = self._parse_result(source, query, result)
+            except Exception as e:
+                logger.error(f"Error parsing {source} results for {query!r}: {str(e)}")
+                if incomplete is not None:
+                    incomplete.add(source)
+                continue
+            page_size = request.params.get("per_page") or request.params.get("hitsPerPage")
+            if incomplete is not None and page_size and len(parsed) >= page_size:
+                incomplete.add(source)
+            tools.extend(parsed)
+        
+        return tools
+    
+    def _parse_result(self, source: str, query: Any, result: FetchResult) -> List[Dict[str, Any]]:
+        if source == "github":
+            return [
+                {
+                    "name": repo["name"],
+                    "description": repo["description"],
+                    "url": repo["html_url"],
+                    "stars": repo["stargazers_count"],
+                    "language": repo["language"],
+                    "created_at": repo["created_at"],
+                    "source": "github",
+                    "query": query
+                }
+                for repo in result.json().get("items", [])
+            ]
+        
+        if source == "hacker_news":
+            return [
+                {
+                    "name": hit["title"],
+                    "description": hit.get("title", ""),
+                    "url": hit.get("url", ""),
+                    "points": hit.get("points", 0),
+                    "comments": hit.get("num_comments", 0),
+                    "created_at": hit.get("created_at", ""),
+                    "source": "hacker_news",
+                    "query": query
+                }
+                for hit in result.json().get("hits", [])
+            ]
+        
+        tools = []
+        feed = feedparser.parse(result.body)
+        for entry in feed.entries[:20]:  # Last 20 announcements
+            # Filter for AI/ML related announcements
+            title_lower = entry.title.lower()
+            if any(keyword in title_lower for keyword in ["ai", "ml", "bedrock", "sagemaker", "rekognition", "comprehend", "lex", "code"]):
+                tools.append({
+                    "name": entry.title,
+                    "description": entry.summary,
+                    "url": entry.link,
+                    "published": entry.published,
+                    "source": "aws_announcements"
+                })
+        return tools
     
     def process_task(self, task: str, context: Dict[str, Any] = None) -> AgentResponse:
         """Process tool discovery task"""
@@ -168,29 +206,67 @@ Include confidence scores and enterprise readiness assessments."""
             days_back = context.get("days_back", 7) if context else 7
             sources = context.get("sources", ["github", "hacker_news", "aws"]) if context else ["github", "hacker_news", "aws"]
             
-            all_tools = []
+            full_refresh = context.get("full_refresh", False) if context else False
+            run_started = datetime.now(timezone.utc)
             
-            # Discover from selected sources
+            # Only fetch items newer than what the catalog has already recorded
+            watermarks = {}
+            if self.catalog and not full_refresh:
+                watermarks = {
+                    CATALOG_SOURCES[source]: self.catalog.get_watermark(CATALOG_SOURCES[source])
+                    for source in sources if source in CATALOG_SOURCES
+                }
+            
+            # Fan out every query across the selected sources in one concurrent batch
+            plan = []
             if "github" in sources:
-                github_tools = self.discover_github_tools(days_back)
-                all_tools.extend(github_tools)
+                plan.extend(("github", query, request) for query, request in self._github_requests(days_back, watermarks.get("github")))
             
             if "hacker_news" in sources:
-                hn_tools = self.discover_hacker_news_tools(days_back)
-                all_tools.extend(hn_tools)
+                plan.extend(("hacker_news", query, request) for query, request in self._hacker_news_requests(days_back, watermarks.get("hacker_news")))
             
             if "aws" in sources:
-                aws_tools = self.discover_aws_announcements()
-                all_tools.extend(aws_tools)
+                plan.append(("aws", None, FetchRequest(self.sources["aws_announcements"])))
             
-            # Use Claude Sonnet to analyze and categorize tools
-            tools_summary = self._analyze_discovered_tools(all_tools)
+            # Watermarks only narrow the queries; the catalog decides what is new or changed
+            incomplete: Set[str] = set()
+            fetched_tools = self._discover(plan, incomplete)
             
-            # Generate Hugo-compatible markdown
-            hugo_content = self._generate_hugo_content(tools_summary, all_tools)
+            # Collapse the same tool reported by several sources into one entry
+            fetched_tools = dedupe_tools(fetched_tools)
+            
+            if self.catalog is None:
+                # Use Claude Sonnet to analyze and categorize tools
+                tools_summary = self._analyze_discovered_tools(fetched_tools)
+                hugo_content = self._generate_hugo_content(tools_summary, fetched_tools)
+                new_tools, all_tools = fetched_tools, fetched_tools
+            else:
+                # Only new or materially changed tools go to the LLM; earlier analyses are reused
+                window_start = datetime.now(timezone.utc) - timedelta(days=days_back)
+                catalog_sources = [CATALOG_SOURCES[source] for source in sources if source in CATALOG_SOURCES]
+                new_tools = self.catalog.select_changed(fetched_tools)
+                if new_tools:
+                    tools_summary = self._analyze_discovered_tools(new_tools)
+                else:
+                    tools_summary = "No new or materially changed tools since the last discovery run."
+                # Only sources whose queries narrow by watermark and came back complete advance
+                complete_sources = [
+                    CATALOG_SOURCES[source] for source in ("github", "hacker_news")
+                    if source in sources and source not in incomplete
+                ]
+                analysis_id = self.catalog.record_run(
+                    fetched_tools, new_tools, tools_summary if new_tools else None, complete_sources, run_started
+                )
+                
+                all_tools = self.catalog.recent_tools(window_start, catalog_sources)
+                earlier_analyses = self.catalog.analyses_since(window_start, exclude_id=analysis_id)
+                hugo_content = self._generate_hugo_content(tools_summary, all_tools, earlier_analyses)
             
             metadata = {
                 "total_tools_found": len(all_tools),
+                "new_tools_fetched": len(fetched_tools),
+                "tools_analyzed": len(new_tools),
+                "incremental": bool(watermarks),
                 "sources_used": sources,
                 "discovery_date": datetime.now().isoformat(),
                 "days_back": days_back
@@ -213,16 +289,98 @@ Include confidence scores and enterprise readiness assessments."""
             )
     
     def _analyze_discovered_tools(self, tools: List[Dict[str, Any]]) -> str:
-        """Use Claude Sonnet to analyze discovered tools"""
+        """Use Claude Sonnet to analyze discovered tools
+        
+        Batches too large for one call are analyzed map-reduce style: tools are
+        packed into token-budgeted batches that are shortlisted concurrently,
+        then the shortlists are merged into the final report.
+        """
         if not tools:
             return "No tools discovered in this timeframe."
         
-        tools_text = "\n".join([
-            f"- {tool.get('name', 'Unknown')}: {tool.get('description', '')} (Source: {tool.get('source', '')}, Stars: {tool.get('stars', 'N/A')})"
-            for tool in tools[:50]  # Limit to avoid token limits
-        ])
+        system_prompt = self.get_system_prompt()
+        tool_lines = [self._format_tool_line(tool) for tool in tools]
+        budget = self.prompt_token_budget(system_prompt, self._analysis_prompt(""))
+        batches = self.chunk_by_tokens(tool_lines, budget)
+        
+        if len(batches) == 1:
+            return self._call_bedrock(self._analysis_prompt("\n".join(tool_lines)), system_prompt)
         
-        prompt = f"""Analyze these recently discovered AI tools for enterprise relevance at Nationwide Insurance:
+        logger.info(f"Analyzing {len(tools)} tools in {len(batches)} batches")
+        shortlists = self._call_bedrock_many(
+            [self._batch_prompt("\n".join(batch), index + 1, len(batches)) for index, batch in enumerate(batches)],
+            system_prompt,
+            task_class=TaskClass.EXTRACT
+        )
+        
+        # Merge shortlists, reducing in rounds while they do not fit one call
+        while True:
+            groups = self.chunk_by_tokens(shortlists, budget)
+            if len(groups) == 1 or len(groups) == len(shortlists):
+                break
+            shortlists = self._call_bedrock_many(
+                [self._batch_prompt("\n\n".join(group), index + 1, len(groups)) for index, group in enumerate(groups)],
+                system_prompt,
+                task_class=TaskClass.EXTRACT
+            )
+        
+        # Shortlists too long to pair up are trimmed to an equal share of the
+        # budget rather than overflowing the final call
+        final_budget = self.prompt_token_budget(
+            system_prompt, self._analysis_prompt("\n\n" * (len(shortlists) - 1), partial_rankings=len(shortlists))
+        )
+        if sum(self.estimate_tokens(shortlist) for shortlist in shortlists) > final_budget:
+            share = max(1, final_budget // len(shortlists))
+            shortlists = [self._trim_to_tokens(shortlist, share) for shortlist in shortlists]
+        
+        return self._call_bedrock(
+            self._analysis_prompt("\n\n".join(shortlists), partial_rankings=len(shortlists)), system_prompt
+        )
+    
+    def _trim_to_tokens(self, text: str, tokens: int) -> str:
+        """Leading whole lines of text within an estimated token count, keeping a ranking's top entries"""
+        kept = []
+        used = 0
+        for line in text.splitlines():
+            size = self.estimate_tokens(line + "\n")
+            if used + size > tokens:
+                break
+            kept.append(line)
+            used += size
+        if not kept:
+            # Not even one line fits; cut the first one short
+            return text[:max(0, tokens - 1) * 4]
+        return "\n".join(kept)
+    
+    def _format_tool_line(self, tool: Dict[str, Any]) -> str:
+        return (
+            f"- {tool.get('name', 'Unknown')}: {tool.get('description', '')} (Source: {', '.join(tool.get('sources', [tool.get('source', '')]))}, "
+            f"Stars: {tool.get('stars', 'N/A')}, Points: {tool.get('points', 'N/A')}, Mentions: {tool.get('mentions', 1)})"
+        )
+    
+    def _batch_prompt(self, tools_text: str, batch_number: int, batch_count: int) -> str:
+        """Map step: shortlist one batch of tools for the final merge"""
+        return f"""This is batch {batch_number} of {batch_count} of recently discovered AI tools being screened for enterprise relevance at Nationwide Insurance:
+
+{tools_text}
+
+Select the {BATCH_SHORTLIST_SIZE} most enterprise-relevant tools in this batch, ranked. For each give:
+- Name, source and stars/points
+- Category (coding assistant, testing, devops automation, data/ETL, etc.)
+- Integration potential with Java/Spring/K8s/Helm/Harness/Informatica/Talend
+- Security and compliance concerns
+- Evaluation priority (High/Medium/Low) with a one-line rationale
+
+Also list the category counts for the whole batch. Be concise; this is merged with other batches."""
+    
+    def _analysis_prompt(self, tools_text: str, partial_rankings: int = 0) -> str:
+        """Final analysis prompt over raw tools or, when reducing, batch shortlists"""
+        if partial_rankings:
+            intro = f"Merge these {partial_rankings} ranked shortlists of recently discovered AI tools into one enterprise relevance analysis for Nationwide Insurance. Re-rank across shortlists and sum the category counts:"
+        else:
+            intro = "Analyze these recently discovered AI tools for enterprise relevance at Nationwide Insurance:"
+        
+        return f"""{intro}
 
 {tools_text}
 
@@ -234,10 +392,9 @@ Provide analysis including:
 5. Recommended evaluation priority (High/Medium/Low)
 
 Format as structured markdown suitable for Hugo static site generation."""
-        
-        return self._call_bedrock(prompt, self.get_system_prompt())
     
-    def _generate_hugo_content(self, analysis: str, raw_tools: List[Dict[str, Any]]) -> str:
+    def _generate_hugo_content(self, analysis: str, raw_tools: List[Dict[str, Any]],
+                               earlier_analyses: Optional[List[Dict[str, Any]]] = None) -> str:
         """Generate Hugo-compatible markdown content"""
         
         hugo_frontmatter = f"""---
@@ -258,7 +415,7 @@ summary: "Latest AI tools discovered across GitHub, Hacker News, and AWS announc
 ## Executive Summary
 
 {analysis}
-
+{self._format_earlier_analyses(earlier_analyses or [])}
 ## Raw Tool Data
 
 | Tool | Source | Stars/Points | Language | Description |
@@ -266,13 +423,25 @@ summary: "Latest AI tools discovered across GitHub, Hacker News, and AWS announc
 """
         
         # Add raw tool data table
-        for tool in raw_tools[:30]:  # Limit to top 30
+        for tool in raw_tools:
             name = tool.get('name', 'Unknown')
-            source = tool.get('source', '')
+            source = ', '.join(tool.get('sources', [tool.get('source', '')]))
             stars = tool.get('stars', tool.get('points', 'N/A'))
             language = tool.get('language', 'N/A')
             description = tool.get('description', '')[:100] + "..." if len(tool.get('description', '')) > 100 else tool.get('description', '')
             
             hugo_frontmatter += f"| {name} | {source} | {stars} | {language} | {description} |\n"
         
-        return hugo_frontmatter
\ No newline at end of file
+        return hugo_frontmatter
+    
+    def _format_earlier_analyses(self, earlier_analyses: List[Dict[str, Any]]) -> str:
+        """Render analyses from earlier runs in the reporting window"""
+        if not earlier_analyses:
+            return ""
+        
+        sections = ["\n## Earlier Analyses\n"]
+        for earlier in earlier_analyses:
+            sections.append(
+                f"### {earlier['created_at'].strftime('%Y-%m-%d %H:%M UTC')} ({earlier['tool_count']} tools)\n\n{earlier['content']}\n"
+            )
+        return "\n".join(sections)
@@ -114,6 +114,19 @@ class IntegrationValidatorAgent(BaseAgent):
             }
         }
     
+    def get_static_context(self) -> str:
+        """Nationwide technology stack, shared by every validation prompt"""
+        tech_summary = []
+        for category, tools in self.tech_stack.items():
+            if isinstance(tools, dict):
+                entries = [f"{k}: {v}" if isinstance(v, str) else f"{k}: {', '.join(v)}" for k, v in tools.items()]
+                tech_summary.append(f"**{category.title()}**: {', '.join(entries)}")
+            else:
+                tech_summary.append(f"**{category.title()}**: {', '.join(tools)}")
+        
+        return f"""**Nationwide Enterprise Technology Stack:**
+{chr(10).join(tech_summary)}"""
+    
     def get_system_prompt(self) -> str:
         return """You are an expert integration validation specialist for Nationwide Insurance's enterprise AI tool evaluation.
 
@@ -257,14 +270,6 @@ Consider Nationwide's specific requirements:
     def _generate_comprehensive_validation(self, tool_name: str, tool_type: str, integration_scope: str, validation_type: str) -> str:
         """Generate comprehensive integration validation using Claude Sonnet"""
         
-        # Prepare technology stack information
-        tech_summary = []
-        for category, tools in self.tech_stack.items():
-            if isinstance(tools, dict):
-                tech_summary.append(f"**{category.title()}**: {', '.join([f'{k}: {v}' if isinstance(v, str) else f'{k}: {", ".join(v)}' for k, v in tools.items()])}")
-            else:
-                tech_summary.append(f"**{category.title()}**: {', '.join(tools)}")
-        
         prompt = f"""Conduct a comprehensive integration validation for: {tool_name}
 
 **Tool Information:**
@@ -273,8 +278,7 @@ Consider Nationwide's specific requirements:
 - **Integration Scope**: {integration_scope}
 - **Validation Type**: {validation_type}
 
-**Nationwide Enterprise Technology Stack:**
-{chr(10).join(tech_summary)}
+**Nationwide Enterprise Technology Stack:** as listed in your reference context
 
 **Integration Validation Requirements:**
 
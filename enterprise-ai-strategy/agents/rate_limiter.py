@@ -0,0 +1,201 @@
+"""
+Client-side rate limiting for AWS Bedrock calls
+Token buckets on requests/min and tokens/min per model or inference profile,
+with AIMD adaptive concurrency and jittered exponential backoff on throttles
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+import logging
+
+from config.aws_config import RateLimitConfig, get_rate_limit_config
+
+logger = logging.getLogger(__name__)
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException"
+}
+
+class RateLimitTimeout(Exception):
+    """Raised when capacity could not be acquired within the configured wait"""
+    pass
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check whether a botocore error means Bedrock is throttling us"""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+class TokenBucket:
+    """Continuously refilling token bucket"""
+    
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self._updated_at = time.monotonic()
+    
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self._updated_at = now
+    
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken (0 if available now)"""
+        self._refill(time.monotonic())
+        # Requests larger than the bucket only need a full bucket
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+    
+    def take(self, amount: float) -> None:
+        self._refill(time.monotonic())
+        self.available -= min(amount, self.capacity)
+    
+    def give_back(self, amount: float) -> None:
+        self.available = min(self.capacity, self.available + amount)
+
+class AdaptiveRateLimiter:
+    """Rate limiter and AIMD concurrency controller for one Bedrock target"""
+    
+    def __init__(self, target: str, config: RateLimitConfig):
+        self.target = target
+        self.config = config
+        self.request_bucket = TokenBucket(config.requests_per_minute, config.requests_per_minute / 60.0)
+        self.token_bucket = TokenBucket(config.tokens_per_minute, config.tokens_per_minute / 60.0)
+        self.concurrency_limit = float(config.initial_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.throttle_count = 0
+        self.request_count = 0
+        self._last_decrease_at = 0.0
+        self._condition = threading.Condition()
+    
+    @contextmanager
+    def slot(self, estimated_tokens: int) -> Iterator[None]:
+        """Hold a concurrency slot and rate budget for one request"""
+        self._acquire(estimated_tokens)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def try_acquire(self, estimated_tokens: int) -> bool:
+        """Take a slot and rate budget only if available right now; pair with release()"""
+        with self._condition:
+            if self.in_flight >= int(self.concurrency_limit):
+                return False
+            if max(self.request_bucket.wait_time(1), self.token_bucket.wait_time(estimated_tokens)) > 0:
+                return False
+            self.request_bucket.take(1)
+            self.token_bucket.take(estimated_tokens)
+            self.in_flight += 1
+            self.request_count += 1
+            return True
+    
+    def release(self) -> None:
+        """Return a slot taken with try_acquire()"""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+    
+    def _acquire(self, estimated_tokens: int) -> None:
+        deadline = time.monotonic() + self.config.max_wait_seconds
+        with self._condition:
+            self.waiting += 1
+            try:
+                while True:
+                    wait = 0.0
+                    if self.in_flight >= int(self.concurrency_limit):
+                        wait = None
+                    else:
+                        wait = max(self.request_bucket.wait_time(1), self.token_bucket.wait_time(estimated_tokens))
+                        if wait == 0.0:
+                            self.request_bucket.take(1)
+                            self.token_bucket.take(estimated_tokens)
+                            self.in_flight += 1
+                            self.request_count += 1
+                            return
+                    
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RateLimitTimeout(
+                            f"Timed out waiting for Bedrock capacity on {self.target}"
+                        )
+                    self._condition.wait(remaining if wait is None else min(wait, remaining))
+            finally:
+                self.waiting -= 1
+    
+    def record_success(self, estimated_tokens: int, actual_tokens: Optional[int] = None) -> None:
+        """Additive increase; refund over-estimated token budget"""
+        with self._condition:
+            self.concurrency_limit = min(
+                float(self.config.max_concurrency),
+                self.concurrency_limit + self.config.additive_increase / max(self.concurrency_limit, 1.0)
+            )
+            if actual_tokens is not None and actual_tokens < estimated_tokens:
+                self.token_bucket.give_back(estimated_tokens - actual_tokens)
+            self._condition.notify_all()
+    
+    def record_throttle(self) -> None:
+        """Multiplicative decrease after a throttling response
+        
+        Throttles arriving within one base backoff interval count as a single
+        congestion event, so a burst of in-flight failures halves the limit once.
+        """
+        with self._condition:
+            self.throttle_count += 1
+            now = time.monotonic()
+            if now - self._last_decrease_at < self.config.base_backoff_seconds:
+                return
+            self._last_decrease_at = now
+            self.concurrency_limit = max(
+                float(self.config.min_concurrency),
+                self.concurrency_limit * self.config.multiplicative_decrease
+            )
+            logger.warning(f"Bedrock throttled {self.target}; concurrency limit now {self.concurrency_limit:.1f}")
+    
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt"""
+        ceiling = min(self.config.max_backoff_seconds, self.config.base_backoff_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    def metrics(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "target": self.target,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "in_flight": self.in_flight,
+                "queue_depth": self.waiting,
+                "requests_per_minute_limit": self.config.requests_per_minute,
+                "tokens_per_minute_limit": self.config.tokens_per_minute,
+                "available_requests": round(self.request_bucket.available, 2),
+                "available_tokens": round(self.token_bucket.available),
+                "total_requests": self.request_count,
+                "total_throttles": self.throttle_count
+            }
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(target: str) -> AdaptiveRateLimiter:
+    """Get the process-wide limiter for a model ID or inference profile"""
+    with _limiters_lock:
+        limiter = _limiters.get(target)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(target, get_rate_limit_config(target))
+            _limiters[target] = limiter
+        return limiter
+
+def get_rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """Current limits and queue depth for every target seen by this process"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.target: limiter.metrics() for limiter in limiters}
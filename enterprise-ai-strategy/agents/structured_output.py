@@ -0,0 +1,134 @@
+"""
+Structured agent output
+Agents declare a Pydantic schema; the model answers through a forced tool call
+whose input is the JSON result, and markdown is rendered locally from it
+"""
+import re
+from typing import Dict, Any, List, Type, TypeVar
+
+import pydantic_core
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T", bound="StructuredOutput")
+
+class StructuredOutput(BaseModel):
+    """Base class for agent result schemas
+    
+    The class docstring becomes the tool description and field descriptions
+    become the JSON schema, so both should be written for the model.
+    """
+    
+    def to_markdown(self) -> str:
+        """Render the result as markdown; agents override for their own layout"""
+        return _render_value(self.model_dump(mode="json"), level=2)
+
+def _title(name: str) -> str:
+    return name.replace("_", " ").title()
+
+def _render_value(value: Any, level: int) -> str:
+    if isinstance(value, dict):
+        sections = []
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                sections.append(f"{'#' * level} {_title(key)}\n\n{_render_value(item, level + 1)}")
+            else:
+                sections.append(f"**{_title(key)}:** {item}")
+        return "\n\n".join(sections)
+    if isinstance(value, list):
+        return "\n".join(
+            f"- {_render_value(item, level + 1)}" if not isinstance(item, dict)
+            else _render_value(item, level)
+            for item in value
+        )
+    return str(value)
+
+def output_tool(schema: Type[StructuredOutput]) -> Dict[str, Any]:
+    """Tool definition that makes the model return a schema instance as its input"""
+    name = re.sub(r"(?<!^)(?=[A-Z])", "_", schema.__name__).lower()
+    return {
+        "name": f"record_{name}"[:64],
+        "description": (schema.__doc__ or f"Record the {name}").strip(),
+        "input_schema": schema.model_json_schema()
+    }
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing bracket, leaving string contents untouched"""
+    out = []
+    pending = None  # index in out of a comma that may turn out to be trailing
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif not char.isspace():
+            if pending is not None and char in "}]":
+                del out[pending]
+            pending = None
+            if char == '"':
+                in_string = True
+            elif char == ",":
+                pending = len(out)
+        out.append(char)
+    return "".join(out)
+
+def repair_json(text: str) -> Any:
+    """Parse model JSON, tolerating fences, surrounding prose, trailing commas and truncation"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+    start = text.find("{")
+    if start > 0:
+        text = text[start:]
+    
+    candidates = [text]
+    end = text.rfind("}")
+    if end != -1 and text[end + 1:].strip():
+        candidates.append(text[:end + 1])
+    
+    error = None
+    for candidate in candidates:
+        try:
+            # allow_partial closes strings, arrays and objects left open by a response cut off at max_tokens
+            return pydantic_core.from_json(_strip_trailing_commas(candidate), allow_partial="trailing-strings")
+        except ValueError as e:
+            error = e
+    raise error
+
+def parse_structured(text: str, schema: Type[T]) -> T:
+    """Validate model output against a schema, repairing malformed JSON locally first
+    
+    Raises ValidationError if the repaired output still does not match.
+    """
+    try:
+        return schema.model_validate_json(text)
+    except ValidationError as error:
+        try:
+            data = repair_json(text)
+        except ValueError:
+            raise error
+    return schema.model_validate(data)
+
+def format_validation_errors(error: ValidationError) -> List[str]:
+    """One line per schema violation, for repair prompts and logs"""
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or '<root>'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+def repair_prompt(schema: Type[StructuredOutput], invalid: str, error: ValidationError) -> str:
+    """Prompt asking the model to fix invalid output without regenerating the content"""
+    errors = "\n".join(f"- {line}" for line in format_validation_errors(error))
+    return f"""The following {schema.__name__} output does not match its schema.
+
+Schema errors:
+{errors}
+
+Invalid output:
+{invalid}
+
+Return the corrected result through the tool. Keep all existing content; change only what is needed to satisfy the schema."""
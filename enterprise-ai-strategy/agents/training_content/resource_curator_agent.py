@@ -3,6 +3,7 @@ Resource Curator Agent - Finds and organizes enterprise-appropriate learning mat
 """
 import requests
 import json
+import re
 from typing import Dict, List, Any
 from datetime import datetime
 import logging
@@ -247,7 +248,7 @@ Create resource collections that support comprehensive, professional AI developm
                 "resource_types": resource_types,
                 "skill_level": skill_level,
                 "persona": persona,
-                "total_resources": len(resource_collection.get("resources", [])),
+                "total_resources": len(re.findall(r"\]\(https?://", resource_collection)),
                 "curation_date": datetime.now().isoformat()
             }
             
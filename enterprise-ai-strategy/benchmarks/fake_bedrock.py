@@ -0,0 +1,242 @@
+"""
+Fake bedrock-runtime client for offline benchmarks
+Implements invoke_model and invoke_model_with_response_stream for the Anthropic
+messages format with configurable latency, token rates, throttling and prompt
+caching, so agents run end to end without calling AWS
+"""
+import hashlib
+import io
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional
+
+from botocore.exceptions import ClientError
+
+from agents.base_agent import _bedrock_clients, _bedrock_clients_lock
+
+WORDS = (
+    "enterprise adoption developer productivity integration security compliance "
+    "governance pilot rollout evaluation latency throughput platform workflow "
+    "kubernetes spring pipeline observability training assessment license cost"
+).split()
+
+@dataclass
+class FakeBedrockProfile:
+    """Latency, throughput and failure behaviour of the fake model endpoint
+    
+    Time to first byte is log-normal around ttfb_median_ms. Output streams at
+    output_tokens_per_second. Requests beyond requests_per_minute (a sliding
+    one-minute window) or drawn with throttle_probability fail with
+    ThrottlingException. time_scale multiplies every delay, so CI can run the
+    same workload shape in a fraction of the wall time.
+    """
+    ttfb_median_ms: float = 400.0
+    ttfb_sigma: float = 0.5
+    output_tokens_per_second: float = 150.0
+    output_tokens: int = 400
+    requests_per_minute: Optional[int] = None
+    throttle_probability: float = 0.0
+    cached_prefix_speedup: float = 0.85
+    time_scale: float = 1.0
+    seed: Optional[int] = None
+
+class FakeEventStream:
+    """Iterable of response-stream events that stops early once closed"""
+    
+    def __init__(self, events: Iterator[Dict[str, Any]]):
+        self._events = events
+        self.closed = False
+    
+    def __iter__(self):
+        for event in self._events:
+            if self.closed:
+                return
+            yield event
+    
+    def close(self) -> None:
+        self.closed = True
+
+class FakeBedrockRuntime:
+    """Thread-safe stand-in for a boto3 bedrock-runtime client"""
+    
+    def __init__(self, profile: FakeBedrockProfile):
+        self.profile = profile
+        self._random = random.Random(profile.seed)
+        self._lock = threading.Lock()
+        self._recent: deque = deque()
+        self._cached_prefixes: set = set()
+        self.stats = {
+            "requests": 0,
+            "throttled": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_tokens": 0,
+            "cache_write_tokens": 0,
+            "by_model": {}
+        }
+    
+    # boto3 client API
+    
+    def invoke_model(self, modelId: str, body: str, contentType: str = "application/json", **kwargs) -> Dict[str, Any]:
+        request = json.loads(body)
+        usage, ttfb = self._admit(modelId, request)
+        self._sleep(ttfb)
+        content = self._generate(request, usage)
+        self._sleep(usage["output_tokens"] / self.profile.output_tokens_per_second)
+        payload = {"type": "message", "role": "assistant", "model": modelId, "content": [content], "usage": usage}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8")), "contentType": "application/json"}
+    
+    def invoke_model_with_response_stream(self, modelId: str, body: str, contentType: str = "application/json",
+                                          **kwargs) -> Dict[str, Any]:
+        request = json.loads(body)
+        usage, ttfb = self._admit(modelId, request)
+        return {"body": FakeEventStream(self._stream(request, usage, ttfb)), "contentType": "application/json"}
+    
+    # Simulation
+    
+    def _admit(self, model_id: str, request: Dict[str, Any]) -> tuple:
+        """Apply throttling, account usage and draw the time to first byte"""
+        now = time.monotonic()
+        with self._lock:
+            self.stats["requests"] += 1
+            window = 60.0 * self.profile.time_scale
+            while self._recent and now - self._recent[0] > window:
+                self._recent.popleft()
+            limited = self.profile.requests_per_minute is not None and len(self._recent) >= self.profile.requests_per_minute
+            if limited or self._random.random() < self.profile.throttle_probability:
+                self.stats["throttled"] += 1
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "Too many requests, please wait before trying again."}},
+                    "InvokeModel"
+                )
+            self._recent.append(now)
+            
+            usage = self._usage(request)
+            model_stats = self.stats["by_model"].setdefault(model_id, {"requests": 0, "output_tokens": 0})
+            model_stats["requests"] += 1
+            model_stats["output_tokens"] += usage["output_tokens"]
+            for key, stat in (("input_tokens", "input_tokens"), ("output_tokens", "output_tokens"),
+                              ("cache_read_input_tokens", "cache_read_tokens"),
+                              ("cache_creation_input_tokens", "cache_write_tokens")):
+                self.stats[stat] += usage.get(key, 0)
+            
+            ttfb = self.profile.ttfb_median_ms / 1000 * math.exp(self._random.gauss(0, self.profile.ttfb_sigma))
+        
+        # Prefill of a cached prefix is mostly skipped
+        total_input = usage["input_tokens"] + usage.get("cache_read_input_tokens", 0) + usage.get("cache_creation_input_tokens", 0)
+        if usage.get("cache_read_input_tokens") and total_input:
+            ttfb *= 1 - self.profile.cached_prefix_speedup * usage["cache_read_input_tokens"] / total_input
+        return usage, ttfb
+    
+    def _usage(self, request: Dict[str, Any]) -> Dict[str, int]:
+        system = request.get("system", "")
+        messages = json.dumps(request.get("messages", []))
+        tools = json.dumps(request.get("tools", []))
+        usage = {"input_tokens": (len(messages) + len(tools)) // 4 + 1}
+        
+        if isinstance(system, list):
+            text = "".join(block.get("text", "") for block in system)
+            tokens = len(text) // 4 + 1
+            if any("cache_control" in block for block in system):
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if digest in self._cached_prefixes:
+                    usage["cache_read_input_tokens"] = tokens
+                else:
+                    self._cached_prefixes.add(digest)
+                    usage["cache_creation_input_tokens"] = tokens
+            else:
+                usage["input_tokens"] += tokens
+        elif system:
+            usage["input_tokens"] += len(system) // 4 + 1
+        
+        usage["output_tokens"] = max(1, min(request.get("max_tokens", 4000), self.profile.output_tokens))
+        return usage
+    
+    def _generate(self, request: Dict[str, Any], usage: Dict[str, int]) -> Dict[str, Any]:
+        """Content block for the response: forced tool input or filler text"""
+        tool_choice = request.get("tool_choice") or {}
+        if tool_choice.get("type") == "tool":
+            tool = next(tool for tool in request["tools"] if tool["name"] == tool_choice["name"])
+            schema = tool["input_schema"]
+            return {"type": "tool_use", "id": "toolu_fake", "name": tool["name"],
+                    "input": sample_from_schema(schema, schema.get("$defs", {}))}
+        
+        with self._lock:
+            words = [self._random.choice(WORDS) for _ in range(usage["output_tokens"])]
+        return {"type": "text", "text": " ".join(words)}
+    
+    def _stream(self, request: Dict[str, Any], usage: Dict[str, int], ttfb: float) -> Iterator[Dict[str, Any]]:
+        input_usage = {key: value for key, value in usage.items() if key != "output_tokens"}
+        yield _event({"type": "message_start", "message": {"usage": {**input_usage, "output_tokens": 1}}})
+        self._sleep(ttfb)
+        
+        content = self._generate(request, usage)
+        if content["type"] == "tool_use":
+            text, delta_type, field = json.dumps(content["input"]), "input_json_delta", "partial_json"
+        else:
+            text, delta_type, field = content["text"], "text_delta", "text"
+        
+        # Chunks of roughly ten tokens, paced at the configured output rate
+        chunk_chars = 40
+        chunk_seconds = 10 / self.profile.output_tokens_per_second
+        for start in range(0, len(text), chunk_chars):
+            self._sleep(chunk_seconds)
+            yield _event({"type": "content_block_delta", "index": 0,
+                          "delta": {"type": delta_type, field: text[start:start + chunk_chars]}})
+        
+        yield _event({"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": usage["output_tokens"]}})
+        yield _event({"type": "message_stop"})
+    
+    def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds * self.profile.time_scale)
+
+def _event(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    return {"chunk": {"bytes": json.dumps(chunk).encode("utf-8")}}
+
+def sample_from_schema(schema: Dict[str, Any], defs: Dict[str, Any]) -> Any:
+    """Smallest valid instance of a JSON schema produced by Pydantic"""
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    if "anyOf" in schema:
+        return sample_from_schema(schema["anyOf"][0], defs)
+    if "default" in schema:
+        return schema["default"]
+    
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        return {
+            name: sample_from_schema(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+            if name in schema.get("required", [])
+        }
+    if schema_type == "array":
+        return [sample_from_schema(schema.get("items", {}), defs) for _ in range(max(1, schema.get("minItems", 1)))]
+    if schema_type == "integer":
+        return int(schema.get("minimum", schema.get("exclusiveMinimum", -1) + 1))
+    if schema_type == "number":
+        return float(schema.get("minimum", 0))
+    if schema_type == "boolean":
+        return True
+    if schema_type == "null":
+        return None
+    return " ".join(WORDS[:max(3, schema.get("minLength", 0))])
+
+def install_fake_bedrock(fake: FakeBedrockRuntime, regions: List[str]) -> None:
+    """Make get_bedrock_client() return the fake for these regions
+    
+    Must run before agents are constructed, since they resolve their client
+    in __init__.
+    """
+    with _bedrock_clients_lock:
+        for region in regions:
+            _bedrock_clients[region] = fake
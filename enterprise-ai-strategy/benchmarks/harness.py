@@ -0,0 +1,139 @@
+"""
+Measurement helpers for the offline benchmarks
+Latency percentiles, event-loop blocking detection and the sample task
+inputs each agent is driven with
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+# Task and context per agent registry name, valid for each agent's process_task
+AGENT_WORKLOADS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "tool_discovery": ("Discover new AI developer tools", {"days_back": 7, "full_refresh": True}),
+    "deep_evaluation": ("Evaluate Cursor for enterprise use", {
+        "tool_name": "Cursor", "tool_description": "AI-first code editor", "tool_url": "https://github.com/example/cursor"
+    }),
+    "risk_assessment": ("Assess enterprise risk of Cursor", {
+        "tool_name": "Cursor", "tool_url": "https://github.com/example/cursor"
+    }),
+    "competitive_intelligence": ("Analyze the competitive landscape for Cursor", {
+        "tool_name": "Cursor", "tool_description": "AI-first code editor", "competitors": ["GitHub Copilot", "Codeium"]
+    }),
+    "curriculum_architect": ("Design an AI-assisted development curriculum", {
+        "persona": "java_spring", "skill_level": "intermediate", "tool_focus": "GitHub Copilot"
+    }),
+    "technical_writer": ("Write a getting-started guide", {
+        "content_type": "tutorial", "topic": "AI pair programming", "tool_name": "GitHub Copilot",
+        "persona": "java_spring", "skill_level": "intermediate"
+    }),
+    "assessment_creator": ("Create a skills assessment", {
+        "assessment_type": "competency_test", "persona": "java_spring", "skill_level": "intermediate",
+        "tool_focus": "GitHub Copilot", "learning_objectives": ["Prompting for code", "Reviewing generated code"]
+    }),
+    "resource_curator": ("Curate learning resources", {
+        "topic": "AI pair programming", "resource_types": ["documentation", "tutorials"],
+        "persona": "java_spring", "skill_level": "intermediate", "max_resources": 10
+    }),
+    "license_optimizer": ("Optimize AI tool licensing", {
+        "optimization_type": "comprehensive", "timeframe": "short_term", "budget_target": 0.2,
+        "tools_data": {"GitHub Copilot": {"total_licenses": 1000, "active_users": 640, "cost_per_user": 19}}
+    }),
+    "integration_validator": ("Validate Cursor integration", {
+        "tool_name": "Cursor", "tool_type": "ide_extension", "integration_scope": "development",
+        "validation_type": "comprehensive"
+    }),
+    "community_pulse": ("Analyze developer community sentiment", {
+        "analysis_type": "comprehensive", "time_period": "30_days", "focus_areas": ["adoption", "satisfaction"]
+    }),
+    "executive_briefing": ("Brief leadership on AI tool adoption", {
+        "briefing_type": "quarterly", "topic": "AI developer tool adoption", "audience": "executive",
+        "urgency": "normal", "supporting_data": {"adoption_rate": 0.64}
+    })
+}
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (0-100) of values, or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+@dataclass
+class LatencyRecorder:
+    """Latencies and failures for one benchmarked operation"""
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+    
+    def record(self, seconds: float, ok: bool = True) -> None:
+        self.latencies.append(seconds)
+        if not ok:
+            self.errors += 1
+    
+    def finish(self) -> None:
+        self.finished = time.perf_counter()
+    
+    def summary(self) -> Dict[str, Any]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        ms = [value * 1000 for value in self.latencies]
+        return {
+            "name": self.name,
+            "count": len(ms),
+            "errors": self.errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "per_second": round(len(ms) / elapsed, 3) if elapsed > 0 else None,
+            "p50_ms": _round(percentile(ms, 50)),
+            "p95_ms": _round(percentile(ms, 95)),
+            "p99_ms": _round(percentile(ms, 99)),
+            "max_ms": _round(max(ms) if ms else None)
+        }
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+class LoopBlockMonitor:
+    """Measures how long the running event loop is kept from scheduling callbacks
+    
+    A probe sleeps for interval seconds in a loop; any lateness beyond
+    threshold counts as blocking, i.e. synchronous work done on the loop.
+    """
+    
+    def __init__(self, interval: float = 0.01, threshold: float = 0.02):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.stalls = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _probe(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.max_lag_seconds = max(self.max_lag_seconds, lag)
+            if lag > self.threshold:
+                self.blocked_seconds += lag
+                self.stalls += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "blocked_ms": round(self.blocked_seconds * 1000, 1),
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 1),
+            "stalls": self.stalls
+        }
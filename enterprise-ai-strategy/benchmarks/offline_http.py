@@ -0,0 +1,100 @@
+"""
+Offline HTTP responses for benchmarks
+A requests transport adapter that answers GitHub and Hacker News API calls
+with synthetic payloads after a configurable delay, mounted on the shared
+HTTP fetcher so discovery and enrichment run without network access
+"""
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from agents.http_fetcher import get_http_fetcher
+
+class OfflineHTTPAdapter(BaseAdapter):
+    """Synthetic responses for the external APIs agents call"""
+    
+    def __init__(self, latency_ms: float = 80.0, time_scale: float = 1.0, seed: Optional[int] = None):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.time_scale = time_scale
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+    
+    def send(self, request, **kwargs) -> Response:
+        with self._lock:
+            self.requests += 1
+            delay = self._random.expovariate(1000 / self.latency_ms) if self.latency_ms > 0 else 0
+            salt = self._random.randrange(1 << 30)
+        time.sleep(delay * self.time_scale)
+        
+        parts = urlsplit(request.url)
+        payload = self._payload(parts.netloc, parts.path, salt)
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(payload).encode("utf-8")
+        return response
+    
+    def close(self) -> None:
+        pass
+    
+    def _payload(self, host: str, path: str, salt: int) -> Any:
+        now = datetime.now(timezone.utc)
+        if host == "api.github.com" and path.startswith("/search/repositories"):
+            return {"items": [_repo(f"tool-{salt % 997}-{i}", now - timedelta(hours=i)) for i in range(10)]}
+        if host == "api.github.com" and path.endswith("/releases"):
+            return [{"tag_name": "v1.2.0", "published_at": now.isoformat()}]
+        if host == "api.github.com" and path.endswith("/contributors"):
+            return [{"login": f"dev{i}", "contributions": 100 - i} for i in range(8)]
+        if host == "api.github.com" and path.startswith("/repos/"):
+            return _repo(path.rstrip("/").split("/")[-1], now - timedelta(days=30))
+        if host == "hn.algolia.com":
+            return {"hits": [
+                {
+                    "title": f"Show HN: AI tool {salt % 991}-{i} for developers",
+                    "url": f"https://example.com/tools/{salt % 991}-{i}",
+                    "points": 50 + i,
+                    "num_comments": 10 + i,
+                    "created_at": (now - timedelta(hours=i)).isoformat()
+                }
+                for i in range(20)
+            ]}
+        return {}
+
+def _repo(name: str, created_at: datetime) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "full_name": f"example/{name}",
+        "html_url": f"https://github.com/example/{name}",
+        "description": f"{name}: AI developer tooling for code generation and testing",
+        "stargazers_count": 1200,
+        "forks_count": 80,
+        "watchers_count": 1200,
+        "open_issues_count": 12,
+        "language": "Python",
+        "size": 2048,
+        "created_at": created_at.isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "homepage": "",
+        "license": {"name": "MIT License"},
+        "topics": ["ai", "developer-tools"],
+        "has_issues": True,
+        "has_wiki": False,
+        "has_pages": False
+    }
+
+def install_offline_http(adapter: OfflineHTTPAdapter) -> None:
+    """Route every request made through the shared HTTP fetcher to the adapter"""
+    session = get_http_fetcher().session
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
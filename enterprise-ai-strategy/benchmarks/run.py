@@ -0,0 +1,414 @@
+"""
+Offline benchmark suite for the agents, orchestrator and job API
+Runs against a fake bedrock-runtime and synthetic external APIs, so it needs
+no AWS credentials or network access and spends no Bedrock tokens.
+
+Usage, from the enterprise-ai-strategy directory:
+    python -m benchmarks.run --scenario agents --iterations 3 --concurrency 4 --time-scale 0.05
+    python -m benchmarks.run --scenario prompt_cache --time-scale 0.05
+    DATABASE_URL=postgresql://localhost/enterprise_ai_bench python -m benchmarks.run --scenario api
+
+Reports operations/sec, p50/p95/p99 latency and event-loop blocking per
+scenario. Exits non-zero when a --max-* threshold is exceeded, for CI.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, Any, List
+
+SCENARIOS = ("agents", "orchestrator", "prompt_cache", "api")
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline throughput and latency benchmarks")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="agents")
+    parser.add_argument("--agents", default="", help="Comma-separated agent names (default: all twelve)")
+    parser.add_argument("--iterations", type=int, default=3, help="Runs per agent, teams, or jobs per agent")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent operations in flight")
+    
+    fake = parser.add_argument_group("fake Bedrock")
+    fake.add_argument("--ttfb-ms", type=float, default=400.0, help="Median time to first byte")
+    fake.add_argument("--ttfb-sigma", type=float, default=0.5, help="Log-normal shape of time to first byte")
+    fake.add_argument("--tokens-per-second", type=float, default=150.0, help="Output token rate")
+    fake.add_argument("--output-tokens", type=int, default=400, help="Output tokens per response (capped by max_tokens)")
+    fake.add_argument("--throttle-rpm", type=int, default=None, help="Throttle requests beyond this rate")
+    fake.add_argument("--throttle-probability", type=float, default=0.0, help="Random throttling rate")
+    fake.add_argument("--http-latency-ms", type=float, default=80.0, help="Mean latency of synthetic external APIs")
+    fake.add_argument("--time-scale", type=float, default=1.0, help="Multiplier for every simulated delay")
+    fake.add_argument("--seed", type=int, default=None)
+    
+    env = parser.add_argument_group("environment")
+    env.add_argument("--client-rpm", type=int, default=6000, help="Client-side Bedrock requests/minute limit")
+    env.add_argument("--response-cache", action="store_true", help="Keep the Bedrock response cache enabled")
+    env.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Postgres URL for the api scenario")
+    env.add_argument("--job-workers", type=int, default=4, help="Job workers for the api scenario")
+    
+    gates = parser.add_argument_group("CI thresholds")
+    gates.add_argument("--max-p95-ms", type=float, default=None)
+    gates.add_argument("--max-blocked-ms", type=float, default=None, help="Event-loop blocking budget per scenario")
+    gates.add_argument("--max-error-rate", type=float, default=0.0)
+    
+    parser.add_argument("--output", default=None, help="Write the JSON report to this path")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+def configure_environment(args: argparse.Namespace, workdir: str) -> None:
+    """Point caches at a scratch directory and relax client limits before agents load config"""
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ["ENABLE_AGENT_CACHING"] = "true" if args.response_cache else "false"
+    os.environ["AGENT_CACHE_PATH"] = os.path.join(workdir, "agent_cache.db")
+    os.environ["HTTP_CACHE_PATH"] = os.path.join(workdir, "http_cache.db")
+    os.environ["TOOL_CATALOG_PATH"] = os.path.join(workdir, "tool_catalog.db")
+    os.environ["BEDROCK_REQUESTS_PER_MINUTE"] = str(args.client_rpm)
+    os.environ["BEDROCK_TOKENS_PER_MINUTE"] = str(args.client_rpm * 20000)
+    os.environ["BEDROCK_MAX_CONCURRENCY"] = str(max(16, args.concurrency * 4))
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+def install_fakes(args: argparse.Namespace):
+    from .fake_bedrock import FakeBedrockProfile, FakeBedrockRuntime, install_fake_bedrock
+    from .offline_http import OfflineHTTPAdapter, install_offline_http
+    
+    fake = FakeBedrockRuntime(FakeBedrockProfile(
+        ttfb_median_ms=args.ttfb_ms,
+        ttfb_sigma=args.ttfb_sigma,
+        output_tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        requests_per_minute=args.throttle_rpm,
+        throttle_probability=args.throttle_probability,
+        time_scale=args.time_scale,
+        seed=args.seed
+    ))
+    install_fake_bedrock(fake, [os.environ["AWS_REGION"], "us-west-2", "us-east-2", "eu-west-1"])
+    http = OfflineHTTPAdapter(latency_ms=args.http_latency_ms, time_scale=args.time_scale, seed=args.seed)
+    install_offline_http(http)
+    return fake, http
+
+def selected_agents(args: argparse.Namespace) -> List[str]:
+    from .harness import AGENT_WORKLOADS
+    
+    if not args.agents:
+        return list(AGENT_WORKLOADS)
+    names = [name.strip() for name in args.agents.split(",") if name.strip()]
+    unknown = [name for name in names if name not in AGENT_WORKLOADS]
+    if unknown:
+        raise SystemExit(f"Unknown agents: {', '.join(unknown)}")
+    return names
+
+def agent_classes() -> Dict[str, Any]:
+    from agents.market_intelligence.tool_discovery_agent import ToolDiscoveryAgent
+    from agents.market_intelligence.deep_evaluation_agent import DeepEvaluationAgent
+    from agents.market_intelligence.risk_assessment_agent import RiskAssessmentAgent
+    from agents.market_intelligence.competitive_intelligence_agent import CompetitiveIntelligenceAgent
+    from agents.training_content.curriculum_architect_agent import CurriculumArchitectAgent
+    from agents.training_content.technical_writer_agent import TechnicalWriterAgent
+    from agents.training_content.assessment_creator_agent import AssessmentCreatorAgent
+    from agents.training_content.resource_curator_agent import ResourceCuratorAgent
+    from agents.operational.license_optimizer_agent import LicenseOptimizerAgent
+    from agents.operational.integration_validator_agent import IntegrationValidatorAgent
+    from agents.operational.community_pulse_agent import CommunityPulseAgent
+    from agents.operational.executive_briefing_agent import ExecutiveBriefingAgent
+    
+    return {
+        "tool_discovery": ToolDiscoveryAgent,
+        "deep_evaluation": DeepEvaluationAgent,
+        "risk_assessment": RiskAssessmentAgent,
+        "competitive_intelligence": CompetitiveIntelligenceAgent,
+        "curriculum_architect": CurriculumArchitectAgent,
+        "technical_writer": TechnicalWriterAgent,
+        "assessment_creator": AssessmentCreatorAgent,
+        "resource_curator": ResourceCuratorAgent,
+        "license_optimizer": LicenseOptimizerAgent,
+        "integration_validator": IntegrationValidatorAgent,
+        "community_pulse": CommunityPulseAgent,
+        "executive_briefing": ExecutiveBriefingAgent
+    }
+
+async def run_agents(args: argparse.Namespace) -> Dict[str, Any]:
+    """Each agent's process_task (including Hugo rendering) through aprocess_task"""
+    from .harness import AGENT_WORKLOADS, LatencyRecorder, LoopBlockMonitor
+    
+    names = selected_agents(args)
+    classes = agent_classes()
+    agents = {name: classes[name]() for name in names}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    recorders = {name: LatencyRecorder(name) for name in names}
+    total = LatencyRecorder("all_agents")
+    
+    async def one(name: str) -> None:
+        task, context = AGENT_WORKLOADS[name]
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await agents[name].aprocess_task(task, dict(context))
+                ok = response.status == "success"
+                if not ok:
+                    logging.getLogger(__name__).warning(f"{name} returned {response.status}: {response.content[:200]}")
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"{name} raised {type(e).__name__}: {str(e)}")
+                ok = False
+            elapsed = time.perf_counter() - started
+        recorders[name].record(elapsed, ok)
+        total.record(elapsed, ok)
+    
+    monitor = LoopBlockMonitor()
+    monitor.start()
+    await asyncio.gather(*(one(name) for name in names for _ in range(args.iterations)))
+    await monitor.stop()
+    
+    for recorder in [*recorders.values(), total]:
+        recorder.finish()
+    return {
+        "summary": total.summary(),
+        "event_loop": monitor.summary(),
+        "per_agent": [recorder.summary() for recorder in recorders.values()]
+    }
+
+async def run_orchestrator(args: argparse.Namespace) -> Dict[str, Any]:
+    """EnterpriseAgentOrchestrator.execute_agent_team over all selected agents, fanned out"""
+    from agents.base_agent import EnterpriseAgentOrchestrator
+    from .harness import AGENT_WORKLOADS, LatencyRecorder, LoopBlockMonitor
+    
+    names = selected_agents(args)
+    classes = agent_classes()
+    orchestrator = EnterpriseAgentOrchestrator()
+    agent_names = []
+    context: Dict[str, Any] = {}
+    for name in names:
+        agent = classes[name]()
+        orchestrator.register_agent(agent)
+        agent_names.append(agent.agent_name)
+        context.update(AGENT_WORKLOADS[name][1])
+    
+    semaphore = asyncio.Semaphore(args.concurrency)
+    teams = LatencyRecorder("agent_team")
+    
+    async def one_team() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                responses = await asyncio.to_thread(
+                    orchestrator.execute_agent_team, agent_names, "Benchmark team run", dict(context), {}
+                )
+                ok = all(response.status in ("success", "partial") for response in responses)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Team run raised {type(e).__name__}: {str(e)}")
+                ok = False
+            teams.record(time.perf_counter() - started, ok)
+    
+    monitor = LoopBlockMonitor()
+    monitor.start()
+    await asyncio.gather(*(one_team() for _ in range(args.iterations)))
+    await monitor.stop()
+    teams.finish()
+    return {"summary": teams.summary(), "event_loop": monitor.summary()}
+
+async def run_prompt_cache(args: argparse.Namespace) -> Dict[str, Any]:
+    """Request bodies and cache accounting with Bedrock prompt caching off and on
+    
+    For each agent, checks that the system prompt is a plain string while
+    caching is disabled and a content block with cache_control once enabled,
+    then runs the task through the fake runtime: without caching no cache
+    tokens may be reported, and with caching a repeated task must read its
+    prefix from the cache. Minimum prefix sizes are lowered to one token so
+    every agent's prefix qualifies. A failed check counts as an error.
+    """
+    from config.aws_config import PromptCachingConfig
+    from .harness import AGENT_WORKLOADS, LatencyRecorder, LoopBlockMonitor
+    
+    names = selected_agents(args)
+    classes = agent_classes()
+    checks = LatencyRecorder("prompt_cache_checks")
+    log = logging.getLogger(__name__)
+    
+    async def check(name: str) -> None:
+        agent = classes[name]()
+        task, context = AGENT_WORKLOADS[name]
+        system_prompt = agent._with_static_context(agent.get_system_prompt())
+        min_tokens = {agent.target_model: 1, agent.routing_config.fast_model: 1}
+        started = time.perf_counter()
+        problems = []
+        
+        agent.prompt_caching = PromptCachingConfig(enabled=False, min_tokens=min_tokens)
+        if not isinstance(agent._build_request_body("probe", system_prompt)["system"], str):
+            problems.append("system prompt sent as content blocks with caching disabled")
+        usage = (await agent.aprocess_task(task, dict(context))).metadata["usage"]
+        if usage["cache_read_tokens"] or usage["cache_write_tokens"]:
+            problems.append("cache tokens reported with caching disabled")
+        
+        agent.prompt_caching = PromptCachingConfig(enabled=True, min_tokens=min_tokens)
+        system = agent._build_request_body("probe", system_prompt)["system"]
+        if not (isinstance(system, list) and system[-1].get("cache_control") == {"type": "ephemeral"}
+                and system[-1]["text"] == system_prompt):
+            problems.append("system prompt not sent as a cache_control block with caching enabled")
+        await agent.aprocess_task(task, dict(context))
+        usage = (await agent.aprocess_task(task, dict(context))).metadata["usage"]
+        if not usage["cache_read_tokens"]:
+            problems.append("repeated task read no tokens from the prompt cache")
+        
+        for problem in problems:
+            log.warning(f"{name}: {problem}")
+        checks.record(time.perf_counter() - started, not problems)
+    
+    monitor = LoopBlockMonitor()
+    monitor.start()
+    await asyncio.gather(*(check(name) for name in names))
+    await monitor.stop()
+    checks.finish()
+    return {"summary": checks.summary(), "event_loop": monitor.summary()}
+
+async def run_api(args: argparse.Namespace) -> Dict[str, Any]:
+    """Job submission, queueing, execution and polling through the FastAPI app in-process
+    
+    Requires Postgres (the job queue uses SKIP LOCKED and advisory locks);
+    use a dedicated database, since benchmark jobs and a benchmark user are
+    left behind for inspection.
+    """
+    if not args.database_url:
+        raise SystemExit("The api scenario needs --database-url or DATABASE_URL pointing at a Postgres database")
+    
+    import httpx
+    from .harness import AGENT_WORKLOADS, LatencyRecorder, LoopBlockMonitor
+    
+    os.environ["RUN_JOB_WORKERS"] = "false"
+    os.environ["JOB_WORKERS"] = str(args.job_workers)
+    os.environ["JOB_POLL_INTERVAL_SECONDS"] = "0.2"
+    api_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "operational-layer", "api")
+    sys.path.insert(0, api_dir)
+    import main as api
+    
+    db = api.SessionLocal()
+    try:
+        user = api.User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", name="Benchmark", role="admin")
+        db.add(user)
+        db.commit()
+        token = api.create_jwt_token({"id": user.id, "email": user.email, "role": user.role})
+    finally:
+        db.close()
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    names = selected_agents(args)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    submit = LatencyRecorder("job_submit")
+    end_to_end = LatencyRecorder("job_end_to_end")
+    polls = LatencyRecorder("job_status_poll")
+    
+    async def one_job(client: httpx.AsyncClient, name: str) -> None:
+        task, context = AGENT_WORKLOADS[name]
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(f"/agents/{name}/execute", headers=headers, json={
+                "agent_name": name,
+                "task": task,
+                "parameters": context,
+                "requires_approval": False,
+                "allow_coalescing": False
+            })
+            submit.record(time.perf_counter() - started, response.status_code == 200)
+            if response.status_code != 200:
+                end_to_end.record(time.perf_counter() - started, ok=False)
+                return
+            
+            job_id = response.json()["job_id"]
+            status = "queued"
+            while status not in ("completed", "failed", "cancelled"):
+                await asyncio.sleep(0.1)
+                poll_started = time.perf_counter()
+                poll = await client.get(f"/jobs/{job_id}", headers=headers)
+                polls.record(time.perf_counter() - poll_started, poll.status_code == 200)
+                status = poll.json().get("status") if poll.status_code == 200 else "failed"
+            end_to_end.record(time.perf_counter() - started, status == "completed")
+    
+    monitor = LoopBlockMonitor()
+    monitor.start()
+    api.job_workers.start()
+    try:
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            await asyncio.gather(*(one_job(client, name) for name in names for _ in range(args.iterations)))
+    finally:
+        await api.job_workers.stop()
+        await monitor.stop()
+    
+    for recorder in (submit, end_to_end, polls):
+        recorder.finish()
+    return {
+        "summary": end_to_end.summary(),
+        "event_loop": monitor.summary(),
+        "submit": submit.summary(),
+        "status_poll": polls.summary()
+    }
+
+RUNNERS = {"agents": run_agents, "orchestrator": run_orchestrator, "prompt_cache": run_prompt_cache, "api": run_api}
+
+def check_thresholds(args: argparse.Namespace, results: Dict[str, Dict[str, Any]]) -> List[str]:
+    failures = []
+    for scenario, result in results.items():
+        summary = result["summary"]
+        if summary["count"] and summary["errors"] / summary["count"] > args.max_error_rate:
+            failures.append(f"{scenario}: error rate {summary['errors']}/{summary['count']} above {args.max_error_rate}")
+        if args.max_p95_ms is not None and (summary["p95_ms"] or 0) > args.max_p95_ms:
+            failures.append(f"{scenario}: p95 {summary['p95_ms']}ms above {args.max_p95_ms}ms")
+        if args.max_blocked_ms is not None and result["event_loop"]["blocked_ms"] > args.max_blocked_ms:
+            failures.append(f"{scenario}: event loop blocked {result['event_loop']['blocked_ms']}ms above {args.max_blocked_ms}ms")
+    return failures
+
+def print_report(results: Dict[str, Dict[str, Any]], fake_stats: Dict[str, Any]) -> None:
+    row = "{:<28} {:>6} {:>6} {:>9} {:>10} {:>10} {:>10}"
+    print(row.format("operation", "count", "errors", "ops/sec", "p50 ms", "p95 ms", "p99 ms"))
+    for scenario, result in results.items():
+        summaries = [result["summary"]] + result.get("per_agent", [])
+        summaries += [result[key] for key in ("submit", "status_poll") if key in result]
+        for summary in summaries:
+            print(row.format(
+                f"{scenario}:{summary['name']}"[:28], summary["count"], summary["errors"], summary["per_second"] or "-",
+                summary["p50_ms"] or "-", summary["p95_ms"] or "-", summary["p99_ms"] or "-"
+            ))
+        loop = result["event_loop"]
+        print(f"  event loop: blocked {loop['blocked_ms']}ms over {loop['stalls']} stalls, max lag {loop['max_lag_ms']}ms")
+    print(f"fake bedrock: {fake_stats['requests']} requests, {fake_stats['throttled']} throttled, "
+          f"{fake_stats['input_tokens']} input / {fake_stats['output_tokens']} output tokens, "
+          f"{fake_stats['cache_read_tokens']} cache read tokens")
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    
+    with tempfile.TemporaryDirectory(prefix="eais-bench-") as workdir:
+        configure_environment(args, workdir)
+        fake, http = install_fakes(args)
+        
+        scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+        if args.scenario == "all" and not args.database_url:
+            scenarios = tuple(name for name in scenarios if name != "api")
+        
+        results = {scenario: asyncio.run(RUNNERS[scenario](args)) for scenario in scenarios}
+    
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "database_url"},
+        "results": results,
+        "fake_bedrock": fake.stats,
+        "offline_http_requests": http.requests
+    }
+    print_report(results, fake.stats)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    
+    failures = check_thresholds(args, results)
+    for failure in failures:
+        print(f"THRESHOLD EXCEEDED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
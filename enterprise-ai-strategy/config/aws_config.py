@@ -1,6 +1,7 @@
 """
 AWS Configuration for Enterprise AI Strategy Command Center
 """
+import json
 import os
 from typing import Dict, List, Optional
 from dataclasses import dataclass
@@ -12,6 +13,23 @@ class BedrockModels(Enum):
     CLAUDE_3_SONNET = "anthropic.claude-3-sonnet-20240229-v1:0"
     CLAUDE_3_HAIKU = "anthropic.claude-3-haiku-20240307-v1:0"
 
+# Context window sizes in tokens, keyed by base model ID
+MODEL_CONTEXT_WINDOWS = {
+    BedrockModels.CLAUDE_3_5_SONNET.value: 200000,
+    BedrockModels.CLAUDE_3_SONNET.value: 200000,
+    BedrockModels.CLAUDE_3_HAIKU.value: 200000
+}
+
+DEFAULT_CONTEXT_WINDOW_TOKENS = 200000
+
+# Minimum cacheable prompt prefix in tokens, keyed by base model ID, for models
+# that support Bedrock prompt caching
+PROMPT_CACHE_MIN_TOKENS = {
+    BedrockModels.CLAUDE_3_5_SONNET.value: 1024,
+    "anthropic.claude-3-7-sonnet-20250219-v1:0": 1024,
+    "anthropic.claude-3-5-haiku-20241022-v1:0": 2048
+}
+
 @dataclass
 class AWSConfig:
     """AWS Configuration settings"""
@@ -22,6 +40,14 @@ class AWSConfig:
     temperature: float = 0.3
     inference_profile_id: Optional[str] = None
     inference_profile_arn: Optional[str] = None
+    max_pool_connections: int = 50
+    tcp_keepalive: bool = True
+    retry_mode: str = "standard"
+    # botocore's own retries; throttling is retried by the adaptive limiter instead,
+    # which only learns from throttles botocore does not absorb first
+    max_attempts: int = 1
+    connect_timeout: int = 10
+    read_timeout: int = 300
 
 @dataclass
 class AgentConfig:
@@ -31,10 +57,123 @@ class AgentConfig:
     operational_agents: List[str]
     max_concurrent_agents: int = 3
     timeout_seconds: int = 300
+    executor_workers: int = 32
+    map_chunk_tokens: int = 12000
+
+@dataclass
+class ResponseCacheConfig:
+    """Configuration for the Bedrock response cache"""
+    enabled: bool = True
+    path: str = os.path.join(os.path.expanduser("~"), ".cache", "enterprise-ai-strategy", "bedrock_responses.sqlite3")
+    ttl_seconds: int = 7 * 24 * 3600
+    max_entries: int = 10000
+    max_size_mb: int = 512
+
+@dataclass
+class RateLimitConfig:
+    """Client-side Bedrock rate limits for one model or inference profile"""
+    requests_per_minute: int = 50
+    tokens_per_minute: int = 200000
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+    additive_increase: float = 1.0
+    multiplicative_decrease: float = 0.5
+    max_retries: int = 6
+    base_backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 60.0
+    max_wait_seconds: float = 600.0
+
+@dataclass
+class HTTPFetchConfig:
+    """Configuration for agents fetching external sources over HTTP"""
+    max_workers: int = 16
+    pool_maxsize: int = 16
+    per_host_concurrency: int = 4
+    host_concurrency: Optional[Dict[str, int]] = None
+    timeout_seconds: float = 20.0
+    max_retries: int = 2
+    cache_enabled: bool = True
+    cache_path: str = os.path.join(os.path.expanduser("~"), ".cache", "enterprise-ai-strategy", "http_responses.sqlite3")
+    cache_max_entries: int = 5000
+    user_agent: str = "enterprise-ai-strategy-agents/1.0"
+
+@dataclass
+class ToolCatalogConfig:
+    """Configuration for the persistent tool discovery catalog"""
+    path: str = os.path.join(os.path.expanduser("~"), ".cache", "enterprise-ai-strategy", "tool_catalog.sqlite3")
+    min_star_delta: int = 25
+    star_change_ratio: float = 0.2
+    watermark_overlap_hours: int = 6
+
+@dataclass
+class ModelRoutingConfig:
+    """Routing of Bedrock calls to model tiers by task class
+    
+    overrides maps an agent name (or "*" for all agents) to task classes and
+    the ordered list of model IDs / inference profiles to try for them.
+    """
+    enabled: bool = True
+    fast_model: str = BedrockModels.CLAUDE_3_HAIKU.value
+    fast_model_max_prompt_tokens: int = 16000
+    classify_max_tokens: int = 256
+    extract_max_tokens: int = 2000
+    overrides: Optional[Dict[str, Dict[str, List[str]]]] = None
+
+@dataclass
+class HedgingConfig:
+    """Hedged Bedrock requests across equivalent targets
+    
+    targets maps a primary model ID or inference profile to equivalent
+    targets, each "<model-or-profile>" or "<model-or-profile>@<region>".
+    """
+    enabled: bool = False
+    targets: Optional[Dict[str, List[str]]] = None
+    delay_percentile: float = 0.95
+    default_delay_seconds: float = 3.0
+    min_delay_seconds: float = 0.5
+    min_samples: int = 20
+    sample_window: int = 200
+    max_hedge_rate: float = 0.1
+    max_hedge_burst: int = 3
+
+@dataclass
+class PromptCachingConfig:
+    """Bedrock prompt caching of the static system prompt prefix
+    
+    min_tokens maps model IDs or inference profiles to their minimum
+    cacheable prefix, extending PROMPT_CACHE_MIN_TOKENS.
+    """
+    enabled: bool = False
+    min_tokens: Optional[Dict[str, int]] = None
+
+@dataclass
+class GitHubConfig:
+    """Configuration for GitHub repository enrichment"""
+    token: Optional[str] = None
+    api_url: str = "https://api.github.com"
+    cache_ttl_seconds: int = 3600
+    cache_max_entries: int = 2000
 
 # Default configurations
 DEFAULT_AWS_CONFIG = AWSConfig()
 
+DEFAULT_RESPONSE_CACHE_CONFIG = ResponseCacheConfig()
+
+DEFAULT_RATE_LIMIT_CONFIG = RateLimitConfig()
+
+DEFAULT_HTTP_FETCH_CONFIG = HTTPFetchConfig()
+
+DEFAULT_TOOL_CATALOG_CONFIG = ToolCatalogConfig()
+
+DEFAULT_GITHUB_CONFIG = GitHubConfig()
+
+DEFAULT_MODEL_ROUTING_CONFIG = ModelRoutingConfig()
+
+DEFAULT_HEDGING_CONFIG = HedgingConfig()
+
+DEFAULT_PROMPT_CACHING_CONFIG = PromptCachingConfig()
+
 DEFAULT_AGENT_CONFIG = AgentConfig(
     market_intelligence_agents=[
         "tool_discovery_agent",
@@ -66,5 +205,148 @@ def get_aws_config() -> AWSConfig:
         max_tokens=int(os.getenv("MAX_TOKENS", DEFAULT_AWS_CONFIG.max_tokens)),
         temperature=float(os.getenv("TEMPERATURE", DEFAULT_AWS_CONFIG.temperature)),
         inference_profile_id=os.getenv("BEDROCK_INFERENCE_PROFILE_ID"),
-        inference_profile_arn=os.getenv("BEDROCK_INFERENCE_PROFILE_ARN")
-    )
\ No newline at end of file
+        inference_profile_arn=os.getenv("BEDROCK_INFERENCE_PROFILE_ARN"),
+        max_pool_connections=int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", DEFAULT_AWS_CONFIG.max_pool_connections)),
+        tcp_keepalive=os.getenv("BEDROCK_TCP_KEEPALIVE", "true").lower() == "true",
+        retry_mode=os.getenv("BEDROCK_RETRY_MODE", DEFAULT_AWS_CONFIG.retry_mode),
+        max_attempts=int(os.getenv("BEDROCK_MAX_ATTEMPTS", DEFAULT_AWS_CONFIG.max_attempts)),
+        connect_timeout=int(os.getenv("BEDROCK_CONNECT_TIMEOUT", DEFAULT_AWS_CONFIG.connect_timeout)),
+        read_timeout=int(os.getenv("BEDROCK_READ_TIMEOUT", DEFAULT_AWS_CONFIG.read_timeout))
+    )
+
+def get_agent_config() -> AgentConfig:
+    """Get agent execution configuration from environment variables"""
+    return AgentConfig(
+        market_intelligence_agents=DEFAULT_AGENT_CONFIG.market_intelligence_agents,
+        training_content_agents=DEFAULT_AGENT_CONFIG.training_content_agents,
+        operational_agents=DEFAULT_AGENT_CONFIG.operational_agents,
+        max_concurrent_agents=int(os.getenv("MAX_CONCURRENT_AGENTS", DEFAULT_AGENT_CONFIG.max_concurrent_agents)),
+        timeout_seconds=int(os.getenv("AGENT_TIMEOUT_SECONDS", DEFAULT_AGENT_CONFIG.timeout_seconds)),
+        executor_workers=int(os.getenv("AGENT_EXECUTOR_WORKERS", DEFAULT_AGENT_CONFIG.executor_workers)),
+        map_chunk_tokens=int(os.getenv("AGENT_MAP_CHUNK_TOKENS", DEFAULT_AGENT_CONFIG.map_chunk_tokens))
+    )
+
+def get_model_context_window(model_id: str) -> int:
+    """Context window for a model ID or an inference profile wrapping one"""
+    for base_model, window in MODEL_CONTEXT_WINDOWS.items():
+        if base_model in model_id:
+            return window
+    return DEFAULT_CONTEXT_WINDOW_TOKENS
+
+def get_prompt_caching_config() -> PromptCachingConfig:
+    """Get Bedrock prompt caching configuration from environment variables
+    
+    BEDROCK_PROMPT_CACHE_MIN_TOKENS may hold a JSON object such as
+    {"arn:aws:bedrock:us-east-1:123456789012:application-inference-profile/abc": 1024}
+    """
+    return PromptCachingConfig(
+        enabled=os.getenv("BEDROCK_PROMPT_CACHING_ENABLED", "false").lower() == "true",
+        min_tokens=json.loads(os.getenv("BEDROCK_PROMPT_CACHE_MIN_TOKENS", "{}"))
+    )
+
+def get_prompt_cache_min_tokens(model_id: str, config: PromptCachingConfig) -> Optional[int]:
+    """Minimum cacheable prefix for a model, or None if it does not support prompt caching"""
+    if config.min_tokens and model_id in config.min_tokens:
+        return config.min_tokens[model_id]
+    for base_model, min_tokens in PROMPT_CACHE_MIN_TOKENS.items():
+        if base_model in model_id:
+            return min_tokens
+    return None
+
+def get_response_cache_config() -> ResponseCacheConfig:
+    """Get Bedrock response cache configuration from environment variables"""
+    return ResponseCacheConfig(
+        enabled=os.getenv("ENABLE_AGENT_CACHING", "true").lower() == "true",
+        path=os.getenv("AGENT_CACHE_PATH", DEFAULT_RESPONSE_CACHE_CONFIG.path),
+        ttl_seconds=int(os.getenv("AGENT_CACHE_TTL_SECONDS", DEFAULT_RESPONSE_CACHE_CONFIG.ttl_seconds)),
+        max_entries=int(os.getenv("AGENT_CACHE_MAX_ENTRIES", DEFAULT_RESPONSE_CACHE_CONFIG.max_entries)),
+        max_size_mb=int(os.getenv("AGENT_CACHE_MAX_SIZE_MB", DEFAULT_RESPONSE_CACHE_CONFIG.max_size_mb))
+    )
+
+def get_http_fetch_config() -> HTTPFetchConfig:
+    """Get external HTTP fetch configuration from environment variables
+    
+    HTTP_FETCH_HOST_CONCURRENCY may hold a JSON object of per-host limits,
+    e.g. {"api.github.com": 2}
+    """
+    return HTTPFetchConfig(
+        max_workers=int(os.getenv("HTTP_FETCH_MAX_WORKERS", DEFAULT_HTTP_FETCH_CONFIG.max_workers)),
+        pool_maxsize=int(os.getenv("HTTP_FETCH_POOL_MAXSIZE", DEFAULT_HTTP_FETCH_CONFIG.pool_maxsize)),
+        per_host_concurrency=int(os.getenv("HTTP_FETCH_PER_HOST_CONCURRENCY", DEFAULT_HTTP_FETCH_CONFIG.per_host_concurrency)),
+        host_concurrency=json.loads(os.getenv("HTTP_FETCH_HOST_CONCURRENCY", "{}")),
+        timeout_seconds=float(os.getenv("HTTP_FETCH_TIMEOUT_SECONDS", DEFAULT_HTTP_FETCH_CONFIG.timeout_seconds)),
+        max_retries=int(os.getenv("HTTP_FETCH_MAX_RETRIES", DEFAULT_HTTP_FETCH_CONFIG.max_retries)),
+        cache_enabled=os.getenv("ENABLE_HTTP_CACHE", "true").lower() == "true",
+        cache_path=os.getenv("HTTP_CACHE_PATH", DEFAULT_HTTP_FETCH_CONFIG.cache_path),
+        cache_max_entries=int(os.getenv("HTTP_CACHE_MAX_ENTRIES", DEFAULT_HTTP_FETCH_CONFIG.cache_max_entries))
+    )
+
+def get_tool_catalog_config() -> ToolCatalogConfig:
+    """Get tool catalog configuration from environment variables"""
+    return ToolCatalogConfig(
+        path=os.getenv("TOOL_CATALOG_PATH", DEFAULT_TOOL_CATALOG_CONFIG.path),
+        min_star_delta=int(os.getenv("TOOL_CATALOG_MIN_STAR_DELTA", DEFAULT_TOOL_CATALOG_CONFIG.min_star_delta)),
+        star_change_ratio=float(os.getenv("TOOL_CATALOG_STAR_CHANGE_RATIO", DEFAULT_TOOL_CATALOG_CONFIG.star_change_ratio)),
+        watermark_overlap_hours=int(os.getenv("TOOL_CATALOG_WATERMARK_OVERLAP_HOURS", DEFAULT_TOOL_CATALOG_CONFIG.watermark_overlap_hours))
+    )
+
+def get_github_config() -> GitHubConfig:
+    """Get GitHub enrichment configuration from environment variables"""
+    return GitHubConfig(
+        token=os.getenv("GITHUB_TOKEN") or None,
+        api_url=os.getenv("GITHUB_API_URL", DEFAULT_GITHUB_CONFIG.api_url),
+        cache_ttl_seconds=int(os.getenv("GITHUB_CACHE_TTL_SECONDS", DEFAULT_GITHUB_CONFIG.cache_ttl_seconds)),
+        cache_max_entries=int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", DEFAULT_GITHUB_CONFIG.cache_max_entries))
+    )
+
+def get_model_routing_config() -> ModelRoutingConfig:
+    """Get model routing configuration from environment variables
+    
+    MODEL_ROUTING_OVERRIDES may hold a JSON object such as
+    {"*": {"extract": ["us.anthropic.claude-3-haiku-20240307-v1:0"]}, "deep_evaluation_agent": {"classify": [...]}}
+    """
+    return ModelRoutingConfig(
+        enabled=os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true",
+        fast_model=os.getenv("BEDROCK_FAST_MODEL", DEFAULT_MODEL_ROUTING_CONFIG.fast_model),
+        fast_model_max_prompt_tokens=int(os.getenv("BEDROCK_FAST_MODEL_MAX_PROMPT_TOKENS", DEFAULT_MODEL_ROUTING_CONFIG.fast_model_max_prompt_tokens)),
+        classify_max_tokens=int(os.getenv("BEDROCK_CLASSIFY_MAX_TOKENS", DEFAULT_MODEL_ROUTING_CONFIG.classify_max_tokens)),
+        extract_max_tokens=int(os.getenv("BEDROCK_EXTRACT_MAX_TOKENS", DEFAULT_MODEL_ROUTING_CONFIG.extract_max_tokens)),
+        overrides=json.loads(os.getenv("MODEL_ROUTING_OVERRIDES", "{}"))
+    )
+
+def get_hedging_config() -> HedgingConfig:
+    """Get Bedrock request hedging configuration from environment variables
+    
+    BEDROCK_HEDGE_TARGETS holds a JSON object such as
+    {"us.anthropic.claude-3-5-sonnet-20241022-v2:0": ["anthropic.claude-3-5-sonnet-20241022-v2:0@us-west-2"]}
+    """
+    return HedgingConfig(
+        enabled=os.getenv("BEDROCK_HEDGING_ENABLED", "false").lower() == "true",
+        targets=json.loads(os.getenv("BEDROCK_HEDGE_TARGETS", "{}")),
+        delay_percentile=float(os.getenv("BEDROCK_HEDGE_DELAY_PERCENTILE", DEFAULT_HEDGING_CONFIG.delay_percentile)),
+        default_delay_seconds=float(os.getenv("BEDROCK_HEDGE_DEFAULT_DELAY_SECONDS", DEFAULT_HEDGING_CONFIG.default_delay_seconds)),
+        min_delay_seconds=float(os.getenv("BEDROCK_HEDGE_MIN_DELAY_SECONDS", DEFAULT_HEDGING_CONFIG.min_delay_seconds)),
+        max_hedge_rate=float(os.getenv("BEDROCK_HEDGE_MAX_RATE", DEFAULT_HEDGING_CONFIG.max_hedge_rate)),
+        max_hedge_burst=int(os.getenv("BEDROCK_HEDGE_MAX_BURST", DEFAULT_HEDGING_CONFIG.max_hedge_burst))
+    )
+
+def get_rate_limit_config(target: str) -> RateLimitConfig:
+    """Get Bedrock rate limits for a model ID or inference profile
+    
+    BEDROCK_RATE_LIMIT_OVERRIDES may hold a JSON object mapping targets to
+    RateLimitConfig fields, e.g. {"anthropic.claude-3-haiku-20240307-v1:0": {"requests_per_minute": 200}}
+    """
+    config = RateLimitConfig(
+        requests_per_minute=int(os.getenv("BEDROCK_REQUESTS_PER_MINUTE", DEFAULT_RATE_LIMIT_CONFIG.requests_per_minute)),
+        tokens_per_minute=int(os.getenv("BEDROCK_TOKENS_PER_MINUTE", DEFAULT_RATE_LIMIT_CONFIG.tokens_per_minute)),
+        initial_concurrency=int(os.getenv("BEDROCK_INITIAL_CONCURRENCY", DEFAULT_RATE_LIMIT_CONFIG.initial_concurrency)),
+        max_concurrency=int(os.getenv("BEDROCK_MAX_CONCURRENCY", DEFAULT_RATE_LIMIT_CONFIG.max_concurrency)),
+        max_retries=int(os.getenv("BEDROCK_THROTTLE_MAX_RETRIES", DEFAULT_RATE_LIMIT_CONFIG.max_retries))
+    )
+    
+    overrides = json.loads(os.getenv("BEDROCK_RATE_LIMIT_OVERRIDES", "{}")).get(target, {})
+    for field_name, value in overrides.items():
+        if hasattr(config, field_name):
+            setattr(config, field_name, value)
+    
+    return config
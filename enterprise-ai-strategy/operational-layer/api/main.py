@@ -3,13 +3,24 @@ Enterprise AI Strategy Command Center - Backend API Service
 FastAPI backend for managing AI agents, workflows, and operations
 """
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+import asyncio
+import base64
+import binascii
+import codecs
+import hashlib
+import socket
+import threading
+import time
 import uuid
 import logging
 import json
@@ -17,17 +28,22 @@ import os
 from enum import Enum
 
 # Database and auth imports
-from sqlalchemy import create_engine, Column, String, DateTime, Text, Integer, Boolean
+from sqlalchemy import create_engine, event, make_url, Column, String, DateTime, Text, Integer, BigInteger, Boolean, Float, func, literal, or_, select, tuple_, update, LargeBinary
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import object_session, sessionmaker, Session
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
 import jwt
 import httpx
+import zstandard as zstd
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
 
 # Agent imports
 import sys
 sys.path.append('/mnt/c/devl/workspaces/developerplan/enterprise-ai-strategy')
-from agents.base_agent import BaseAgent
+from agents.base_agent import AgentRegistry, BaseAgent, add_bedrock_call_observer
+from agents.hedging import get_hedge_metrics
+from agents.rate_limiter import get_rate_limiter_metrics
 from agents.market_intelligence.tool_discovery_agent import ToolDiscoveryAgent
 from agents.market_intelligence.deep_evaluation_agent import DeepEvaluationAgent
 from agents.market_intelligence.risk_assessment_agent import RiskAssessmentAgent
@@ -54,8 +70,35 @@ logger = logging.getLogger(__name__)
 
 # Database setup
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/enterprise_ai_strategy")
-engine = create_engine(DATABASE_URL)
+# Request handlers and job workers use asyncpg; defaults to DATABASE_URL with the asyncpg driver
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", make_url(DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+# Prepared statements cached per connection; set to 0 behind PgBouncer in transaction mode
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+# Synchronous engine for schema creation and scripts
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_size=2, max_overflow=2)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=True,
+    connect_args={
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE
+    }
+)
+# Loaded attributes stay usable after commit; async sessions cannot lazy-load them again
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 # Security
@@ -63,6 +106,40 @@ security = HTTPBearer()
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-this")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+# Authenticated users are served from memory for this long; changes made
+# through this process are seen immediately, other replicas within the TTL
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+# Job queue workers
+RUN_JOB_WORKERS = os.getenv("RUN_JOB_WORKERS", "true").lower() == "true"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+JOB_STALE_AFTER_SECONDS = int(os.getenv("JOB_STALE_AFTER_SECONDS", "300"))
+# Claims after which a job whose worker keeps dying is failed instead of requeued
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Per-agent running-job caps across all replicas, e.g. "deep_evaluation=2,executive_briefing=1"
+JOB_AGENT_CONCURRENCY = {
+    name.strip(): int(limit)
+    for name, limit in (
+        item.split("=") for item in os.getenv("JOB_AGENT_CONCURRENCY", "").split(",") if "=" in item
+    )
+}
+WORKER_ID = os.getenv("WORKER_ID", f"{socket.gethostname()}-{os.getpid()}")
+# Identical jobs submitted within this many seconds of a completed run reuse its result
+JOB_COALESCE_WINDOW_SECONDS = int(os.getenv("JOB_COALESCE_WINDOW_SECONDS", "900"))
+# Dashboard statistics are served from memory for this long between refreshes
+DASHBOARD_STATS_TTL_SECONDS = float(os.getenv("DASHBOARD_STATS_TTL_SECONDS", "10"))
+
+# Listing endpoints
+MAX_PAGE_SIZE = 500
+APPROVAL_PREVIEW_CHARS = 500
+ERROR_PREVIEW_CHARS = 500
+
+# Content store for agent outputs
+CONTENT_STORE_ZSTD_LEVEL = int(os.getenv("CONTENT_STORE_ZSTD_LEVEL", "9"))
+CONTENT_STREAM_CHUNK_BYTES = 64 * 1024
 
 # FastAPI app
 app = FastAPI(
@@ -82,6 +159,90 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus metrics
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+JOB_QUEUE_DEPTH = Gauge("job_queue_depth", "Jobs waiting in or executing from the queue", ["status"])
+JOB_TRANSITIONS = Counter("job_state_transitions_total", "Job state transitions", ["agent", "status"])
+JOBS_COALESCED = Counter("jobs_coalesced_total", "Jobs attached to an identical execution", ["agent", "state"])
+AGENT_EXECUTION_DURATION = Histogram(
+    "agent_execution_duration_seconds", "Agent task execution time", ["agent", "outcome"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800)
+)
+BEDROCK_CALL_LATENCY = Histogram(
+    "bedrock_call_duration_seconds", "Bedrock invocation latency", ["agent", "model"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+)
+BEDROCK_TTFB = Histogram(
+    "bedrock_time_to_first_byte_seconds", "Bedrock time to first byte", ["agent", "model"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+BEDROCK_TOKENS = Counter("bedrock_tokens_total", "Bedrock tokens processed", ["agent", "model", "direction"])
+BEDROCK_CACHE_HITS = Counter("bedrock_response_cache_hits_total", "Bedrock calls served from cache", ["agent"])
+BEDROCK_ERRORS = Counter("bedrock_call_errors_total", "Failed Bedrock calls", ["agent", "model", "error_code"])
+BEDROCK_HEDGES = Counter("bedrock_hedged_requests_total", "Bedrock calls duplicated to an equivalent target", ["model", "winner"])
+BEDROCK_CONCURRENCY_LIMIT = Gauge("bedrock_concurrency_limit", "Adaptive Bedrock concurrency limit", ["model"])
+BEDROCK_LIMITER_QUEUE_DEPTH = Gauge("bedrock_limiter_queue_depth", "Calls waiting for Bedrock capacity", ["model"])
+PRINCIPAL_CACHE_LOOKUPS = Counter("principal_cache_lookups_total", "Authenticated user lookups", ["result"])
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Database statement execution time", ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+@event.listens_for(engine, "before_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded with the statement even if it raises
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+@event.listens_for(engine, "after_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    operation = statement.lstrip().split(" ", 1)[0].upper()
+    DB_QUERY_DURATION.labels(operation=operation).observe(elapsed)
+
+def _observe_bedrock_call(agent_name: str, record: Dict[str, Any]) -> None:
+    """Export Bedrock call records from the agents as Prometheus series"""
+    model = record.get("model", "")
+    if "error_code" in record:
+        BEDROCK_ERRORS.labels(agent=agent_name, model=model, error_code=record["error_code"]).inc()
+    elif record.get("cached"):
+        BEDROCK_CACHE_HITS.labels(agent=agent_name).inc()
+    else:
+        BEDROCK_CALL_LATENCY.labels(agent=agent_name, model=model).observe(record.get("latency_ms", 0) / 1000)
+        BEDROCK_TTFB.labels(agent=agent_name, model=model).observe(record.get("ttfb_ms", 0) / 1000)
+        BEDROCK_TOKENS.labels(agent=agent_name, model=model, direction="input").inc(record.get("input_tokens", 0))
+        BEDROCK_TOKENS.labels(agent=agent_name, model=model, direction="output").inc(record.get("output_tokens", 0))
+        BEDROCK_TOKENS.labels(agent=agent_name, model=model, direction="cache_read").inc(record.get("cache_read_tokens", 0))
+        BEDROCK_TOKENS.labels(agent=agent_name, model=model, direction="cache_write").inc(record.get("cache_write_tokens", 0))
+        if "hedge" in record:
+            BEDROCK_HEDGES.labels(model=model, winner="hedge" if record["hedge"]["won"] else "primary").inc()
+
+add_bedrock_call_observer(_observe_bedrock_call)
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=str(status)
+        ).observe(time.perf_counter() - started)
+
 # Database Models
 class JobStatus(str, Enum):
     PENDING = "pending"
@@ -90,6 +251,12 @@ class JobStatus(str, Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+class JobPriority(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
 class ApprovalStatus(str, Enum):
     PENDING = "pending"
     APPROVED = "approved"
@@ -102,16 +269,26 @@ class JobExecution(Base):
     job_type = Column(String(50), nullable=False)
     agent_name = Column(String(100), nullable=False)
     status = Column(String(20), default=JobStatus.PENDING)
+    priority = Column(String(20), default=JobPriority.MEDIUM)
+    priority_rank = Column(Integer, default=2)  # Queue order of priority, 0 = critical
     created_at = Column(DateTime, default=datetime.utcnow)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     created_by = Column(String(100), nullable=False)
+    task_description = Column(Text, nullable=False)
     parameters = Column(Text, nullable=True)
     result = Column(Text, nullable=True)
+    result_hash = Column(String(64), nullable=True)
+    content_hash = Column(String(64), nullable=True)
     error_message = Column(Text, nullable=True)
     approval_status = Column(String(20), default=ApprovalStatus.PENDING)
     approved_by = Column(String(100), nullable=True)
     approved_at = Column(DateTime, nullable=True)
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0)
+    fingerprint = Column(String(64), nullable=True)
+    coalesced_from = Column(UUID(as_uuid=True), nullable=True)
 
 class ContentApproval(Base):
     __tablename__ = "content_approvals"
@@ -120,7 +297,9 @@ class ContentApproval(Base):
     job_id = Column(UUID(as_uuid=True), nullable=False)
     content_type = Column(String(50), nullable=False)
     title = Column(String(200), nullable=False)
-    content = Column(Text, nullable=False)
+    content = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    content_preview = Column(Text, nullable=True)
     status = Column(String(20), default=ApprovalStatus.PENDING)
     created_at = Column(DateTime, default=datetime.utcnow)
     created_by = Column(String(100), nullable=False)
@@ -128,6 +307,43 @@ class ContentApproval(Base):
     approved_at = Column(DateTime, nullable=True)
     rejection_reason = Column(Text, nullable=True)
 
+class ContentBlob(Base):
+    """Compressed agent output addressed by the SHA-256 of its text"""
+    __tablename__ = "content_blobs"
+    
+    hash = Column(String(64), primary_key=True)
+    encoding = Column(String(16), nullable=False, default="zstd")
+    size_bytes = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    referenced_at = Column(DateTime, default=datetime.utcnow)
+
+class JobMetric(Base):
+    __tablename__ = "job_metrics"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(UUID(as_uuid=True), nullable=False)
+    agent_name = Column(String(100), nullable=False)
+    model = Column(String(255), nullable=False)
+    cached = Column(Boolean, default=False)
+    input_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    cache_read_tokens = Column(Integer, default=0)
+    cache_write_tokens = Column(Integer, default=0)
+    latency_ms = Column(Float, nullable=True)
+    ttfb_ms = Column(Float, nullable=True)
+    throttle_retries = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class DashboardCounter(Base):
+    """Status count delta for a table, written by triggers in init.sql"""
+    __tablename__ = "dashboard_counters"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    scope = Column(String(50), nullable=False)
+    key = Column(String(20), nullable=False)
+    delta = Column(BigInteger, nullable=False)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -147,8 +363,9 @@ class AgentExecutionRequest(BaseModel):
     agent_name: str = Field(..., description="Name of the agent to execute")
     task: str = Field(..., description="Task description for the agent")
     parameters: Optional[Dict[str, Any]] = Field(default={}, description="Agent parameters")
-    priority: Optional[str] = Field(default="medium", description="Job priority")
+    priority: Optional[JobPriority] = Field(default=JobPriority.MEDIUM, description="Job priority")
     requires_approval: Optional[bool] = Field(default=True, description="Whether job requires approval")
+    allow_coalescing: Optional[bool] = Field(default=True, description="Share the result of an identical in-flight or recent job")
 
 class JobStatusResponse(BaseModel):
     job_id: str
@@ -161,6 +378,20 @@ class JobStatusResponse(BaseModel):
     approval_status: str
     approved_by: Optional[str] = None
 
+class JobSummaryResponse(BaseModel):
+    job_id: str
+    agent_name: str
+    status: str
+    priority: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    has_result: bool
+    error_message: Optional[str] = None
+    approval_status: str
+    approved_by: Optional[str] = None
+    coalesced_with: Optional[str] = None
+
 class ApprovalRequest(BaseModel):
     action: str = Field(..., description="approve or reject")
     reason: Optional[str] = Field(default=None, description="Reason for approval/rejection")
@@ -194,13 +425,68 @@ AGENT_REGISTRY = {
     "executive_briefing": ExecutiveBriefingAgent
 }
 
+agent_registry = AgentRegistry(AGENT_REGISTRY)
+
+# Live output streaming
+class JobStreamHub:
+    """In-process fan-out of streamed agent output to SSE subscribers"""
+    
+    def __init__(self):
+        self._buffers: Dict[str, List[str]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+    
+    def open(self, job_id: str) -> None:
+        """Start buffering output for a job"""
+        self._buffers.setdefault(job_id, [])
+        self._subscribers.setdefault(job_id, [])
+    
+    def is_open(self, job_id: str) -> bool:
+        return job_id in self._buffers
+    
+    def publish(self, job_id: str, chunk: str) -> None:
+        """Append a chunk and push it to current subscribers (event loop thread only)"""
+        if job_id not in self._buffers:
+            return
+        self._buffers[job_id].append(chunk)
+        for queue in self._subscribers[job_id]:
+            queue.put_nowait(chunk)
+    
+    def close(self, job_id: str) -> None:
+        """Signal end of output and drop the job's buffer"""
+        for queue in self._subscribers.pop(job_id, []):
+            queue.put_nowait(None)
+        self._buffers.pop(job_id, None)
+    
+    async def subscribe(self, job_id: str) -> AsyncIterator[str]:
+        """Yield buffered chunks, then live chunks until the job closes"""
+        if job_id not in self._buffers:
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        backlog = list(self._buffers[job_id])
+        self._subscribers[job_id].append(queue)
+        try:
+            for chunk in backlog:
+                yield chunk
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            if queue in self._subscribers.get(job_id, []):
+                self._subscribers[job_id].remove(queue)
+
+job_streams = JobStreamHub()
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Authentication functions
 def create_jwt_token(user_data: dict) -> str:
@@ -223,81 +509,589 @@ def verify_jwt_token(token: str) -> dict:
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    """Get current user from JWT token"""
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user as seen by request handlers"""
+    id: uuid.UUID
+    email: str
+    name: str
+    role: str
+    is_active: bool
+    created_at: datetime
+
+class PrincipalCache:
+    """Process-wide TTL cache of principals keyed by user id"""
+    
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Principal]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, user_id: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                return None
+            return entry[1]
+    
+    def put(self, principal: Principal) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[str(principal.id)] = (time.monotonic(), principal)
+    
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_principal_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_principals", set()).add(str(target.id))
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session):
+    for user_id in session.info.pop("changed_principals", ()):
+        principal_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session):
+    session.info.pop("changed_principals", None)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)) -> Principal:
+    """Get current user from JWT token
+    
+    The token is verified on every request; the user row is read only when
+    the principal cache has no fresh entry for it.
+    """
     token = credentials.credentials
     payload = verify_jwt_token(token)
     
-    user = db.query(User).filter(User.id == payload["user_id"]).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    principal = principal_cache.get(payload["user_id"])
+    if principal is None:
+        PRINCIPAL_CACHE_LOOKUPS.labels(result="miss").inc()
+        try:
+            user = await db.get(User, uuid.UUID(payload["user_id"]))
+        except ValueError:
+            user = None
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        principal = Principal(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            role=user.role,
+            is_active=user.is_active,
+            created_at=user.created_at
+        )
+        principal_cache.put(principal)
+    else:
+        PRINCIPAL_CACHE_LOOKUPS.labels(result="hit").inc()
+    
+    if not principal.is_active:
+        raise HTTPException(status_code=401, detail="User is inactive")
     
-    return user
+    return principal
 
 def require_role(required_role: str):
     """Decorator to require specific role"""
-    def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(current_user: Principal = Depends(get_current_user)):
         if current_user.role != required_role and current_user.role != "admin":
             raise HTTPException(status_code=403, detail="Insufficient permissions")
         return current_user
     return role_checker
 
-# Background task for agent execution
-async def execute_agent_task(job_id: str, agent_name: str, task: str, parameters: Dict[str, Any]):
-    """Execute agent task in background"""
-    db = SessionLocal()
-    try:
-        # Get job record
-        job = db.query(JobExecution).filter(JobExecution.id == job_id).first()
-        if not job:
-            logger.error(f"Job {job_id} not found")
-            return
-        
-        # Update job status
-        job.status = JobStatus.RUNNING
-        job.started_at = datetime.utcnow()
-        db.commit()
-        
-        # Execute agent
-        agent_class = AGENT_REGISTRY.get(agent_name)
-        if not agent_class:
-            job.status = JobStatus.FAILED
-            job.error_message = f"Agent '{agent_name}' not found"
-            job.completed_at = datetime.utcnow()
-            db.commit()
+# Content store
+async def store_content(db: AsyncSession, text: str) -> str:
+    """Store text once in content_blobs and return its SHA-256
+    
+    Identical text from any job or approval maps to the same row; storing it
+    again only refreshes referenced_at, which keeps it from cleanup. The write
+    joins the caller's transaction.
+    """
+    raw = text.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    now = datetime.utcnow()
+    
+    # Short texts can grow under compression; keep those as they are
+    compressed = zstd.ZstdCompressor(level=CONTENT_STORE_ZSTD_LEVEL).compress(raw)
+    encoding, data = ("zstd", compressed) if len(compressed) < len(raw) else ("identity", raw)
+    
+    await db.execute(
+        pg_insert(ContentBlob).values(
+            hash=digest,
+            encoding=encoding,
+            size_bytes=len(raw),
+            data=data,
+            created_at=now,
+            referenced_at=now
+        ).on_conflict_do_update(index_elements=[ContentBlob.hash], set_={"referenced_at": now})
+    )
+    return digest
+
+async def load_blobs(db: AsyncSession, digests: List[str]) -> Dict[str, Tuple[str, bytes]]:
+    """Encoding and stored bytes of the given blobs, in one query"""
+    rows = await db.execute(
+        select(ContentBlob.hash, ContentBlob.encoding, ContentBlob.data).where(ContentBlob.hash.in_(digests))
+    )
+    return {digest: (encoding, data) for digest, encoding, data in rows}
+
+def iter_blob_text(encoding: str, data: bytes) -> Iterator[str]:
+    """Decompress a blob incrementally, yielding text chunks"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    if encoding == "zstd":
+        reader = zstd.ZstdDecompressor().stream_reader(data)
+        while chunk := reader.read(CONTENT_STREAM_CHUNK_BYTES):
+            yield decoder.decode(chunk)
+    else:
+        yield decoder.decode(data)
+    yield decoder.decode(b"", final=True)
+
+def json_with_streamed_string(fields: Dict[str, Any], name: str, chunks: Iterable[str]) -> Iterator[str]:
+    """Serialize fields plus one string member whose value arrives in chunks
+    
+    JSON string escaping works character by character, so each chunk is
+    escaped on its own and never has to be joined with the rest.
+    """
+    head = json.dumps(jsonable_encoder(fields))
+    yield head[:-1] + (", " if fields else "") + json.dumps(name) + ': "'
+    for chunk in chunks:
+        if chunk:
+            yield json.dumps(chunk)[1:-1]
+    yield '"}'
+
+async def job_result_chunks(db: AsyncSession, job: JobExecution) -> Optional[Iterator[str]]:
+    """A job's result JSON as text chunks, or None if it has no result
+    
+    The stored result omits the generated content, which lives in its own
+    blob shared with the job's approval and is spliced back in while streaming.
+    """
+    if job.result_hash:
+        blobs = await load_blobs(db, [job.result_hash, job.content_hash])
+        if job.result_hash not in blobs or job.content_hash not in blobs:
+            logger.error(f"Content blobs missing for job {job.id}")
+            return None
+        fields = json.loads("".join(iter_blob_text(*blobs[job.result_hash])))
+        return json_with_streamed_string(fields, "content", iter_blob_text(*blobs[job.content_hash]))
+    if job.result is not None:
+        return iter([job.result])
+    return None
+
+# Agent execution for a claimed job
+async def lock_owned_job(db: AsyncSession, job_id: str, worker_id: str) -> Optional[JobExecution]:
+    """Lock a job to record its outcome, or None if worker_id no longer runs it
+    
+    A job reaped as stale may have been claimed again by another worker; the
+    original worker must then discard its outcome rather than finish it twice.
+    """
+    job = (await db.execute(select(JobExecution).where(
+        JobExecution.id == uuid.UUID(job_id),
+        JobExecution.worker_id == worker_id,
+        JobExecution.status == JobStatus.RUNNING
+    ).with_for_update().execution_options(populate_existing=True))).scalars().first()
+    if job is None:
+        logger.warning(f"Job {job_id} is no longer owned by {worker_id}; discarding its outcome")
+    return job
+
+async def fail_owned_job(job_id: str, worker_id: str, agent_name: str, error: str) -> None:
+    """Mark a job and the jobs attached to it failed, unless worker_id no longer runs it"""
+    async with AsyncSessionLocal() as db:
+        job = await lock_owned_job(db, job_id, worker_id)
+        if job is None:
             return
-        
-        agent = agent_class()
-        result = agent.process_task(task, parameters)
-        
-        # Update job with result
-        job.status = JobStatus.COMPLETED
-        job.result = json.dumps(result.dict())
+        job.status = JobStatus.FAILED
+        job.error_message = error
         job.completed_at = datetime.utcnow()
-        db.commit()
-        
-        # Create content approval if required
-        if job.approval_status == ApprovalStatus.PENDING:
-            content_approval = ContentApproval(
-                job_id=job_id,
-                content_type="agent_output",
-                title=f"{agent_name} - {task[:50]}",
-                content=result.content,
-                created_by=job.created_by
+        await resolve_coalesced_jobs(db, job)
+        await db.commit()
+    JOB_TRANSITIONS.labels(agent=agent_name, status=JobStatus.FAILED.value).inc()
+
+async def execute_agent_task(job_id: str, worker_id: str, agent_name: str, task: str, parameters: Dict[str, Any]):
+    """Execute agent task for a job already marked running by the queue for worker_id
+    
+    No database connection is held while the agent runs; the outcome is
+    recorded afterwards in a fresh session.
+    """
+    agent = agent_registry.get(agent_name)
+    if not agent:
+        await fail_owned_job(job_id, worker_id, agent_name, f"Agent '{agent_name}' not found")
+        return
+    
+    loop = asyncio.get_running_loop()
+    job_streams.open(job_id)
+    try:
+        # Execute agent
+        started = time.perf_counter()
+        try:
+            result = await agent.aprocess_task(
+                task,
+                parameters,
+                on_token=lambda chunk: loop.call_soon_threadsafe(job_streams.publish, job_id, chunk)
             )
-            db.add(content_approval)
-            db.commit()
+        except Exception:
+            AGENT_EXECUTION_DURATION.labels(agent=agent_name, outcome="exception").observe(time.perf_counter() - started)
+            raise
+        AGENT_EXECUTION_DURATION.labels(agent=agent_name, outcome=result.status).observe(time.perf_counter() - started)
+        
+        # Update job with result, per-call Bedrock telemetry and its approval in
+        # one transaction; the content is stored once and shared by job and approval
+        async with AsyncSessionLocal() as db:
+            job = await lock_owned_job(db, job_id, worker_id)
+            if job is None:
+                return
+            response = asdict(result)
+            job.status = JobStatus.COMPLETED
+            job.content_hash = await store_content(db, response.pop("content"))
+            job.result_hash = await store_content(db, json.dumps(response, default=str))
+            job.completed_at = datetime.utcnow()
+            for call in result.metadata.get("usage", {}).get("calls", []):
+                db.add(JobMetric(
+                    job_id=job.id,
+                    agent_name=agent_name,
+                    model=call.get("model", ""),
+                    cached=call.get("cached", False),
+                    input_tokens=call.get("input_tokens", 0),
+                    output_tokens=call.get("output_tokens", 0),
+                    cache_read_tokens=call.get("cache_read_tokens", 0),
+                    cache_write_tokens=call.get("cache_write_tokens", 0),
+                    latency_ms=call.get("latency_ms"),
+                    ttfb_ms=call.get("ttfb_ms"),
+                    throttle_retries=call.get("throttle_retries", 0)
+                ))
+            
+            # Create content approval if required
+            if job.approval_status == ApprovalStatus.PENDING:
+                db.add(ContentApproval(
+                    job_id=job.id,
+                    content_type="agent_output",
+                    title=f"{agent_name} - {task[:50]}",
+                    content_hash=job.content_hash,
+                    content_preview=result.content[:APPROVAL_PREVIEW_CHARS + 1],
+                    created_by=job.created_by
+                ))
+            await resolve_coalesced_jobs(db, job)
+            await db.commit()
+        JOB_TRANSITIONS.labels(agent=agent_name, status=JobStatus.COMPLETED.value).inc()
         
         logger.info(f"Job {job_id} completed successfully")
         
     except Exception as e:
         logger.error(f"Error executing job {job_id}: {str(e)}")
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        db.commit()
+        await fail_owned_job(job_id, worker_id, agent_name, str(e))
     finally:
-        db.close()
+        job_streams.close(job_id)
+
+# Request coalescing
+def job_fingerprint(agent_name: str, task: str, parameters: Dict[str, Any], requires_approval: bool) -> str:
+    """Identity of a job's work: agent, task, canonicalized parameters and approval requirement
+    
+    Jobs that need approval never attach to one whose output skipped review.
+    """
+    canonical = json.dumps(
+        [agent_name, task.strip(), parameters or {}, bool(requires_approval)],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+async def lock_fingerprint(db: AsyncSession, fingerprint: str) -> None:
+    """Serialize attaching to and reviewing jobs with this fingerprint until the transaction ends"""
+    await db.execute(select(func.pg_advisory_xact_lock(int(fingerprint[:15], 16))))
+
+async def find_coalescing_target(db: AsyncSession, fingerprint: str) -> Optional[JobExecution]:
+    """Find an in-flight or freshly completed primary job with the same fingerprint
+    
+    Takes a transaction-scoped advisory lock on the fingerprint so concurrent
+    submissions of the same work serialize here and only one becomes primary.
+    """
+    await lock_fingerprint(db, fingerprint)
+    
+    fresh_after = datetime.utcnow() - timedelta(seconds=JOB_COALESCE_WINDOW_SECONDS)
+    return (await db.execute(select(JobExecution).where(
+        JobExecution.fingerprint == fingerprint,
+        JobExecution.coalesced_from.is_(None),
+        or_(
+            JobExecution.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+            (JobExecution.status == JobStatus.COMPLETED) & (JobExecution.completed_at >= fresh_after)
+        )
+    ).order_by(JobExecution.created_at.desc()).limit(1))).scalars().first()
+
+async def resolve_coalesced_jobs(db: AsyncSession, primary: JobExecution) -> None:
+    """Copy a finished primary job's outcome onto the jobs attached to it
+    
+    Takes the primary's fingerprint lock first, so a job attaching concurrently
+    either sees the finished primary or is committed before this update runs.
+    """
+    if primary.fingerprint:
+        await lock_fingerprint(db, primary.fingerprint)
+    await db.execute(update(JobExecution).where(
+        JobExecution.coalesced_from == primary.id,
+        JobExecution.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
+    ).values({
+        JobExecution.status: primary.status,
+        JobExecution.started_at: primary.started_at,
+        JobExecution.completed_at: primary.completed_at,
+        JobExecution.result: primary.result,
+        JobExecution.result_hash: primary.result_hash,
+        JobExecution.content_hash: primary.content_hash,
+        JobExecution.error_message: primary.error_message
+    }).execution_options(synchronize_session=False))
+
+# Persistent job queue
+PRIORITY_RANK = {
+    JobPriority.CRITICAL.value: 0,
+    JobPriority.HIGH.value: 1,
+    JobPriority.MEDIUM.value: 2,
+    JobPriority.LOW.value: 3
+}
+
+async def claim_next_job(worker_id: str) -> Optional[Dict[str, Any]]:
+    """Atomically claim the highest-priority pending job
+    
+    Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers across
+    replicas never claim the same row. Agents at their JOB_AGENT_CONCURRENCY
+    cap are skipped until one of their running jobs finishes; claims of a
+    capped agent hold an advisory lock on it while recounting, so workers
+    racing for its last slot cannot overshoot the cap.
+    """
+    async with AsyncSessionLocal() as db:
+        excluded = set()
+        if JOB_AGENT_CONCURRENCY:
+            # Cheap first pass; the authoritative check happens under the lock below
+            running_counts = dict((await db.execute(
+                select(JobExecution.agent_name, func.count(JobExecution.id))
+                .where(JobExecution.status == JobStatus.RUNNING)
+                .group_by(JobExecution.agent_name)
+            )).all())
+            excluded = {
+                name for name, limit in JOB_AGENT_CONCURRENCY.items()
+                if running_counts.get(name, 0) >= limit
+            }
+        
+        while True:
+            query = select(JobExecution).where(
+                JobExecution.status == JobStatus.PENDING,
+                JobExecution.coalesced_from.is_(None)
+            )
+            if excluded:
+                query = query.where(~JobExecution.agent_name.in_(excluded))
+            job = (await db.execute(
+                query.order_by(JobExecution.priority_rank, JobExecution.created_at)
+                .with_for_update(skip_locked=True)
+                .limit(1)
+            )).scalars().first()
+            if not job:
+                await db.rollback()
+                return None
+            
+            limit = JOB_AGENT_CONCURRENCY.get(job.agent_name)
+            if limit is None:
+                break
+            await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"job_agent:{job.agent_name}"))))
+            running = (await db.execute(select(func.count(JobExecution.id)).where(
+                JobExecution.agent_name == job.agent_name,
+                JobExecution.status == JobStatus.RUNNING
+            ))).scalar()
+            if running < limit:
+                break
+            excluded.add(job.agent_name)
+            await db.rollback()
+        
+        now = datetime.utcnow()
+        job.status = JobStatus.RUNNING
+        job.started_at = now
+        job.heartbeat_at = now
+        job.worker_id = worker_id
+        job.attempts = (job.attempts or 0) + 1
+        await db.commit()
+        JOB_TRANSITIONS.labels(agent=job.agent_name, status=JobStatus.RUNNING.value).inc()
+        
+        return {
+            "job_id": str(job.id),
+            "agent_name": job.agent_name,
+            "task": job.task_description,
+            "parameters": json.loads(job.parameters) if job.parameters else {}
+        }
+
+async def heartbeat_job(job_id: str, worker_id: str) -> None:
+    """Record that a worker is still executing a job"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(JobExecution).where(
+            JobExecution.id == uuid.UUID(job_id),
+            JobExecution.worker_id == worker_id,
+            JobExecution.status == JobStatus.RUNNING
+        ).values({JobExecution.heartbeat_at: datetime.utcnow()}).execution_options(synchronize_session=False))
+        await db.commit()
+
+async def requeue_stale_jobs() -> int:
+    """Return running jobs whose worker stopped heartbeating to the queue
+    
+    Jobs already claimed JOB_MAX_ATTEMPTS times are failed instead, so a task
+    that keeps crashing its worker is not retried forever.
+    """
+    async with AsyncSessionLocal() as db:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+        exhausted = (await db.execute(select(JobExecution).where(
+            JobExecution.status == JobStatus.RUNNING,
+            JobExecution.heartbeat_at < cutoff,
+            JobExecution.attempts >= JOB_MAX_ATTEMPTS
+        ).with_for_update(skip_locked=True))).scalars().all()
+        for job in exhausted:
+            job.status = JobStatus.FAILED
+            job.error_message = f"Worker stopped responding on each of {job.attempts} attempts"
+            job.completed_at = now
+            job.worker_id = None
+            await db.flush()
+            await resolve_coalesced_jobs(db, job)
+            JOB_TRANSITIONS.labels(agent=job.agent_name, status=JobStatus.FAILED.value).inc()
+            logger.error(f"Failed job {job.id} after {job.attempts} attempts")
+        
+        requeued = (await db.execute(update(JobExecution).where(
+            JobExecution.status == JobStatus.RUNNING,
+            JobExecution.heartbeat_at < cutoff,
+            JobExecution.attempts < JOB_MAX_ATTEMPTS
+        ).values({
+            JobExecution.status: JobStatus.PENDING,
+            JobExecution.worker_id: None,
+            JobExecution.started_at: None
+        }).execution_options(synchronize_session=False))).rowcount
+        await db.commit()
+        if requeued:
+            JOB_TRANSITIONS.labels(agent="stale", status=JobStatus.PENDING.value).inc(requeued)
+            logger.warning(f"Requeued {requeued} stale jobs")
+        return requeued
+
+class JobWorkerPool:
+    """Bounded pool of async workers draining the job_executions queue"""
+    
+    def __init__(self, worker_count: int, worker_id: str):
+        self.worker_count = worker_count
+        self.worker_id = worker_id
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+    
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._reaper())]
+        self._tasks += [
+            asyncio.create_task(self._worker(f"{self.worker_id}/{i}"))
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"Started {self.worker_count} job workers as {self.worker_id}")
+    
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    def notify(self) -> None:
+        """Wake idle workers after a job is enqueued"""
+        self._wakeup.set()
+    
+    async def _worker(self, worker_id: str) -> None:
+        while True:
+            try:
+                claimed = await claim_next_job(worker_id)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed to claim a job: {str(e)}")
+                claimed = None
+            
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heartbeat = asyncio.create_task(self._heartbeat(claimed["job_id"], worker_id))
+            try:
+                await execute_agent_task(
+                    claimed["job_id"], worker_id, claimed["agent_name"], claimed["task"], claimed["parameters"]
+                )
+            finally:
+                heartbeat.cancel()
+    
+    async def _heartbeat(self, job_id: str, worker_id: str) -> None:
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                await heartbeat_job(job_id, worker_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for job {job_id}: {str(e)}")
+    
+    async def _reaper(self) -> None:
+        while True:
+            try:
+                await requeue_stale_jobs()
+            except Exception as e:
+                logger.error(f"Failed to requeue stale jobs: {str(e)}")
+            try:
+                await compact_dashboard_counters()
+            except Exception as e:
+                logger.error(f"Failed to compact dashboard counters: {str(e)}")
+            await asyncio.sleep(JOB_STALE_AFTER_SECONDS / 2)
+
+job_workers = JobWorkerPool(JOB_WORKERS, WORKER_ID)
+
+@app.on_event("startup")
+async def start_job_workers():
+    if RUN_JOB_WORKERS:
+        job_workers.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_workers.stop()
+
+# Listing helpers
+def encode_cursor(created_at: datetime, row_id) -> str:
+    """Opaque keyset cursor for the row a page ended on"""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str):
+    """(created_at, id) position encoded by encode_cursor"""
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def keyset_page(db: AsyncSession, query, model, cursor: Optional[str], limit: int) -> List[Any]:
+    """One page of rows newest first, continuing after the cursor position
+    
+    Seeks on the (created_at, id) index instead of using OFFSET, so every page
+    costs the same however deep it is. Queries must select created_at and id.
+    """
+    if cursor:
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(*decode_cursor(cursor)))
+    return (await db.execute(query.order_by(model.created_at.desc(), model.id.desc()).limit(limit))).all()
+
+def next_cursor(rows: List[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after rows, or None on the last page"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]._mapping
+    return encode_cursor(last["created_at"], last["id"])
+
+def make_etag(*parts: str) -> str:
+    return f'W/"{hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    return etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+
+def etag_response(request: Request, payload: Dict[str, Any]) -> Response:
+    """JSON response with an ETag, or 304 when the client already has this body"""
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":"))
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # API Routes
 
@@ -306,6 +1100,26 @@ async def root():
     """Root endpoint"""
     return {"message": "Enterprise AI Strategy Command Center API", "version": "1.0.0"}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    await _refresh_queue_depth()
+    for model, limiter_metrics in get_rate_limiter_metrics().items():
+        BEDROCK_CONCURRENCY_LIMIT.labels(model=model).set(limiter_metrics["concurrency_limit"])
+        BEDROCK_LIMITER_QUEUE_DEPTH.labels(model=model).set(limiter_metrics["queue_depth"])
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+async def _refresh_queue_depth() -> None:
+    """Update queue depth gauges with one grouped query over active jobs"""
+    async with AsyncSessionLocal() as db:
+        counts = dict((await db.execute(
+            select(JobExecution.status, func.count(JobExecution.id))
+            .where(JobExecution.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))
+            .group_by(JobExecution.status)
+        )).all())
+    for status in (JobStatus.PENDING, JobStatus.RUNNING):
+        JOB_QUEUE_DEPTH.labels(status=status.value).set(counts.get(status.value, 0))
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -313,143 +1127,319 @@ async def health_check():
 
 # Agent Management Routes
 @app.get("/agents")
-async def list_agents(current_user: User = Depends(get_current_user)):
+async def list_agents(current_user: Principal = Depends(get_current_user)):
     """List all available agents"""
-    agents = []
-    for name, agent_class in AGENT_REGISTRY.items():
-        agent = agent_class()
-        agents.append({
-            "name": name,
-            "class": agent_class.__name__,
-            "description": agent.__doc__ or f"{name} agent"
-        })
-    return {"agents": agents}
+    return {"agents": agent_registry.describe()}
 
 @app.post("/agents/{agent_name}/execute")
 async def execute_agent(
     agent_name: str,
     request: AgentExecutionRequest,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Execute an agent with specified parameters"""
-    if agent_name not in AGENT_REGISTRY:
+    if agent_name not in agent_registry:
         raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found")
     
-    # Create job record
+    fingerprint = job_fingerprint(agent_name, request.task, request.parameters, request.requires_approval)
+    primary = await find_coalescing_target(db, fingerprint) if request.allow_coalescing else None
+    
+    # Create job record; the worker pool picks it up from the queue unless it
+    # attaches to an identical in-flight or recent execution
     job = JobExecution(
         job_type="agent_execution",
         agent_name=agent_name,
         created_by=current_user.email,
+        task_description=request.task,
+        priority=request.priority,
+        priority_rank=PRIORITY_RANK[JobPriority(request.priority or JobPriority.MEDIUM).value],
         parameters=json.dumps(request.parameters),
-        approval_status=ApprovalStatus.PENDING if request.requires_approval else ApprovalStatus.APPROVED
+        approval_status=ApprovalStatus.PENDING if request.requires_approval else ApprovalStatus.APPROVED,
+        fingerprint=fingerprint
     )
     
+    if primary is not None:
+        job.coalesced_from = primary.id
+        if primary.status == JobStatus.COMPLETED:
+            job.status = JobStatus.COMPLETED
+            job.started_at = primary.started_at
+            job.completed_at = primary.completed_at
+            job.result = primary.result
+            job.result_hash = primary.result_hash
+            job.content_hash = primary.content_hash
+        
+        # The primary's output was already reviewed, so no approval will come
+        # to resolve this job; take over the outcome of that review
+        if primary.approval_status != ApprovalStatus.PENDING:
+            job.approval_status = primary.approval_status
+            job.approved_by = primary.approved_by
+            job.approved_at = primary.approved_at
+        JOBS_COALESCED.labels(agent=agent_name, state=JobStatus(primary.status).value).inc()
+    
     db.add(job)
-    db.commit()
-    
-    # Start background task
-    background_tasks.add_task(
-        execute_agent_task,
-        str(job.id),
-        agent_name,
-        request.task,
-        request.parameters
-    )
+    await db.commit()
+    
+    if primary is not None:
+        return {
+            "job_id": str(job.id),
+            "status": JobStatus(job.status).value,
+            "coalesced_with": str(primary.id),
+            "message": "Attached to an identical agent execution"
+        }
     
-    return {"job_id": str(job.id), "status": "started", "message": "Agent execution started"}
+    job_workers.notify()
+    JOB_TRANSITIONS.labels(agent=agent_name, status=JobStatus.PENDING.value).inc()
+    
+    return {"job_id": str(job.id), "status": "queued", "message": "Agent execution queued"}
 
 @app.get("/jobs/{job_id}")
 async def get_job_status(
-    job_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    job_id: uuid.UUID,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get job execution status"""
-    job = db.query(JobExecution).filter(JobExecution.id == job_id).first()
+    job = await db.get(JobExecution, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    status_fields = {
+        "job_id": str(job.id),
+        "status": job.status,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "completed_at": job.completed_at,
+        "error_message": job.error_message,
+        "approval_status": job.approval_status,
+        "approved_by": job.approved_by
+    }
+    chunks = await job_result_chunks(db, job)
+    if chunks is None:
+        return JobStatusResponse(**status_fields)
+    
+    # Results can be large: decompress and send them as they are read
+    return StreamingResponse(
+        json_with_streamed_string(status_fields, "result", chunks),
+        media_type="application/json"
+    )
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job_output(
+    job_id: uuid.UUID,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream job output as Server-Sent Events
+    
+    Emits "token" events with generated text while the job runs, then a final
+    "status" event with the persisted job state.
+    """
+    job = await db.get(JobExecution, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return JobStatusResponse(
-        job_id=str(job.id),
-        status=job.status,
-        created_at=job.created_at,
-        started_at=job.started_at,
-        completed_at=job.completed_at,
-        result=job.result,
-        error_message=job.error_message,
-        approval_status=job.approval_status,
-        approved_by=job.approved_by
+    async def load_job() -> JobExecution:
+        async with AsyncSessionLocal() as poll_db:
+            return await poll_db.get(JobExecution, job_id)
+    
+    # Coalesced jobs stream the output of the execution they are attached to
+    stream_id = str(job.coalesced_from or job.id)
+    
+    async def event_stream() -> AsyncIterator[str]:
+        current = job
+        
+        # Wait until this process starts running the job, or it finishes elsewhere
+        while not job_streams.is_open(stream_id) and current.status in (JobStatus.PENDING, JobStatus.RUNNING):
+            await asyncio.sleep(1)
+            current = await load_job()
+        
+        async for chunk in job_streams.subscribe(stream_id):
+            yield _sse_event("token", {"text": chunk})
+        
+        # Job finished: report the persisted outcome
+        final_job = await load_job()
+        async with AsyncSessionLocal() as blob_db:
+            chunks = await job_result_chunks(blob_db, final_job)
+        yield _sse_event("status", {
+            "job_id": str(job_id),
+            "status": final_job.status,
+            "result": "".join(chunks) if chunks is not None else None,
+            "error_message": final_job.error_message
+        })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @app.get("/jobs")
 async def list_jobs(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """List job executions"""
-    query = db.query(JobExecution)
+    """List job summaries, newest first
+    
+    Pass the returned next_cursor to fetch the following page. Results are
+    omitted; fetch them from /jobs/{job_id}.
+    """
+    query = select(
+        JobExecution.id,
+        JobExecution.agent_name,
+        JobExecution.status,
+        JobExecution.priority,
+        JobExecution.created_at,
+        JobExecution.started_at,
+        JobExecution.completed_at,
+        or_(JobExecution.result_hash.isnot(None), JobExecution.result.isnot(None)),
+        func.substr(JobExecution.error_message, 1, ERROR_PREVIEW_CHARS),
+        JobExecution.approval_status,
+        JobExecution.approved_by,
+        JobExecution.coalesced_from
+    )
     
     if status:
-        query = query.filter(JobExecution.status == status)
+        query = query.where(JobExecution.status == status)
     
     # Non-admin users can only see their own jobs
     if current_user.role != "admin":
-        query = query.filter(JobExecution.created_by == current_user.email)
+        query = query.where(JobExecution.created_by == current_user.email)
     
-    jobs = query.order_by(JobExecution.created_at.desc()).offset(skip).limit(limit).all()
+    rows = await keyset_page(db, query, JobExecution, cursor, limit)
     
-    return {
-        "jobs": [JobStatusResponse(
-            job_id=str(job.id),
-            status=job.status,
-            created_at=job.created_at,
-            started_at=job.started_at,
-            completed_at=job.completed_at,
-            result=job.result,
-            error_message=job.error_message,
-            approval_status=job.approval_status,
-            approved_by=job.approved_by
-        ) for job in jobs]
-    }
+    return etag_response(request, {
+        "jobs": [JobSummaryResponse(
+            job_id=str(job_id),
+            agent_name=agent_name,
+            status=job_status,
+            priority=priority,
+            created_at=created_at,
+            started_at=started_at,
+            completed_at=completed_at,
+            has_result=has_result,
+            error_message=error_message,
+            approval_status=approval_status,
+            approved_by=approved_by,
+            coalesced_with=str(coalesced_from) if coalesced_from else None
+        ) for (job_id, agent_name, job_status, priority, created_at, started_at, completed_at,
+               has_result, error_message, approval_status, approved_by, coalesced_from) in rows],
+        "next_cursor": next_cursor(rows, limit)
+    })
 
 # Content Approval Routes
 @app.get("/approvals")
 async def list_pending_approvals(
-    current_user: User = Depends(require_role("manager")),
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(require_role("manager")),
+    db: AsyncSession = Depends(get_db)
 ):
-    """List pending content approvals"""
-    approvals = db.query(ContentApproval).filter(
-        ContentApproval.status == ApprovalStatus.PENDING
-    ).order_by(ContentApproval.created_at.desc()).all()
-    
-    return {"approvals": [
-        {
-            "id": str(approval.id),
-            "job_id": str(approval.job_id),
-            "title": approval.title,
-            "content_type": approval.content_type,
-            "created_at": approval.created_at,
-            "created_by": approval.created_by,
-            "content": approval.content[:500] + "..." if len(approval.content) > 500 else approval.content
-        }
-        for approval in approvals
-    ]}
+    """List pending content approvals, newest first, with content previews
+    
+    Pass the returned next_cursor to fetch the following page; full content
+    is available from /approvals/{approval_id}.
+    """
+    query = select(
+        ContentApproval.id,
+        ContentApproval.job_id,
+        ContentApproval.title,
+        ContentApproval.content_type,
+        ContentApproval.created_at,
+        ContentApproval.created_by,
+        # One character past the preview tells whether the content was cut
+        func.coalesce(ContentApproval.content_preview, func.substr(ContentApproval.content, 1, APPROVAL_PREVIEW_CHARS + 1))
+    ).where(ContentApproval.status == ApprovalStatus.PENDING)
+    
+    rows = await keyset_page(db, query, ContentApproval, cursor, limit)
+    
+    return etag_response(request, {
+        "approvals": [
+            {
+                "id": str(approval_id),
+                "job_id": str(job_id),
+                "title": title,
+                "content_type": content_type,
+                "created_at": created_at,
+                "created_by": created_by,
+                "content": preview[:APPROVAL_PREVIEW_CHARS] + "..." if len(preview) > APPROVAL_PREVIEW_CHARS else preview
+            }
+            for approval_id, job_id, title, content_type, created_at, created_by, preview in rows
+        ],
+        "next_cursor": next_cursor(rows, limit)
+    })
+
+@app.get("/approvals/{approval_id}")
+async def get_approval(
+    approval_id: uuid.UUID,
+    request: Request,
+    current_user: Principal = Depends(require_role("manager")),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a content approval with its full content"""
+    approval = await db.get(ContentApproval, approval_id)
+    if not approval:
+        raise HTTPException(status_code=404, detail="Approval not found")
+    
+    fields = {
+        "id": str(approval.id),
+        "job_id": str(approval.job_id),
+        "title": approval.title,
+        "content_type": approval.content_type,
+        "status": approval.status,
+        "created_at": approval.created_at,
+        "created_by": approval.created_by,
+        "approved_by": approval.approved_by,
+        "approved_at": approval.approved_at,
+        "rejection_reason": approval.rejection_reason
+    }
+    if not approval.content_hash:
+        return etag_response(request, {**fields, "content": approval.content})
+    
+    # The content hash identifies the body, so a revalidation never reads the blob
+    etag = make_etag(json.dumps(jsonable_encoder(fields), separators=(",", ":")), approval.content_hash)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    blobs = await load_blobs(db, [approval.content_hash])
+    if approval.content_hash not in blobs:
+        logger.error(f"Content blob missing for approval {approval.id}")
+        raise HTTPException(status_code=500, detail="Approval content unavailable")
+    return StreamingResponse(
+        json_with_streamed_string(fields, "content", iter_blob_text(*blobs[approval.content_hash])),
+        media_type="application/json",
+        headers=headers
+    )
+
+async def approval_jobs(db: AsyncSession, job_id) -> List[JobExecution]:
+    """The job an approval belongs to plus coalesced jobs still awaiting approval
+    
+    Holds the job's fingerprint lock, so no job can attach between this
+    lookup and the review being committed and miss its outcome.
+    """
+    job = await db.get(JobExecution, job_id)
+    if job is not None and job.fingerprint:
+        await lock_fingerprint(db, job.fingerprint)
+    return (await db.execute(select(JobExecution).where(or_(
+        JobExecution.id == job_id,
+        (JobExecution.coalesced_from == job_id) & (JobExecution.approval_status == ApprovalStatus.PENDING)
+    )))).scalars().all()
 
 @app.post("/approvals/{approval_id}/review")
 async def review_approval(
-    approval_id: str,
+    approval_id: uuid.UUID,
     request: ApprovalRequest,
-    current_user: User = Depends(require_role("manager")),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_role("manager")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Approve or reject content"""
-    approval = db.query(ContentApproval).filter(ContentApproval.id == approval_id).first()
+    approval = await db.get(ContentApproval, approval_id)
     if not approval:
         raise HTTPException(status_code=404, detail="Approval not found")
     
@@ -458,9 +1448,8 @@ async def review_approval(
         approval.approved_by = current_user.email
         approval.approved_at = datetime.utcnow()
         
-        # Update job approval status
-        job = db.query(JobExecution).filter(JobExecution.id == approval.job_id).first()
-        if job:
+        # Update approval status of the job and any jobs coalesced onto it
+        for job in await approval_jobs(db, approval.job_id):
             job.approval_status = ApprovalStatus.APPROVED
             job.approved_by = current_user.email
             job.approved_at = datetime.utcnow()
@@ -472,9 +1461,8 @@ async def review_approval(
         approval.approved_at = datetime.utcnow()
         approval.rejection_reason = request.reason
         
-        # Update job approval status
-        job = db.query(JobExecution).filter(JobExecution.id == approval.job_id).first()
-        if job:
+        # Update approval status of the job and any jobs coalesced onto it
+        for job in await approval_jobs(db, approval.job_id):
             job.approval_status = ApprovalStatus.REJECTED
             job.approved_by = current_user.email
             job.approved_at = datetime.utcnow()
@@ -483,7 +1471,7 @@ async def review_approval(
     else:
         raise HTTPException(status_code=400, detail="Invalid action. Use 'approve' or 'reject'")
     
-    db.commit()
+    await db.commit()
     
     return {"message": message, "approval_id": str(approval.id)}
 
@@ -491,11 +1479,11 @@ async def review_approval(
 @app.post("/users")
 async def create_user(
     user: UserCreate,
-    current_user: User = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new user"""
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    existing_user = (await db.execute(select(User).where(User.email == user.email))).scalars().first()
     if existing_user:
         raise HTTPException(status_code=400, detail="User already exists")
     
@@ -506,17 +1494,17 @@ async def create_user(
     )
     
     db.add(new_user)
-    db.commit()
+    await db.commit()
     
     return {"message": "User created successfully", "user_id": str(new_user.id)}
 
 @app.get("/users")
 async def list_users(
-    current_user: User = Depends(require_role("admin")),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_db)
 ):
     """List all users"""
-    users = db.query(User).all()
+    users = (await db.execute(select(User))).scalars().all()
     
     return {"users": [UserResponse(
         id=str(user.id),
@@ -529,15 +1517,15 @@ async def list_users(
 
 # Authentication Routes
 @app.post("/auth/login")
-async def login(email: str, password: str, db: Session = Depends(get_db)):
+async def login(email: str, password: str, db: AsyncSession = Depends(get_db)):
     """Login user and return JWT token"""
     # Note: In production, implement proper password hashing and verification
-    user = db.query(User).filter(User.email == email).first()
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     token = create_jwt_token({
         "id": user.id,
@@ -548,7 +1536,7 @@ async def login(email: str, password: str, db: Session = Depends(get_db)):
     return {"access_token": token, "token_type": "bearer"}
 
 @app.get("/auth/me")
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user)):
     """Get current user information"""
     return UserResponse(
         id=str(current_user.id),
@@ -562,23 +1550,156 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 # Statistics and Monitoring Routes
 @app.get("/stats/dashboard")
 async def get_dashboard_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    days: int = Query(default=7, ge=1, le=90),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Get dashboard statistics"""
-    total_jobs = db.query(JobExecution).count()
-    running_jobs = db.query(JobExecution).filter(JobExecution.status == JobStatus.RUNNING).count()
-    pending_approvals = db.query(ContentApproval).filter(ContentApproval.status == ApprovalStatus.PENDING).count()
-    completed_jobs = db.query(JobExecution).filter(JobExecution.status == JobStatus.COMPLETED).count()
+    """Get dashboard statistics, with per-agent Bedrock rollups over the last `days` days"""
+    return await load_dashboard_stats(days)
+
+# Dashboard statistics
+_dashboard_stats_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+# Distinct rollup windows kept at once; dashboards use a handful
+DASHBOARD_STATS_CACHE_MAX_ENTRIES = 8
+_dashboard_stats_lock = asyncio.Lock()
+_counters_maintained: Optional[bool] = None
+
+async def load_dashboard_stats(days: int) -> Dict[str, Any]:
+    """Dashboard statistics for a rollup window, cached for DASHBOARD_STATS_TTL_SECONDS
+    
+    Refreshes are serialized so concurrent dashboard loads on an expired entry
+    query the database once.
+    """
+    async with _dashboard_stats_lock:
+        entry = _dashboard_stats_cache.get(days)
+        if entry is not None and time.monotonic() - entry[0] < DASHBOARD_STATS_TTL_SECONDS:
+            return entry[1]
+        
+        async with AsyncSessionLocal() as db:
+            counts = await get_status_counts(db)
+            job_counts = counts.get(JobExecution.__tablename__, {})
+            total_jobs = sum(job_counts.values())
+            completed_jobs = job_counts.get(JobStatus.COMPLETED.value, 0)
+            stats = {
+                "total_jobs": total_jobs,
+                "running_jobs": job_counts.get(JobStatus.RUNNING.value, 0),
+                "pending_approvals": counts.get(ContentApproval.__tablename__, {}).get(ApprovalStatus.PENDING.value, 0),
+                "completed_jobs": completed_jobs,
+                "success_rate": (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0,
+                **await get_agent_usage_rollups(db, days)
+            }
+        
+        # Drop expired windows, then the oldest, so the cache stays small
+        now = time.monotonic()
+        for cached_days, (cached_at, _) in list(_dashboard_stats_cache.items()):
+            if now - cached_at >= DASHBOARD_STATS_TTL_SECONDS:
+                del _dashboard_stats_cache[cached_days]
+        while len(_dashboard_stats_cache) >= DASHBOARD_STATS_CACHE_MAX_ENTRIES:
+            del _dashboard_stats_cache[min(_dashboard_stats_cache, key=lambda key: _dashboard_stats_cache[key][0])]
+        _dashboard_stats_cache[days] = (now, stats)
+        return stats
+
+async def counters_maintained(db: AsyncSession) -> bool:
+    """Whether the dashboard_counters triggers from init.sql are installed"""
+    global _counters_maintained
+    if _counters_maintained is None:
+        _counters_maintained = (await db.execute(select(func.to_regproc("compact_dashboard_counters")))).scalar() is not None
+        if not _counters_maintained:
+            logger.warning("dashboard_counters triggers not installed; counting job and approval rows directly")
+    return _counters_maintained
+
+async def get_status_counts(db: AsyncSession) -> Dict[str, Dict[str, int]]:
+    """Row counts by status for job_executions and content_approvals, in one query
+    
+    Sums the trigger-maintained deltas in dashboard_counters, which stay a
+    handful of rows between compactions however long the job history grows.
+    Databases created without init.sql fall back to a grouped count over both
+    tables.
+    """
+    if await counters_maintained(db):
+        rows = (await db.execute(select(
+            DashboardCounter.scope, DashboardCounter.key, func.sum(DashboardCounter.delta)
+        ).group_by(DashboardCounter.scope, DashboardCounter.key))).all()
+    else:
+        jobs = select(
+            literal(JobExecution.__tablename__), JobExecution.status.cast(String), func.count(JobExecution.id)
+        ).group_by(JobExecution.status)
+        approvals = select(
+            literal(ContentApproval.__tablename__), ContentApproval.status.cast(String), func.count(ContentApproval.id)
+        ).group_by(ContentApproval.status)
+        rows = (await db.execute(jobs.union_all(approvals))).all()
+    
+    counts: Dict[str, Dict[str, int]] = {}
+    for scope, key, count in rows:
+        counts.setdefault(scope, {})[key] = int(count or 0)
+    return counts
+
+async def compact_dashboard_counters() -> None:
+    """Fold accumulated dashboard_counters deltas into one row per status"""
+    async with AsyncSessionLocal() as db:
+        if await counters_maintained(db):
+            await db.execute(select(func.compact_dashboard_counters()))
+            await db.commit()
+
+async def get_agent_usage_rollups(db: AsyncSession, days: int) -> Dict[str, Any]:
+    """Per-agent Bedrock latency percentiles and daily token usage from job_metrics"""
+    since = datetime.utcnow() - timedelta(days=days)
+    invoked = [JobMetric.created_at >= since, JobMetric.cached.is_(False)]
+    
+    latency_rows = (await db.execute(select(
+        JobMetric.agent_name,
+        func.count(JobMetric.id),
+        func.percentile_cont(0.5).within_group(JobMetric.latency_ms),
+        func.percentile_cont(0.95).within_group(JobMetric.latency_ms),
+        func.percentile_cont(0.5).within_group(JobMetric.ttfb_ms)
+    ).where(*invoked).group_by(JobMetric.agent_name))).all()
+    
+    day = func.date_trunc("day", JobMetric.created_at)
+    token_rows = (await db.execute(select(
+        JobMetric.agent_name,
+        day,
+        func.sum(JobMetric.input_tokens),
+        func.sum(JobMetric.output_tokens),
+        func.sum(JobMetric.cache_read_tokens),
+        func.sum(JobMetric.cache_write_tokens)
+    ).where(*invoked).group_by(JobMetric.agent_name, day).order_by(day))).all()
     
     return {
-        "total_jobs": total_jobs,
-        "running_jobs": running_jobs,
-        "pending_approvals": pending_approvals,
-        "completed_jobs": completed_jobs,
-        "success_rate": (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
+        "agent_latency": [
+            {
+                "agent_name": agent_name,
+                "calls": calls,
+                "p50_latency_ms": p50,
+                "p95_latency_ms": p95,
+                "p50_ttfb_ms": ttfb
+            }
+            for agent_name, calls, p50, p95, ttfb in latency_rows
+        ],
+        "agent_tokens_per_day": [
+            {
+                "agent_name": agent_name,
+                "day": bucket.date().isoformat(),
+                "input_tokens": int(input_tokens or 0),
+                "output_tokens": int(output_tokens or 0),
+                "cache_read_tokens": int(cache_read_tokens or 0),
+                "cache_write_tokens": int(cache_write_tokens or 0)
+            }
+            for agent_name, bucket, input_tokens, output_tokens, cache_read_tokens, cache_write_tokens in token_rows
+        ]
     }
 
+@app.get("/stats/rate-limits")
+async def get_rate_limit_stats(current_user: Principal = Depends(get_current_user)):
+    """Current Bedrock client-side limits, queue depth and hedging per model/inference profile"""
+    return {"rate_limits": get_rate_limiter_metrics(), "hedging": get_hedge_metrics()}
+
+async def run_job_workers_forever():
+    """Run only the job worker pool (dedicated worker replicas)"""
+    job_workers.start()
+    await asyncio.Event().wait()
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    if "--worker" in sys.argv:
+        asyncio.run(run_job_workers_forever())
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
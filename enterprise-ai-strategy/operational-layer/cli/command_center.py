@@ -10,6 +10,7 @@ import json
 import os
 import sys
 from datetime import datetime
+from urllib.parse import quote
 from typing import Dict, List, Any, Optional
 from rich.console import Console
 from rich.table import Table
@@ -80,6 +81,26 @@ class CommandCenterAPI:
         """Get job execution status"""
         return self._make_request("GET", f"/jobs/{job_id}")
     
+    def stream_job(self, job_id: str):
+        """Stream job output events, yielding (event, data) tuples"""
+        url = f"{self.base_url}/jobs/{job_id}/stream"
+        headers = dict(self.headers, Accept="text/event-stream")
+        
+        with requests.get(url, headers=headers, stream=True, timeout=(10, None)) as response:
+            response.raise_for_status()
+            event, data_lines = "message", []
+            for line in response.iter_lines(decode_unicode=True):
+                if line is None:
+                    continue
+                if line == "":
+                    if data_lines:
+                        yield event, json.loads("\n".join(data_lines))
+                    event, data_lines = "message", []
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data_lines.append(line[len("data:"):].strip())
+    
     def list_jobs(self, status: str = None, limit: int = 20) -> List[Dict]:
         """List job executions"""
         params = f"?limit={limit}"
@@ -88,8 +109,16 @@ class CommandCenterAPI:
         return self._make_request("GET", f"/jobs{params}")["jobs"]
     
     def list_approvals(self) -> List[Dict]:
-        """List pending approvals"""
-        return self._make_request("GET", "/approvals")["approvals"]
+        """List pending approvals, following next_cursor through every page"""
+        approvals = []
+        cursor = None
+        while True:
+            endpoint = "/approvals" + (f"?cursor={quote(cursor)}" if cursor else "")
+            page = self._make_request("GET", endpoint)
+            approvals.extend(page["approvals"])
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return approvals
     
     def review_approval(self, approval_id: str, action: str, reason: str = "") -> Dict:
         """Review content approval"""
@@ -168,7 +197,8 @@ def agents():
 @click.option("--params", "-p", help="JSON string of parameters")
 @click.option("--wait", "-w", is_flag=True, help="Wait for job completion")
 @click.option("--no-approval", is_flag=True, help="Skip approval requirement")
-def execute(agent_name: str, task: str, params: str = None, wait: bool = False, no_approval: bool = False):
+@click.option("--stream/--no-stream", default=True, help="Render output live while waiting")
+def execute(agent_name: str, task: str, params: str = None, wait: bool = False, no_approval: bool = False, stream: bool = True):
     """Execute an agent with specified task
     
     AGENT_NAME: Name of the agent to execute
@@ -194,30 +224,35 @@ def execute(agent_name: str, task: str, params: str = None, wait: bool = False,
         console.print(f"✅ Job started with ID: [yellow]{job_id}[/yellow]")
         
         if wait:
-            # Wait for job completion
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
-                task_progress = progress.add_task("Waiting for job completion...", total=None)
-                
-                while True:
-                    job_status = api.get_job_status(job_id)
-                    status = job_status["status"]
+            streamed = None
+            if stream:
+                streamed = _stream_job_output(job_id)
+            
+            if streamed is None:
+                # Wait for job completion
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console,
+                ) as progress:
+                    task_progress = progress.add_task("Waiting for job completion...", total=None)
                     
-                    if status in ["completed", "failed", "cancelled"]:
-                        break
+                    while True:
+                        job_status = api.get_job_status(job_id)
+                        status = job_status["status"]
+                        
+                        if status in ["completed", "failed", "cancelled"]:
+                            break
+                        
+                        time.sleep(5)
                     
-                    time.sleep(5)
-                
-                progress.update(task_progress, description="Job completed!")
+                    progress.update(task_progress, description="Job completed!")
             
             # Show final status
             job_status = api.get_job_status(job_id)
             if job_status["status"] == "completed":
                 console.print("✅ [green]Job completed successfully![/green]")
-                if job_status.get("result"):
+                if job_status.get("result") and not streamed:
                     console.print(Panel(job_status["result"], title="Result", border_style="green"))
             else:
                 console.print(f"❌ [red]Job failed with status: {job_status['status']}[/red]")
@@ -227,6 +262,28 @@ def execute(agent_name: str, task: str, params: str = None, wait: bool = False,
     except Exception as e:
         console.print(f"[red]Error executing agent: {str(e)}[/red]")
 
+def _stream_job_output(job_id: str) -> Optional[bool]:
+    """Render a job's generated output live
+    
+    Returns whether any output was rendered, or None if streaming is unavailable.
+    """
+    try:
+        received_output = False
+        for event, data in api.stream_job(job_id):
+            if event == "token":
+                if not received_output:
+                    console.print("\n[cyan]Streaming output:[/cyan]\n")
+                    received_output = True
+                console.print(data.get("text", ""), end="", markup=False, highlight=False)
+            elif event == "status":
+                break
+        if received_output:
+            console.print()
+        return received_output
+    except requests.exceptions.RequestException as e:
+        console.print(f"[yellow]Live output unavailable, falling back to polling: {str(e)}[/yellow]")
+        return None
+
 @cli.command()
 @click.option("--status", "-s", help="Filter by job status")
 @click.option("--limit", "-l", default=20, help="Number of jobs to show")
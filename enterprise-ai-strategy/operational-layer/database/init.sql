@@ -27,6 +27,19 @@ CREATE TABLE users (
     CONSTRAINT email_format CHECK (email ~* '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$')
 );
 
+-- Content-addressed store for agent output, compressed and shared by jobs and approvals
+CREATE TABLE content_blobs (
+    hash VARCHAR(64) PRIMARY KEY, -- SHA-256 of the UTF-8 text
+    encoding VARCHAR(16) NOT NULL DEFAULT 'zstd', -- 'zstd', or 'identity' when compression would not shrink it
+    size_bytes INTEGER NOT NULL, -- Uncompressed size
+    data BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    referenced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP -- Last time a row was stored with this hash
+);
+
+-- Already compressed: keep it out of line without a second TOAST compression pass
+ALTER TABLE content_blobs ALTER COLUMN data SET STORAGE EXTERNAL;
+
 -- Job executions table
 CREATE TABLE job_executions (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -34,6 +47,7 @@ CREATE TABLE job_executions (
     agent_name VARCHAR(100) NOT NULL,
     status job_status DEFAULT 'pending',
     priority VARCHAR(20) DEFAULT 'medium',
+    priority_rank SMALLINT DEFAULT 2, -- Queue order of priority: 0 critical, 1 high, 2 medium, 3 low
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     started_at TIMESTAMP WITH TIME ZONE,
     completed_at TIMESTAMP WITH TIME ZONE,
@@ -41,7 +55,9 @@ CREATE TABLE job_executions (
     created_by_id UUID REFERENCES users(id) ON DELETE SET NULL,
     task_description TEXT NOT NULL,
     parameters JSONB DEFAULT '{}',
-    result JSONB,
+    result JSONB, -- Inline result of jobs completed before content_blobs existed
+    result_hash VARCHAR(64) REFERENCES content_blobs(hash), -- Result fields other than the generated content
+    content_hash VARCHAR(64) REFERENCES content_blobs(hash), -- Generated content, shared with the job's approval
     error_message TEXT,
     approval_status approval_status DEFAULT 'pending',
     approved_by VARCHAR(100),
@@ -49,6 +65,11 @@ CREATE TABLE job_executions (
     approved_at TIMESTAMP WITH TIME ZONE,
     execution_log JSONB DEFAULT '[]',
     metadata JSONB DEFAULT '{}',
+    worker_id VARCHAR(100), -- Worker currently executing the job
+    heartbeat_at TIMESTAMP WITH TIME ZONE, -- Last liveness signal from worker_id
+    attempts INTEGER DEFAULT 0,
+    fingerprint VARCHAR(64), -- SHA-256 of agent, task and canonical parameters
+    coalesced_from UUID REFERENCES job_executions(id) ON DELETE SET NULL, -- Execution whose result this job shares
     CONSTRAINT valid_timing CHECK (
         (started_at IS NULL OR started_at >= created_at) AND
         (completed_at IS NULL OR completed_at >= COALESCE(started_at, created_at))
@@ -61,8 +82,9 @@ CREATE TABLE content_approvals (
     job_id UUID NOT NULL REFERENCES job_executions(id) ON DELETE CASCADE,
     content_type VARCHAR(50) NOT NULL,
     title VARCHAR(200) NOT NULL,
-    content TEXT NOT NULL,
-    content_hash VARCHAR(64), -- SHA-256 hash for integrity
+    content TEXT, -- Inline content of approvals created before content_blobs existed
+    content_hash VARCHAR(64) REFERENCES content_blobs(hash), -- SHA-256 of the content, key into content_blobs
+    content_preview TEXT, -- Leading characters of the content for listings
     status approval_status DEFAULT 'pending',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     created_by VARCHAR(100) NOT NULL,
@@ -79,6 +101,31 @@ CREATE TABLE content_approvals (
     )
 );
 
+-- Per-call Bedrock telemetry for agent jobs
+CREATE TABLE job_metrics (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    job_id UUID NOT NULL REFERENCES job_executions(id) ON DELETE CASCADE,
+    agent_name VARCHAR(100) NOT NULL,
+    model VARCHAR(255) NOT NULL,
+    cached BOOLEAN DEFAULT false, -- Served from the response cache, no Bedrock call
+    input_tokens INTEGER DEFAULT 0,
+    output_tokens INTEGER DEFAULT 0,
+    cache_read_tokens INTEGER DEFAULT 0, -- Prompt prefix tokens read from the Bedrock prompt cache
+    cache_write_tokens INTEGER DEFAULT 0, -- Prompt prefix tokens written to the Bedrock prompt cache
+    latency_ms DOUBLE PRECISION,
+    ttfb_ms DOUBLE PRECISION,
+    throttle_retries INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Status count deltas maintained by triggers; summed for dashboard statistics
+CREATE TABLE dashboard_counters (
+    id BIGSERIAL PRIMARY KEY,
+    scope VARCHAR(50) NOT NULL, -- Counted table name
+    key VARCHAR(20) NOT NULL, -- Status value
+    delta BIGINT NOT NULL
+);
+
 -- Agent configurations table
 CREATE TABLE agent_configurations (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -153,13 +200,29 @@ CREATE TABLE system_metrics (
 -- Create indexes for performance
 CREATE INDEX idx_job_executions_status ON job_executions(status);
 CREATE INDEX idx_job_executions_created_by ON job_executions(created_by);
-CREATE INDEX idx_job_executions_created_at ON job_executions(created_at DESC);
+-- Keyset pagination for job listings: (created_at, id) seeks, per filter
+CREATE INDEX idx_job_executions_created_at ON job_executions(created_at DESC, id DESC);
+CREATE INDEX idx_job_executions_created_by_page ON job_executions(created_by, created_at DESC, id DESC);
+CREATE INDEX idx_job_executions_status_page ON job_executions(status, created_at DESC, id DESC);
 CREATE INDEX idx_job_executions_agent_name ON job_executions(agent_name);
 CREATE INDEX idx_job_executions_approval_status ON job_executions(approval_status);
+CREATE INDEX idx_job_executions_queue ON job_executions(priority_rank, created_at) WHERE status = 'pending' AND coalesced_from IS NULL;
+CREATE INDEX idx_job_executions_fingerprint ON job_executions(fingerprint, created_at DESC) WHERE coalesced_from IS NULL;
+CREATE INDEX idx_job_executions_coalesced_from ON job_executions(coalesced_from) WHERE coalesced_from IS NOT NULL;
+CREATE INDEX idx_job_executions_heartbeat ON job_executions(heartbeat_at) WHERE status = 'running';
+CREATE INDEX idx_job_executions_result_hash ON job_executions(result_hash) WHERE result_hash IS NOT NULL;
+CREATE INDEX idx_job_executions_content_hash ON job_executions(content_hash) WHERE content_hash IS NOT NULL;
 
 CREATE INDEX idx_content_approvals_status ON content_approvals(status);
 CREATE INDEX idx_content_approvals_job_id ON content_approvals(job_id);
-CREATE INDEX idx_content_approvals_created_at ON content_approvals(created_at DESC);
+CREATE INDEX idx_content_approvals_created_at ON content_approvals(created_at DESC, id DESC);
+CREATE INDEX idx_content_approvals_pending_page ON content_approvals(created_at DESC, id DESC) WHERE status = 'pending';
+CREATE INDEX idx_content_approvals_content_hash ON content_approvals(content_hash) WHERE content_hash IS NOT NULL;
+
+CREATE INDEX idx_content_blobs_referenced_at ON content_blobs(referenced_at);
+
+CREATE INDEX idx_job_metrics_job_id ON job_metrics(job_id);
+CREATE INDEX idx_job_metrics_agent_created_at ON job_metrics(agent_name, created_at DESC);
 
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_role ON users(role);
@@ -228,6 +291,55 @@ CREATE TRIGGER audit_job_executions AFTER INSERT OR UPDATE OR DELETE ON job_exec
 CREATE TRIGGER audit_content_approvals AFTER INSERT OR UPDATE OR DELETE ON content_approvals
     FOR EACH ROW EXECUTE FUNCTION audit_trigger_function();
 
+-- Dashboard counters: every status change appends -1/+1 rows instead of
+-- updating a shared counter row, so concurrent job transitions never contend
+-- on (or deadlock over) counter locks. compact_dashboard_counters() folds the
+-- deltas back into one row per status and is run periodically by the API.
+CREATE OR REPLACE FUNCTION record_status_counter_delta()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.status IS NOT DISTINCT FROM NEW.status THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.status IS NOT NULL THEN
+            INSERT INTO dashboard_counters (scope, key, delta) VALUES (TG_TABLE_NAME, OLD.status::text, -1);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.status IS NOT NULL THEN
+            INSERT INTO dashboard_counters (scope, key, delta) VALUES (TG_TABLE_NAME, NEW.status::text, 1);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION compact_dashboard_counters()
+RETURNS void AS $$
+BEGIN
+    WITH folded AS (
+        DELETE FROM dashboard_counters RETURNING scope, key, delta
+    )
+    INSERT INTO dashboard_counters (scope, key, delta)
+    SELECT scope, key, SUM(delta) FROM folded GROUP BY scope, key;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER count_job_executions_status AFTER INSERT OR DELETE OR UPDATE OF status ON job_executions
+    FOR EACH ROW EXECUTE FUNCTION record_status_counter_delta();
+
+CREATE TRIGGER count_content_approvals_status AFTER INSERT OR DELETE OR UPDATE OF status ON content_approvals
+    FOR EACH ROW EXECUTE FUNCTION record_status_counter_delta();
+
+-- Backfill when applying the counters to a populated database
+INSERT INTO dashboard_counters (scope, key, delta)
+SELECT 'job_executions', status::text, COUNT(*) FROM job_executions WHERE status IS NOT NULL GROUP BY status
+UNION ALL
+SELECT 'content_approvals', status::text, COUNT(*) FROM content_approvals WHERE status IS NOT NULL GROUP BY status;
+
 -- Create views for common queries
 CREATE VIEW job_execution_summary AS
 SELECT 
@@ -268,29 +380,39 @@ SELECT
     u_creator.name as created_by_name,
     j.agent_name,
     j.status as job_status,
-    LENGTH(ca.content) as content_length
+    COALESCE(LENGTH(ca.content), b.size_bytes) as content_length
 FROM content_approvals ca
+LEFT JOIN content_blobs b ON ca.content_hash = b.hash
 LEFT JOIN users u_creator ON ca.created_by_id = u_creator.id
 LEFT JOIN job_executions j ON ca.job_id = j.id
 WHERE ca.status = 'pending'
 ORDER BY ca.created_at ASC;
 
 CREATE VIEW dashboard_stats AS
+WITH counts AS (
+    SELECT
+        COALESCE(SUM(delta) FILTER (WHERE scope = 'job_executions'), 0) as total_jobs,
+        COALESCE(SUM(delta) FILTER (WHERE scope = 'job_executions' AND key = 'running'), 0) as running_jobs,
+        COALESCE(SUM(delta) FILTER (WHERE scope = 'job_executions' AND key = 'completed'), 0) as completed_jobs,
+        COALESCE(SUM(delta) FILTER (WHERE scope = 'job_executions' AND key = 'failed'), 0) as failed_jobs,
+        COALESCE(SUM(delta) FILTER (WHERE scope = 'content_approvals' AND key = 'pending'), 0) as pending_approvals
+    FROM dashboard_counters
+)
 SELECT 
-    (SELECT COUNT(*) FROM job_executions) as total_jobs,
-    (SELECT COUNT(*) FROM job_executions WHERE status = 'running') as running_jobs,
-    (SELECT COUNT(*) FROM job_executions WHERE status = 'completed') as completed_jobs,
-    (SELECT COUNT(*) FROM job_executions WHERE status = 'failed') as failed_jobs,
-    (SELECT COUNT(*) FROM content_approvals WHERE status = 'pending') as pending_approvals,
+    total_jobs,
+    running_jobs,
+    completed_jobs,
+    failed_jobs,
+    pending_approvals,
     (SELECT COUNT(*) FROM users WHERE is_active = true) as active_users,
     ROUND(
         CASE 
-            WHEN (SELECT COUNT(*) FROM job_executions WHERE status IN ('completed', 'failed')) > 0
-            THEN (SELECT COUNT(*)::decimal FROM job_executions WHERE status = 'completed') * 100.0 / 
-                 (SELECT COUNT(*) FROM job_executions WHERE status IN ('completed', 'failed'))
+            WHEN completed_jobs + failed_jobs > 0
+            THEN completed_jobs::decimal * 100.0 / (completed_jobs + failed_jobs)
             ELSE 0
         END, 2
-    ) as success_rate;
+    ) as success_rate
+FROM counts;
 
 -- Insert default admin user (password should be set properly in production)
 INSERT INTO users (email, name, role, password_hash) VALUES 
@@ -312,14 +434,25 @@ BEGIN
     -- Clean up old system metrics (keep 3 months)
     DELETE FROM system_metrics WHERE timestamp < CURRENT_TIMESTAMP - INTERVAL '3 months';
     
+    -- Clean up old Bedrock call telemetry (keep 3 months)
+    DELETE FROM job_metrics WHERE created_at < CURRENT_TIMESTAMP - INTERVAL '3 months';
+    
     -- Clean up read notifications older than 30 days
     DELETE FROM notifications WHERE is_read = true AND read_at < CURRENT_TIMESTAMP - INTERVAL '30 days';
     
     -- Clean up completed jobs older than 1 year (keep metadata)
     UPDATE job_executions 
-    SET result = NULL, execution_log = '[]'
+    SET result = NULL, result_hash = NULL, content_hash = NULL, execution_log = '[]'
     WHERE status = 'completed' 
     AND completed_at < CURRENT_TIMESTAMP - INTERVAL '1 year';
+    
+    -- Clean up content blobs no job or approval references; the grace period
+    -- covers blobs stored by transactions that have not committed yet
+    DELETE FROM content_blobs b
+    WHERE b.referenced_at < CURRENT_TIMESTAMP - INTERVAL '1 day'
+    AND NOT EXISTS (SELECT 1 FROM job_executions j WHERE j.result_hash = b.hash)
+    AND NOT EXISTS (SELECT 1 FROM job_executions j WHERE j.content_hash = b.hash)
+    AND NOT EXISTS (SELECT 1 FROM content_approvals ca WHERE ca.content_hash = b.hash);
 END;
 $$ language 'plpgsql';
 
@@ -338,6 +471,8 @@ COMMENT ON DATABASE CURRENT_DATABASE() IS 'Enterprise AI Strategy Command Center
 COMMENT ON TABLE users IS 'User accounts and authentication information';
 COMMENT ON TABLE job_executions IS 'AI agent job execution tracking';
 COMMENT ON TABLE content_approvals IS 'Content approval workflow management';
+COMMENT ON TABLE dashboard_counters IS 'Trigger-maintained job and approval status counts for dashboard statistics';
+COMMENT ON TABLE job_metrics IS 'Per-call Bedrock token usage and latency for agent jobs';
 COMMENT ON TABLE audit_log IS 'System audit trail for compliance';
 COMMENT ON TABLE notifications IS 'User notification system';
 COMMENT ON TABLE api_tokens IS 'API authentication tokens';
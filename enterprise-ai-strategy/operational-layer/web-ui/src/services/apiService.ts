@@ -30,6 +30,9 @@ export interface Job {
   approval_status: string;
   approved_by?: string;
   agent_name?: string;
+  priority?: string;
+  has_result?: boolean;
+  coalesced_with?: string;
 }
 
 export interface ContentApproval {
@@ -63,6 +66,10 @@ export interface DashboardStats {
   success_rate: number;
 }
 
+export interface Page {
+  next_cursor: string | null;
+}
+
 export interface ApiResponse<T> {
   data?: T;
   error?: string;
@@ -72,6 +79,9 @@ export interface ApiResponse<T> {
 export class ApiService {
   private static readonly API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 
+  // Last body and ETag per GET URL, revalidated with If-None-Match
+  private static readonly etagCache = new Map<string, { etag: string; data: any }>();
+
   /**
    * Make authenticated API request
    */
@@ -81,9 +91,12 @@ export class ApiService {
   ): Promise<ApiResponse<T>> {
     try {
       const url = `${this.API_BASE_URL}${endpoint}`;
+      const isGet = !options.method || options.method === 'GET';
+      const cached = isGet ? this.etagCache.get(url) : undefined;
       const headers = {
         'Content-Type': 'application/json',
         ...AuthService.getAuthHeaders(),
+        ...(cached ? { 'If-None-Match': cached.etag } : {}),
         ...options.headers,
       };
 
@@ -92,6 +105,13 @@ export class ApiService {
         headers,
       });
 
+      if (response.status === 304 && cached) {
+        return {
+          success: true,
+          data: cached.data,
+        };
+      }
+
       if (response.status === 401) {
         // Unauthorized - redirect to login
         AuthService.logout();
@@ -108,6 +128,11 @@ export class ApiService {
         };
       }
 
+      const etag = response.headers.get('ETag');
+      if (isGet && etag) {
+        this.etagCache.set(url, { etag, data });
+      }
+
       return {
         success: true,
         data,
@@ -168,15 +193,15 @@ export class ApiService {
   }
 
   /**
-   * List jobs with optional filters
+   * List job summaries with optional filters; pass next_cursor for the next page
    */
   static async getJobs(params: {
-    skip?: number;
+    cursor?: string;
     limit?: number;
     status?: string;
-  } = {}): Promise<ApiResponse<{ jobs: Job[] }>> {
+  } = {}): Promise<ApiResponse<{ jobs: Job[] } & Page>> {
     const searchParams = new URLSearchParams();
-    if (params.skip !== undefined) searchParams.append('skip', params.skip.toString());
+    if (params.cursor) searchParams.append('cursor', params.cursor);
     if (params.limit !== undefined) searchParams.append('limit', params.limit.toString());
     if (params.status) searchParams.append('status', params.status);
 
@@ -195,10 +220,18 @@ export class ApiService {
 
   // Content Approval Management
   /**
-   * Get pending approvals
+   * Get pending approvals with content previews; pass next_cursor for the next page
    */
-  static async getPendingApprovals(): Promise<ApiResponse<{ approvals: ContentApproval[] }>> {
-    return this.makeRequest('/approvals');
+  static async getPendingApprovals(params: {
+    cursor?: string;
+    limit?: number;
+  } = {}): Promise<ApiResponse<{ approvals: ContentApproval[] } & Page>> {
+    const searchParams = new URLSearchParams();
+    if (params.cursor) searchParams.append('cursor', params.cursor);
+    if (params.limit !== undefined) searchParams.append('limit', params.limit.toString());
+
+    const query = searchParams.toString();
+    return this.makeRequest(`/approvals${query ? `?${query}` : ''}`);
   }
 
   /**
@@ -315,19 +348,27 @@ export class ApiService {
    * Export data as CSV
    */
   static async exportJobsAsCsv(params: { status?: string } = {}): Promise<void> {
-    const response = await this.getJobs({ ...params, limit: 1000 });
-    if (response.success && response.data?.jobs) {
-      const csv = this.convertJobsToCSV(response.data.jobs);
-      const blob = new Blob([csv], { type: 'text/csv' });
-      const url = window.URL.createObjectURL(blob);
-      const link = document.createElement('a');
-      link.href = url;
-      link.download = `jobs_export_${new Date().toISOString().split('T')[0]}.csv`;
-      document.body.appendChild(link);
-      link.click();
-      window.URL.revokeObjectURL(url);
-      document.body.removeChild(link);
-    }
+    const jobs: Job[] = [];
+    let cursor: string | undefined;
+    do {
+      const response = await this.getJobs({ ...params, cursor, limit: 500 });
+      if (!response.success || !response.data) {
+        return;
+      }
+      jobs.push(...response.data.jobs);
+      cursor = response.data.next_cursor || undefined;
+    } while (cursor);
+
+    const csv = this.convertJobsToCSV(jobs);
+    const blob = new Blob([csv], { type: 'text/csv' });
+    const url = window.URL.createObjectURL(blob);
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `jobs_export_${new Date().toISOString().split('T')[0]}.csv`;
+    document.body.appendChild(link);
+    link.click();
+    window.URL.revokeObjectURL(url);
+    document.body.removeChild(link);
   }
 
   /**